@@ -0,0 +1,69 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Runs the benchmarks. No eye tracker is needed, the samples are synthetic.
+
+    python -m benchmarks [--quick] [--filter TEXT] [--save FILE] [--compare FILE] [--threshold 0.1]
+
+Exits with status 1 if --compare finds a regression.
+'''
+
+import argparse
+import sys
+
+from . import harness
+from .suites import all_benchmarks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks for tobii_research_addons")
+    parser.add_argument("--quick", action="store_true", help="run a reduced sweep")
+    parser.add_argument("--filter", default="", help="only run benchmarks with names containing this text")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per timing loop")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing loops, the fastest is used")
+    parser.add_argument("--save", metavar="FILE", help="store the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown or peak memory growth that counts as a regression")
+    args = parser.parse_args(argv)
+
+    baseline = harness.load_baseline(args.compare) if args.compare else None
+    results = {}
+    print("{0:<72} {1:>14} {2:>12} {3:>8}".format("benchmark", "ops/sec", "peak bytes", "allocs"))
+    for benchmark in all_benchmarks(args.quick):
+        if args.filter not in benchmark.name:
+            continue
+        result = harness.measure(benchmark, args.min_time, args.repeat)
+        results[benchmark.name] = result
+        print("{0:<72} {1:>14.1f} {2:>12} {3:>8}".format(
+            benchmark.name, result["ops_per_sec"], result["peak_bytes"], result["allocated_blocks"]))
+        sys.stdout.flush()
+
+    if args.save:
+        harness.save_baseline(args.save, results)
+
+    if baseline is not None:
+        rows = harness.compare(results, baseline, args.threshold)
+        print("")
+        print("{0:<72} {1:>9} {2:>9}".format("compared to " + args.compare, "speed", "memory"))
+        for name, speed, memory, regressed in rows:
+            print("{0:<72} {1:>+8.1%} {2:>+8.1%}{3}".format(name, speed, memory, "  REGRESSION" if regressed else ""))
+        if any(regressed for _, _, _, regressed in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import gc
+import io
+import json
+import platform
+import timeit
+import tracemalloc
+
+
+class Benchmark(object):
+    '''A named operation to measure.
+    '''
+
+    def __init__(self, name, setup):
+        '''Create a benchmark.
+
+        Args:
+        name: Unique name, used to match results against a baseline.
+        setup: Callable without arguments that prepares the fixtures and returns the operation to measure, a
+        callable without arguments. The setup is not measured.
+        '''
+        self.name = name
+        self.setup = setup
+
+
+def measure(benchmark, min_time=0.1, repeat=5):
+    '''Measure the speed and memory use of a benchmark.
+
+    The operation is called in loops that take at least min_time seconds, and the fastest of repeat loops is used
+    for the speed. The memory use is traced during one separate call.
+
+    Returns:
+    A dict with ops_per_sec, peak_bytes (the most memory allocated at once during a call) and allocated_blocks (the
+    number of memory blocks allocated during a call that are still allocated when it returns, including the blocks
+    of its result). Blocks allocated and freed again within the call are not counted.
+    '''
+    operation = benchmark.setup()
+    timer = timeit.Timer(operation)
+    number = _autorange(timer, min_time)
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        result = operation()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"ops_per_sec": 1.0 / best if best > 0 else float("inf"),
+            "peak_bytes": peak - start,
+            "allocated_blocks": _allocated_blocks(before, after)}
+
+
+def _allocated_blocks(before, after):
+    # The snapshots themselves are allocated by tracemalloc
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "traceback")
+    return sum(difference.count_diff for difference in differences if difference.count_diff > 0)
+
+
+def _autorange(timer, min_time):
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            return number
+        number *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed * 1.2))
+
+
+def environment():
+    return {"python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine()}
+
+
+def save_baseline(path, results):
+    '''Store results as a baseline, see @ref compare.
+    '''
+    with io.open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"environment": environment(), "results": results}, indent=1, sort_keys=True))
+
+
+def load_baseline(path):
+    with io.open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold=0.1):
+    '''Compare results against a baseline.
+
+    Args:
+    results: Mapping from benchmark name to the dict returned by @ref measure.
+    baseline: Results in the same form, see @ref load_baseline.
+    threshold: The relative slowdown, or growth in peak memory, that counts as a regression.
+
+    Returns:
+    List of (name, speed change, peak memory change, regressed) tuples for the benchmarks present in both. The
+    changes are relative, a speed change of -0.2 means 20% fewer operations per second.
+    '''
+    rows = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        new, old = results[name], baseline[name]
+        speed = new["ops_per_sec"] / old["ops_per_sec"] - 1.0
+        if old["peak_bytes"] > 0:
+            memory = float(new["peak_bytes"]) / old["peak_bytes"] - 1.0
+        else:
+            memory = 0.0 if new["peak_bytes"] == 0 else float("inf")
+        rows.append((name, speed, memory, speed < -threshold or memory > threshold))
+    return rows
@@ -0,0 +1,208 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import subprocess
+import sys
+
+from tobii_research_addons import ScreenBasedCalibrationValidation, Point2, Point3, Vector3
+from tobii_research_addons import calculate_mean_point, calculate_normalized_point2_to_point3
+from tobii_research_addons import bootstrap_result
+
+from tests import fixtures
+from .harness import Benchmark
+
+SAMPLE_COUNTS = (ScreenBasedCalibrationValidation.SAMPLE_COUNT_MIN, 30, 100, 300, 1000,
+                 ScreenBasedCalibrationValidation.SAMPLE_COUNT_MAX)
+GRID_SIZES = (1, 3, 5)
+NOISE_DEGREES = (0.5, 2.0)
+STORAGE = ("list", "compact")
+
+QUICK_SAMPLE_COUNTS = (ScreenBasedCalibrationValidation.SAMPLE_COUNT_MIN, 300,
+                       ScreenBasedCalibrationValidation.SAMPLE_COUNT_MAX)
+QUICK_GRID_SIZES = (3,)
+QUICK_NOISE_DEGREES = (1.0,)
+
+
+def _positions(sample_count):
+    samples = fixtures.make_samples(Point2(0.5, 0.5), sample_count)
+    origins = [Point3.from_list(sample.left_eye.gaze_origin.position_in_user_coordinates) for sample in samples]
+    points = [Point3.from_list(sample.left_eye.gaze_point.position_in_user_coordinates) for sample in samples]
+    return origins, points
+
+
+def vectormath_benchmarks(sample_counts):
+    benchmarks = []
+    for sample_count in sample_counts:
+        def mean_point(sample_count=sample_count):
+            _, points = _positions(sample_count)
+            return lambda: calculate_mean_point(points)
+
+        def normalize(sample_count=sample_count):
+            origins, points = _positions(sample_count)
+            directions = [Vector3.from_points(origin, point) for origin, point in zip(origins, points)]
+            return lambda: [direction.normalize() for direction in directions]
+
+        def angle(sample_count=sample_count):
+            origins, points = _positions(sample_count)
+            directions = [Vector3.from_points(origin, point) for origin, point in zip(origins, points)]
+            mean = Vector3.from_points(origins[0], calculate_mean_point(points))
+            return lambda: [direction.angle(mean) for direction in directions]
+
+        benchmarks += [Benchmark("vectormath.calculate_mean_point[n={0}]".format(sample_count), mean_point),
+                       Benchmark("vectormath.Vector3.normalize[n={0}]".format(sample_count), normalize),
+                       Benchmark("vectormath.Vector3.angle[n={0}]".format(sample_count), angle)]
+
+    def normalized_point(points=fixtures.point_grid(5)):
+        return lambda: [calculate_normalized_point2_to_point3(fixtures.DISPLAY_AREA, point) for point in points]
+
+    benchmarks.append(Benchmark("vectormath.calculate_normalized_point2_to_point3[points=25]", normalized_point))
+    return benchmarks
+
+
+def _collected_validation(sample_count, grid_size, noise_degrees, storage):
+    eyetracker = fixtures.make_eyetracker()
+    validation = ScreenBasedCalibrationValidation(eyetracker, sample_count, 1000,
+                                                  compact_storage=storage == "compact",
+                                                  scheduler=fixtures.NeverScheduler())
+    validation.enter_validation_mode()
+    for seed, screen_point in enumerate(fixtures.point_grid(grid_size)):
+        validation.start_collecting_data(screen_point)
+        eyetracker.play(fixtures.make_samples(screen_point, sample_count, noise_degrees, seed=seed))
+    return validation
+
+
+def compute_benchmarks(sample_counts, grid_sizes, noise_levels):
+    '''Measures compute() of a collected session. compute[...] computes every point again in each call, as after
+    collecting new data, and compute_cached[...] measures the calls that find all points already computed.
+    '''
+    benchmarks = []
+    for sample_count in sample_counts:
+        for grid_size in grid_sizes:
+            for noise_degrees in noise_levels:
+                for storage in STORAGE:
+                    def compute(sample_count=sample_count, grid_size=grid_size, noise_degrees=noise_degrees,
+                                storage=storage):
+                        validation = _collected_validation(sample_count, grid_size, noise_degrees, storage)
+
+                        def operation():
+                            # A display area change discards the computed points, so every call computes them again
+                            validation._display_area_changed(None)
+                            return validation.compute()
+                        return operation
+
+                    benchmarks.append(Benchmark(
+                        "compute[samples={0},points={1},noise={2},storage={3}]".format(
+                            sample_count, grid_size * grid_size, noise_degrees, storage),
+                        compute))
+
+    sample_count = max(sample_counts)
+    for grid_size in grid_sizes:
+        for storage in STORAGE:
+            def compute_cached(grid_size=grid_size, storage=storage):
+                validation = _collected_validation(sample_count, grid_size, 1.0, storage)
+                validation.compute()
+                return validation.compute
+
+            benchmarks.append(Benchmark("compute_cached[samples={0},points={1},storage={2}]".format(
+                sample_count, grid_size * grid_size, storage), compute_cached))
+    return benchmarks
+
+
+def ingestion_benchmarks():
+    '''Measures the gaze data callback for a whole point of SAMPLE_COUNT_MAX samples, so one operation is one point.
+    '''
+    sample_count = ScreenBasedCalibrationValidation.SAMPLE_COUNT_MAX
+    benchmarks = []
+    for storage in STORAGE:
+        for online_statistics in (False, True):
+            def ingest(storage=storage, online_statistics=online_statistics):
+                validation = ScreenBasedCalibrationValidation(fixtures.make_eyetracker(), sample_count, 1000,
+                                                              compact_storage=storage == "compact",
+                                                              online_statistics=online_statistics,
+                                                              scheduler=fixtures.NeverScheduler())
+                validation.enter_validation_mode()
+                screen_point = Point2(0.5, 0.5)
+                samples = fixtures.make_samples(screen_point, sample_count, invalid_ratio=0.1)
+                callback = validation._gaze_data_received
+
+                def operation():
+                    validation.clear()
+                    validation.start_collecting_data(screen_point)
+                    for sample in samples:
+                        callback(sample)
+                    validation.collection_deadline.fire()
+                return operation
+
+            benchmarks.append(Benchmark("ingestion[samples={0},storage={1},online={2}]".format(
+                sample_count, storage, online_statistics), ingest))
+    return benchmarks
+
+
+def _installed(module):
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        return False
+    return find_spec(module) is not None
+
+
+def bootstrap_benchmarks():
+    '''Measures the confidence intervals of a 16 point session with the maximum number of samples per point.
+    '''
+    if not _installed("numpy"):
+        return []
+    sample_count = ScreenBasedCalibrationValidation.SAMPLE_COUNT_MAX
+
+    def intervals():
+        result = _collected_validation(sample_count, 4, 1.0, "compact").compute()
+        return lambda: bootstrap_result(result, fixtures.DISPLAY_AREA, seed=0)
+
+    return [Benchmark("bootstrap[samples={0},points=16,resamples=2000]".format(sample_count), intervals)]
+
+
+def import_benchmarks():
+    '''Measures the cold start of a new Python process importing parts of the package, as a process pool worker
+    does. Compare with import[interpreter] for the cost of starting Python itself, and with
+    import[tobii_research_addons+sdk] for the cost of also loading the SDK.
+    '''
+    statements = [("interpreter", "pass"),
+                  ("tobii_research_addons", "import tobii_research_addons"),
+                  ("tobii_research_addons.vectormath", "import tobii_research_addons.vectormath"),
+                  ("tobii_research_addons.batch", "import tobii_research_addons.batch")]
+    if _installed("tobii_research"):
+        statements.append(("tobii_research_addons+sdk", "import tobii_research_addons, tobii_research"))
+
+    benchmarks = []
+    for name, statement in statements:
+        def cold_start(statement=statement):
+            return lambda: subprocess.check_call([sys.executable, "-c", statement])
+
+        benchmarks.append(Benchmark("import[{0}]".format(name), cold_start))
+    return benchmarks
+
+
+def all_benchmarks(quick=False):
+    if quick:
+        return (vectormath_benchmarks(QUICK_SAMPLE_COUNTS) +
+                compute_benchmarks(QUICK_SAMPLE_COUNTS, QUICK_GRID_SIZES, QUICK_NOISE_DEGREES) +
+                ingestion_benchmarks() +
+                bootstrap_benchmarks() +
+                import_benchmarks())
+    return (vectormath_benchmarks(SAMPLE_COUNTS) +
+            compute_benchmarks(SAMPLE_COUNTS, GRID_SIZES, NOISE_DEGREES) +
+            ingestion_benchmarks() +
+            bootstrap_benchmarks() +
+            import_benchmarks())
@@ -33,11 +33,13 @@ setup(
     ],
     keywords='tobii research eyetracking sdk tobiipro',
     py_modules=["tobii_research_addons"],
-    packages=find_packages(exclude=['contrib', 'docs', 'tests']),
-    install_requires=['tobii_research'],
+    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'benchmarks', 'benchmarks.*']),
+    install_requires=[],
     extras_require={
+        'sdk': ['tobii_research'],
         'dev': ['check-manifest'],
         'test': ['coverage'],
+        'numpy': ['numpy'],
     },
     package_data={
         'sample': [],
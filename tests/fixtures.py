@@ -0,0 +1,94 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import math
+import random
+
+from tobii_research_addons import Deadline, GazeSample, Point2, RecordedDisplayArea, ReplayEyeTracker
+from tobii_research_addons import calculate_normalized_point2_to_point3
+
+# A 530 x 300 mm display, 600 mm in front of the eyes
+DISPLAY_AREA = RecordedDisplayArea((-265.0, 300.0, 0.0), (265.0, 300.0, 0.0), (-265.0, 0.0, 0.0))
+LEFT_EYE = (-32.0, 150.0, 600.0)
+RIGHT_EYE = (32.0, 150.0, 600.0)
+
+
+def point_grid(size):
+    '''Gets size x size stimuli points evenly spread between 0.1 and 0.9.
+    '''
+    steps = [0.5] if size == 1 else [0.1 + 0.8 * i / (size - 1) for i in range(size)]
+    return [Point2(x, y) for y in steps for x in steps]
+
+
+def _noisy_gaze_point(rng, eye, target, noise_degrees):
+    # Offset the gaze point in the display plane by an angle drawn from a normal distribution
+    distance = math.sqrt(sum((t - e) ** 2 for t, e in zip(target, eye)))
+    scale = distance * math.tan(math.radians(noise_degrees))
+    return (target[0] + rng.gauss(0.0, scale), target[1] + rng.gauss(0.0, scale), target[2])
+
+
+def make_samples(screen_point, count, noise_degrees=1.0, invalid_ratio=0.0, seed=0, start_time_stamp=0):
+    '''Create synthetic samples looking at a stimuli point.
+
+    Args:
+    screen_point: The @ref Point2 the eyes look at.
+    count: The number of samples.
+    noise_degrees: The standard deviation of the gaze angle noise.
+    invalid_ratio: The share of samples with invalid gaze points.
+    seed: Seed of the random generator, so the same arguments give the same samples.
+    start_time_stamp: Time stamp of the first sample in microseconds, the samples follow at 600 Hz.
+
+    Returns:
+    List of @ref GazeSample with the attributes of @ref GazeData used by the calibration validation.
+    '''
+    rng = random.Random(seed)
+    target = calculate_normalized_point2_to_point3(DISPLAY_AREA, screen_point)
+    samples = []
+    for index in range(count):
+        valid = rng.random() >= invalid_ratio
+        time_stamp = start_time_stamp + index * 1000000 // 600
+        samples.append(GazeSample(LEFT_EYE, _noisy_gaze_point(rng, LEFT_EYE, target, noise_degrees),
+                                  RIGHT_EYE, _noisy_gaze_point(rng, RIGHT_EYE, target, noise_degrees),
+                                  valid, valid, time_stamp, time_stamp))
+    return samples
+
+
+def make_samples_by_point(points, count, short_points=(), short_count=5):
+    '''Create valid synthetic samples for each point, with a different seed per point.
+
+    Args:
+    points: The @ref Point2 stimuli points.
+    count: The number of samples of each point.
+    short_points: Points that only get short_count samples, so they count as timed out.
+
+    Returns:
+    Dict from @ref Point2 to a list of @ref GazeSample.
+    '''
+    return dict((screen_point, make_samples(screen_point, short_count if screen_point in short_points else count,
+                                            seed=index))
+                for index, screen_point in enumerate(points))
+
+
+class NeverScheduler(object):
+    '''A scheduler whose deadlines never fire, so timeouts do not interfere with the measurements.
+    '''
+
+    def schedule(self, delay, callback):
+        return Deadline(float("inf"), callback)
+
+
+def make_eyetracker():
+    return ReplayEyeTracker(DISPLAY_AREA)
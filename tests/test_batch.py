@@ -0,0 +1,63 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import math
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from tobii_research_addons import ScreenBasedCalibrationValidation, compute_many, compute_validation
+
+from . import fixtures
+
+SAMPLE_COUNT = 30
+POINTS = fixtures.point_grid(2)
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_same_as_validation(self):
+        samples_by_point = fixtures.make_samples_by_point(POINTS, SAMPLE_COUNT, short_points=POINTS[-1:])
+        eyetracker = fixtures.make_eyetracker()
+        validation = ScreenBasedCalibrationValidation(eyetracker, SAMPLE_COUNT, scheduler=fixtures.NeverScheduler())
+        validation.enter_validation_mode()
+        for screen_point in POINTS:
+            validation.start_collecting_data(screen_point)
+            eyetracker.play(samples_by_point[screen_point])
+            if validation.is_collecting_data:
+                validation.collection_deadline.fire()
+        expected = validation.compute()
+        validation.leave_validation_mode()
+
+        actual = compute_validation(samples_by_point, fixtures.DISPLAY_AREA, SAMPLE_COUNT)
+        self.assertTrue(actual.points[POINTS[-1]][0].timed_out)
+        self.assertTrue(math.isclose(actual.average_accuracy_left, expected.average_accuracy_left, rel_tol=1e-9))
+        self.assertTrue(math.isclose(actual.average_precision_right, expected.average_precision_right, rel_tol=1e-9))
+
+    def test_compute_many(self):
+        sessions = [(fixtures.make_samples_by_point(POINTS, count, short_points=POINTS[:1]), fixtures.DISPLAY_AREA)
+                    for count in (SAMPLE_COUNT, 2 * SAMPLE_COUNT)]
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results = compute_many(sessions, SAMPLE_COUNT, chunksize=2, executor=executor)
+        self.assertEqual(len(results), len(sessions))
+        for (samples_by_point, display_area), result in zip(sessions, results):
+            expected = compute_validation(samples_by_point, display_area, SAMPLE_COUNT)
+            self.assertTrue(result.points[POINTS[0]][0].timed_out)
+            self.assertEqual(result.average_accuracy_left, expected.average_accuracy_left)
+            self.assertEqual(result.average_precision_rms_right, expected.average_precision_rms_right)
+
+
+if __name__ == "__main__":
+    unittest.main()
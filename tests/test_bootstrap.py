@@ -0,0 +1,73 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import unittest
+
+from tobii_research_addons import bootstrap_point, bootstrap_result, compute_validation
+
+from . import fixtures
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SAMPLE_COUNT = 30
+POINTS = fixtures.point_grid(2)
+
+
+@unittest.skipIf(numpy is None, "Bootstrap confidence intervals require numpy")
+class BootstrapTest(unittest.TestCase):
+
+    def setUp(self):
+        samples_by_point = fixtures.make_samples_by_point(POINTS, 4 * SAMPLE_COUNT, short_points=POINTS[-1:])
+        self.result = compute_validation(samples_by_point, fixtures.DISPLAY_AREA, SAMPLE_COUNT)
+
+    def test_point(self):
+        point, = self.result.points[POINTS[0]]
+        intervals = bootstrap_point(point, fixtures.DISPLAY_AREA, resamples=500, seed=1)
+        for name in ("accuracy_left_eye", "accuracy_right_eye", "precision_left_eye", "precision_right_eye",
+                     "precision_rms_left_eye", "precision_rms_right_eye"):
+            lower, upper = getattr(intervals, name)
+            self.assertLess(lower, upper, name)
+            self.assertTrue(lower <= getattr(point, name) <= upper, name)
+        again = bootstrap_point(point, fixtures.DISPLAY_AREA, resamples=500, seed=1)
+        self.assertEqual(again.to_dict(), intervals.to_dict())
+
+    def test_timed_out_point(self):
+        point, = self.result.points[POINTS[-1]]
+        self.assertIsNone(bootstrap_point(point, fixtures.DISPLAY_AREA))
+
+    def test_result(self):
+        intervals = bootstrap_result(self.result, fixtures.DISPLAY_AREA, resamples=500, seed=2)
+        self.assertIsNone(intervals.points[POINTS[-1]][0])
+        lower, upper = intervals.average.accuracy_left_eye
+        self.assertTrue(lower <= self.result.average_accuracy_left <= upper)
+        for screen_point in POINTS[:-1]:
+            point, = self.result.points[screen_point]
+            point_intervals, = intervals.points[screen_point]
+            lower, upper = point_intervals.precision_left_eye
+            self.assertTrue(lower <= point.precision_left_eye <= upper)
+
+    def test_arguments(self):
+        point, = self.result.points[POINTS[0]]
+        self.assertRaises(ValueError, bootstrap_point, point, fixtures.DISPLAY_AREA, resamples=5)
+        self.assertRaises(ValueError, bootstrap_point, point, fixtures.DISPLAY_AREA, confidence=1.0)
+        self.assertRaises(ValueError, bootstrap_point, point, fixtures.DISPLAY_AREA, block_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
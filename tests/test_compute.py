@@ -0,0 +1,134 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import importlib
+import math
+import unittest
+
+from tobii_research_addons import ScreenBasedCalibrationValidation, CalibrationValidationPoint, Point2
+
+from . import fixtures
+
+_module = importlib.import_module("tobii_research_addons.ScreenBasedCalibrationValidation")
+
+SAMPLE_COUNT = 30
+POINTS = fixtures.point_grid(2)
+TIMED_OUT_POINT = Point2(0.5, 0.5)
+
+# The computations sum in different orders, so they only agree up to rounding errors
+RELATIVE_TOLERANCE = 1e-9
+
+_METRICS = ("accuracy_left_eye", "accuracy_right_eye", "precision_left_eye", "precision_right_eye",
+            "precision_rms_left_eye", "precision_rms_right_eye")
+_AVERAGES = ("average_accuracy_left", "average_accuracy_right", "average_precision_left", "average_precision_right",
+             "average_precision_rms_left", "average_precision_rms_right")
+
+
+class _WithoutNumpy(object):
+    '''Makes the calibration validation use the reference computations of plain Python.
+    '''
+
+    def __enter__(self):
+        self.__numpy = _module.numpy
+        _module.numpy = None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _module.numpy = self.__numpy
+
+
+def _collect(rounds=1, **kwargs):
+    '''Collect data for the points of a 2 x 2 grid in the given number of rounds, and a point that times out in the
+    first round and is completed in the second.
+    '''
+    eyetracker = fixtures.make_eyetracker()
+    validation = ScreenBasedCalibrationValidation(eyetracker, SAMPLE_COUNT, scheduler=fixtures.NeverScheduler(),
+                                                  **kwargs)
+    validation.enter_validation_mode()
+    for round_index in range(rounds):
+        for point_index, screen_point in enumerate(POINTS):
+            validation.start_collecting_data(screen_point)
+            eyetracker.play(fixtures.make_samples(screen_point, 2 * SAMPLE_COUNT, invalid_ratio=0.1,
+                                                  seed=100 * round_index + point_index))
+        validation.start_collecting_data(TIMED_OUT_POINT)
+        if round_index == 0:
+            eyetracker.play(fixtures.make_samples(TIMED_OUT_POINT, SAMPLE_COUNT // 2, seed=99))
+            validation.collection_deadline.fire()
+        else:
+            eyetracker.play(fixtures.make_samples(TIMED_OUT_POINT, 2 * SAMPLE_COUNT, seed=199))
+    result = validation.compute()
+    validation.leave_validation_mode()
+    return result
+
+
+def _compute(rounds=1, numpy=True, **kwargs):
+    if numpy:
+        return _collect(rounds, **kwargs)
+    with _WithoutNumpy():
+        return _collect(rounds, **kwargs)
+
+
+class ComputeTest(unittest.TestCase):
+
+    def assertClose(self, expected, actual, name):
+        if math.isnan(expected):
+            self.assertTrue(math.isnan(actual), name)
+        else:
+            self.assertTrue(math.isclose(expected, actual, rel_tol=RELATIVE_TOLERANCE),
+                            "{0}: {1!r} != {2!r}".format(name, expected, actual))
+
+    def assertSameResult(self, expected, actual):
+        for name in _AVERAGES:
+            self.assertClose(getattr(expected, name), getattr(actual, name), name)
+        self.assertEqual(sorted(expected.points), sorted(actual.points))
+        for screen_point, expected_points in expected.points.items():
+            actual_points = actual.points[screen_point]
+            self.assertEqual(len(expected_points), len(actual_points))
+            for expected_point, actual_point in zip(expected_points, actual_points):
+                self.assertEqual(expected_point.timed_out, actual_point.timed_out)
+                self.assertEqual(expected_point.stop_reason, actual_point.stop_reason)
+                self.assertEqual(len(expected_point.gaze_data), len(actual_point.gaze_data))
+                for name in _METRICS:
+                    self.assertClose(getattr(expected_point, name), getattr(actual_point, name), name)
+
+    def test_timed_out_point(self):
+        result = _compute(numpy=False)
+        point, = result.points[TIMED_OUT_POINT]
+        self.assertTrue(point.timed_out)
+        self.assertEqual(point.stop_reason, CalibrationValidationPoint.STOP_TIMEOUT)
+        self.assertTrue(math.isnan(point.accuracy_left_eye))
+        self.assertFalse(math.isnan(result.average_accuracy_left))
+
+    def test_merged_rounds(self):
+        result = _compute(rounds=2, numpy=False)
+        for screen_point in POINTS + [TIMED_OUT_POINT]:
+            point, = result.points[screen_point]
+            self.assertFalse(point.timed_out)
+        self.assertEqual(len(result.points[POINTS[0]][0].gaze_data), 2 * SAMPLE_COUNT)
+        self.assertEqual(len(result.points[TIMED_OUT_POINT][0].gaze_data), SAMPLE_COUNT)
+
+    def test_equivalent_computations(self):
+        variants = ({}, {"compact_storage": True}, {"online_statistics": True},
+                    {"online_statistics": True, "compact_storage": True})
+        for rounds in (1, 2):
+            reference = _compute(rounds, numpy=False)
+            for numpy in (True, False):
+                for kwargs in variants:
+                    with self.subTest(rounds=rounds, numpy=numpy, **kwargs):
+                        self.assertSameResult(reference, _compute(rounds, numpy, **kwargs))
+
+
+if __name__ == "__main__":
+    unittest.main()
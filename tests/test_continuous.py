@@ -0,0 +1,81 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import unittest
+
+from tobii_research_addons import ContinuousValidation, Point2
+
+from . import fixtures
+
+SAMPLE_COUNT = 60
+PERIOD = 1000000  # Longer than the samples of a target
+REGION = Point2(0.4, 0.4)
+TARGETS = (Point2(0.33, 0.45), Point2(0.47, 0.45))
+
+
+def _run(annotated_points, gaze_points, region_size=0.2, noise_degrees=0.1):
+    '''Play samples looking at each gaze point while the matching annotated point is the target, a few rounds.
+    '''
+    eyetracker = fixtures.make_eyetracker()
+    continuous = ContinuousValidation(eyetracker, window_size=len(annotated_points) * SAMPLE_COUNT * 2,
+                                      region_size=region_size)
+    with continuous:
+        start = 0
+        for round_index in range(2):
+            for index, (annotated_point, gaze_point) in enumerate(zip(annotated_points, gaze_points)):
+                continuous.add_target(annotated_point, start, start + PERIOD - 1)
+                eyetracker.play(fixtures.make_samples(gaze_point, SAMPLE_COUNT, noise_degrees=noise_degrees,
+                                                      seed=10 * round_index + index, start_time_stamp=start))
+                start += PERIOD
+    return continuous
+
+
+class ContinuousValidationTest(unittest.TestCase):
+
+    def test_targets_in_one_region(self):
+        statistics = _run(TARGETS, TARGETS).region_statistics(REGION)
+        self.assertEqual(statistics.sample_count, 4 * SAMPLE_COUNT)
+        # The distance between the targets must not count as imprecision
+        for eye in ("left_eye", "right_eye"):
+            self.assertLess(getattr(statistics, "precision_" + eye), 0.2)
+            self.assertLess(getattr(statistics, "precision_rms_" + eye), 0.3)
+            self.assertLess(getattr(statistics, "accuracy_" + eye), 0.05)
+
+    def test_opposite_offsets_do_not_cancel(self):
+        gaze_points = (Point2(0.35, 0.45), Point2(0.45, 0.45))
+        combined = _run(TARGETS, gaze_points).region_statistics(REGION)
+        separate = _run(TARGETS, gaze_points, region_size=0.05)
+        for eye in ("left_eye", "right_eye"):
+            expected = sum(getattr(separate.region_statistics(target), "accuracy_" + eye) for target in TARGETS) / 2
+            self.assertGreater(expected, 0.5)
+            self.assertAlmostEqual(getattr(combined, "accuracy_" + eye), expected, places=9)
+
+    def test_window_evicts_targets(self):
+        eyetracker = fixtures.make_eyetracker()
+        continuous = ContinuousValidation(eyetracker, window_size=SAMPLE_COUNT, region_size=0.2)
+        with continuous:
+            for index, target in enumerate(TARGETS):
+                continuous.add_target(target, index * PERIOD, (index + 1) * PERIOD - 1)
+                eyetracker.play(fixtures.make_samples(Point2(0.45, 0.45) if index else target, SAMPLE_COUNT,
+                                                      noise_degrees=0.1, seed=index, start_time_stamp=index * PERIOD))
+        # Only the samples of the second target are left in the window
+        statistics = continuous.region_statistics(REGION)
+        self.assertEqual(statistics.sample_count, SAMPLE_COUNT)
+        self.assertGreater(statistics.accuracy_left_eye, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
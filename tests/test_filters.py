@@ -0,0 +1,80 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import unittest
+
+from tobii_research_addons import GazeSample
+from tobii_research_addons.filters import _SampleFilter
+
+from . import fixtures
+
+
+def _sample(time_stamp, offset=0.0, valid=True):
+    '''A sample at a device time stamp in microseconds, with the gaze origins moved offset millimeters along x.
+    '''
+    left_eye = (fixtures.LEFT_EYE[0] + offset,) + fixtures.LEFT_EYE[1:]
+    right_eye = (fixtures.RIGHT_EYE[0] + offset,) + fixtures.RIGHT_EYE[1:]
+    return GazeSample(left_eye, (0.0, 150.0, 0.0), right_eye, (0.0, 150.0, 0.0), valid, valid, time_stamp, time_stamp)
+
+
+def _reasons(sample_filter, samples):
+    return [sample_filter.reject_reason(sample) for sample in samples]
+
+
+class SampleFilterTest(unittest.TestCase):
+
+    def test_create(self):
+        self.assertIsNone(_SampleFilter.create(1, 0, None, 0))
+        self.assertIsNotNone(_SampleFilter.create(2, 0, None, 0))
+        with self.assertRaises(ValueError):
+            _SampleFilter(decimation=0)
+        with self.assertRaises(ValueError):
+            _SampleFilter(max_gaze_origin_jump_mm=0)
+
+    def test_decimation(self):
+        reasons = _reasons(_SampleFilter(decimation=3), [_sample(index) for index in range(7)])
+        self.assertEqual(reasons, [None, "decimated", "decimated", None, "decimated", "decimated", None])
+
+    def test_min_sample_interval(self):
+        samples = [_sample(time_stamp) for time_stamp in (0, 1000, 2500, 3000, 5000)]
+        reasons = _reasons(_SampleFilter(min_sample_interval_us=2000), samples)
+        self.assertEqual(reasons, [None, "decimated", None, "decimated", None])
+
+    def test_blink_holdoff(self):
+        samples = [_sample(0), _sample(1000, valid=False), _sample(2000), _sample(3500), _sample(4000)]
+        reasons = _reasons(_SampleFilter(blink_holdoff_us=3000), samples)
+        self.assertEqual(reasons, [None, None, "after_blink", "after_blink", None])
+
+    def test_gaze_origin_spike(self):
+        samples = [_sample(0), _sample(1000, 0.5), _sample(2000, 20.0), _sample(3000, 0.5), _sample(4000, 1.0)]
+        reasons = _reasons(_SampleFilter(max_gaze_origin_jump_mm=5.0), samples)
+        self.assertEqual(reasons, [None, None, "gaze_origin_jump", None, None])
+
+    def test_gaze_origin_jump_after_blink(self):
+        # Samples rejected after a blink are not the reference of the jump check either
+        samples = [_sample(0), _sample(1000, valid=False), _sample(2000, 20.0), _sample(5000, 0.5)]
+        reasons = _reasons(_SampleFilter(max_gaze_origin_jump_mm=5.0, blink_holdoff_us=2000), samples)
+        self.assertEqual(reasons, [None, None, "after_blink", None])
+
+    def test_reset(self):
+        sample_filter = _SampleFilter(max_gaze_origin_jump_mm=5.0)
+        self.assertIsNone(sample_filter.reject_reason(_sample(0)))
+        sample_filter.reset()
+        self.assertIsNone(sample_filter.reject_reason(_sample(1000, 20.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
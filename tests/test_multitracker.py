@@ -0,0 +1,83 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import sys
+import threading
+import time
+import unittest
+
+from tobii_research_addons import MultiTrackerValidation, ReplayEyeTracker, SharedMemoryComputeWorker
+from tobii_research_addons import compute_validation
+
+from . import fixtures
+
+SAMPLE_COUNT = 30
+POINTS = fixtures.point_grid(2)
+
+
+class _FailingEyeTracker(ReplayEyeTracker):
+
+    def unsubscribe_from(self, subscription_type, callback=None):
+        raise RuntimeError("Connection lost")
+
+
+class MultiTrackerValidationTest(unittest.TestCase):
+
+    def run_validation(self, **kwargs):
+        eyetrackers = [fixtures.make_eyetracker() for _ in range(2)]
+        samples_by_point = fixtures.make_samples_by_point(POINTS, SAMPLE_COUNT)
+        players = []
+
+        def show_point(screen_point):
+            # Play the samples once data collection for the point has started on all eye trackers
+            def play():
+                for validation in multi.validations:
+                    while not validation.is_collecting_data:
+                        time.sleep(0.001)
+                for eyetracker in eyetrackers:
+                    eyetracker.play(samples_by_point[screen_point])
+            player = threading.Thread(target=play)
+            player.start()
+            players.append(player)
+
+        with MultiTrackerValidation(eyetrackers, SAMPLE_COUNT, 3000, **kwargs) as multi:
+            result = multi.run(POINTS, show_point)
+        for player in players:
+            player.join()
+        expected = compute_validation(samples_by_point, fixtures.DISPLAY_AREA, SAMPLE_COUNT)
+        self.assertEqual(len(result.results), 2)
+        for eyetracker in eyetrackers:
+            self.assertEqual(result.result_for(eyetracker).average_accuracy_left, expected.average_accuracy_left)
+        self.assertEqual(result.sample_count, 2 * len(POINTS) * SAMPLE_COUNT)
+
+    def test_run(self):
+        self.run_validation()
+
+    @unittest.skipIf(sys.version_info < (3, 8), "Shared memory requires Python 3.8 or later")
+    def test_run_in_worker(self):
+        with SharedMemoryComputeWorker() as worker:
+            self.run_validation(compute_worker=worker, compact_storage=True)
+
+    def test_leave_all(self):
+        eyetrackers = [_FailingEyeTracker(fixtures.DISPLAY_AREA), fixtures.make_eyetracker()]
+        multi = MultiTrackerValidation(eyetrackers, SAMPLE_COUNT, scheduler=fixtures.NeverScheduler())
+        multi.enter_validation_mode()
+        self.assertRaises(RuntimeError, multi.leave_validation_mode)
+        self.assertFalse(multi.validations[1].is_validation_mode)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import unittest
+
+from tobii_research_addons import Point2, PointIndex, ScreenBasedCalibrationValidation
+
+from . import fixtures
+
+
+class PointIndexTest(unittest.TestCase):
+
+    def test_grid_merging(self):
+        index = PointIndex(1e-6)
+        first = Point2(0.1 + 0.2, 0.5)
+        index[first] = "first"
+        index[Point2(0.3, 0.5)] = "second"
+        self.assertEqual(len(index), 1)
+        self.assertIs(index.key(Point2(0.3, 0.5)), first)
+        self.assertEqual(index[Point2(0.3 + 1e-8, 0.5)], "second")
+        self.assertTrue(index.matches(Point2(0.3, 0.5), first))
+        self.assertNotIn(Point2(0.3 + 1e-5, 0.5), index)
+        self.assertIsNone(index.key(Point2(0.7, 0.5)))
+
+    def test_delete(self):
+        index = PointIndex(items=[(Point2(0.1, 0.1), 1), (Point2(0.9, 0.9), 2)])
+        del index[Point2(0.1, 0.1)]
+        self.assertEqual(index.keys(), [Point2(0.9, 0.9)])
+        self.assertEqual(index.within(Point2(0.1, 0.1), 0.1), [])
+        self.assertRaises(KeyError, index.__delitem__, Point2(0.1, 0.1))
+
+    def test_within(self):
+        index = PointIndex(0.01, [(Point2(x / 10.0, 0.5), x) for x in range(11)])
+        found = index.within(Point2(0.52, 0.5), 0.15)
+        self.assertEqual([value for _, value in found], [5, 6, 4])
+        self.assertEqual(index.within(Point2(0.0, 0.0), 0.05), [])
+        self.assertEqual([value for _, value in index.within(Point2(0.0, 0.5), 0.0)], [0])
+        self.assertRaises(ValueError, index.within, Point2(0.5, 0.5), -1.0)
+
+    def test_points_within(self):
+        eyetracker = fixtures.make_eyetracker()
+        validation = ScreenBasedCalibrationValidation(eyetracker, 10, scheduler=fixtures.NeverScheduler())
+        validation.enter_validation_mode()
+        for screen_point in fixtures.point_grid(3):
+            validation.start_collecting_data(screen_point)
+            eyetracker.play(fixtures.make_samples(screen_point, 10))
+        self.assertEqual(validation.points_within(Point2(0.45, 0.5), 0.1), [Point2(0.5, 0.5)])
+        self.assertEqual(len(validation.points_within(Point2(0.5, 0.5), 0.4)), 5)
+        validation.leave_validation_mode()
+
+    def test_resolution(self):
+        self.assertRaises(ValueError, PointIndex, 0.0)
+        self.assertRaises(ValueError, PointIndex, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
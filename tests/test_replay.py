@@ -0,0 +1,69 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from tobii_research_addons import GazeSampleStore, ValidationRecording, compute_validation, replay_validation
+
+from . import fixtures
+
+SAMPLE_COUNT = 30
+POINTS = fixtures.point_grid(2)
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.samples_by_point = fixtures.make_samples_by_point(POINTS, SAMPLE_COUNT, short_points=POINTS[-1:])
+        self.recording = ValidationRecording(fixtures.DISPLAY_AREA, [(screen_point, self.samples_by_point[screen_point])
+                                                                     for screen_point in POINTS])
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "recording.jsonl")
+            self.recording.save(path)
+            loaded = ValidationRecording.load(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(loaded.display_area.to_dict(), self.recording.display_area.to_dict())
+        self.assertEqual([screen_point for screen_point, _ in loaded.points], POINTS)
+        for (_, expected), (_, actual) in zip(self.recording.points, loaded.points):
+            for name in GazeSampleStore.column_names():
+                self.assertEqual(actual.column(name).tolist(), expected.column(name).tolist())
+
+    def test_replay_validation(self):
+        replayed = replay_validation(self.recording, SAMPLE_COUNT)
+        computed = compute_validation(self.samples_by_point, fixtures.DISPLAY_AREA, SAMPLE_COUNT)
+        self.assertTrue(replayed.points[POINTS[-1]][0].timed_out)
+        for screen_point in POINTS[:-1]:
+            expected, = computed.points[screen_point]
+            actual, = replayed.points[screen_point]
+            self.assertFalse(actual.timed_out)
+            self.assertTrue(math.isclose(actual.accuracy_left_eye, expected.accuracy_left_eye, rel_tol=1e-9))
+            self.assertTrue(math.isclose(actual.precision_rms_right_eye, expected.precision_rms_right_eye,
+                                         rel_tol=1e-9))
+
+    def test_buffered_ingestion(self):
+        self.assertRaises(ValueError, replay_validation, self.recording, ingestion_buffer_size=100)
+
+
+if __name__ == "__main__":
+    unittest.main()
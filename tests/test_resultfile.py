@@ -0,0 +1,88 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from tobii_research_addons import GazeSampleStore, compute_validation, load_result, save_result
+
+from . import fixtures
+
+SAMPLE_COUNT = 30
+POINTS = fixtures.point_grid(2)
+
+
+class ResultFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "result.bin")
+        samples_by_point = fixtures.make_samples_by_point(POINTS, 2 * SAMPLE_COUNT, short_points=POINTS[-1:])
+        self.result = compute_validation(samples_by_point, fixtures.DISPLAY_AREA, SAMPLE_COUNT)
+        save_result(self.path, self.result, fixtures.DISPLAY_AREA, SAMPLE_COUNT)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def truncate(self, size):
+        with io.open(self.path, "r+b") as f:
+            f.truncate(size)
+
+    def test_round_trip(self):
+        loaded = load_result(self.path)
+        self.assertEqual(loaded.sample_count, SAMPLE_COUNT)
+        self.assertEqual(loaded.display_area.top_left, fixtures.DISPLAY_AREA.top_left)
+        self.assertEqual(loaded.display_area.bottom_left, fixtures.DISPLAY_AREA.bottom_left)
+        self.assertEqual(loaded.result.average_accuracy_left, self.result.average_accuracy_left)
+        self.assertEqual(loaded.result.average_precision_rms_right, self.result.average_precision_rms_right)
+        for screen_point in POINTS:
+            expected, = self.result.points[screen_point]
+            actual, = loaded.result.points[screen_point]
+            self.assertEqual(actual.timed_out, expected.timed_out)
+            self.assertEqual(actual.stop_reason, expected.stop_reason)
+            self.assertEqual(repr(actual.accuracy_left_eye), repr(expected.accuracy_left_eye))
+            self.assertEqual(repr(actual.precision_right_eye), repr(expected.precision_right_eye))
+            self.assertIsInstance(actual.gaze_data, GazeSampleStore)
+            stored = GazeSampleStore(len(expected.gaze_data))
+            stored.extend(expected.gaze_data)
+            for name in GazeSampleStore.column_names():
+                self.assertEqual(actual.gaze_data.column(name).tolist(), stored.column(name).tolist())
+        self.assertEqual(loaded.compute().average_accuracy_right, self.result.average_accuracy_right)
+
+    def test_not_a_result_file(self):
+        with io.open(self.path, "r+b") as f:
+            f.write(b"NOTVALID")
+        self.assertRaises(ValueError, load_result, self.path)
+
+    # The header is 144 bytes and each point adds 88 bytes to the point table
+    def test_truncated_header(self):
+        self.truncate(100)
+        self.assertRaises(ValueError, load_result, self.path)
+
+    def test_truncated_point_table(self):
+        self.truncate(144 + 88 + 40)
+        self.assertRaises(ValueError, load_result, self.path)
+
+    def test_truncated_samples(self):
+        self.truncate(os.path.getsize(self.path) - 8)
+        self.assertRaises(ValueError, load_result, self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
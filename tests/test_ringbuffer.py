@@ -0,0 +1,52 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import unittest
+
+from tobii_research_addons import SampleRingBuffer
+
+
+class SampleRingBufferTest(unittest.TestCase):
+
+    def test_wraparound(self):
+        buffer = SampleRingBuffer(4)
+        pushed = 0
+        for batch in (3, 4, 2, 4, 1):
+            samples = list(range(pushed, pushed + batch))
+            pushed += batch
+            for sample in samples:
+                self.assertTrue(buffer.push(sample))
+            self.assertEqual(len(buffer), batch)
+            self.assertEqual(buffer.pop_all(), samples)
+            self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.dropped_count, 0)
+
+    def test_overflow(self):
+        buffer = SampleRingBuffer(3)
+        results = [buffer.push(sample) for sample in range(5)]
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(buffer.dropped_count, 2)
+        self.assertEqual(buffer.pop_all(), [0, 1, 2])
+        self.assertTrue(buffer.push(5))
+        self.assertEqual(buffer.pop_all(), [5])
+        self.assertEqual(buffer.pop_all(), [])
+
+    def test_capacity(self):
+        self.assertRaises(ValueError, SampleRingBuffer, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
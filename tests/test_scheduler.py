@@ -0,0 +1,69 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import threading
+import unittest
+
+from tobii_research_addons import Deadline, DeadlineScheduler
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def test_fire_once(self):
+        calls = []
+        deadline = Deadline(0.0, lambda: calls.append(1))
+        self.assertTrue(deadline.fire())
+        self.assertFalse(deadline.fire())
+        self.assertEqual(calls, [1])
+        self.assertIsNotNone(deadline.lateness)
+        self.assertFalse(deadline.cancel())
+
+    def test_cancel(self):
+        calls = []
+        deadline = Deadline(0.0, lambda: calls.append(1))
+        self.assertTrue(deadline.cancel())
+        self.assertTrue(deadline.cancelled)
+        self.assertFalse(deadline.fire())
+        self.assertEqual(calls, [])
+        self.assertIsNone(deadline.lateness)
+
+
+class DeadlineSchedulerTest(unittest.TestCase):
+
+    def test_order(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+        done = threading.Event()
+        scheduler.schedule(0.1, lambda: (fired.append("late"), done.set()))
+        scheduler.schedule(0.02, lambda: fired.append("early"))
+        self.assertTrue(done.wait(5.0))
+        self.assertEqual(fired, ["early", "late"])
+
+    def test_cancel_and_reschedule(self):
+        scheduler = DeadlineScheduler()
+        fired = []
+        done = threading.Event()
+        cancelled = scheduler.schedule(0.02, lambda: fired.append("cancelled"))
+        self.assertTrue(cancelled.cancel())
+        rescheduled = scheduler.schedule(0.05, lambda: (fired.append("rescheduled"), done.set()))
+        self.assertTrue(done.wait(5.0))
+        self.assertEqual(fired, ["rescheduled"])
+        self.assertIsNone(cancelled.fired_at)
+        self.assertGreaterEqual(rescheduled.lateness, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
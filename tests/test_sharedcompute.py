@@ -0,0 +1,76 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import sys
+import unittest
+
+from tobii_research_addons import GazeSampleStore, ScreenBasedCalibrationValidation, SharedMemoryComputeWorker
+from tobii_research_addons import compute_validation
+
+from . import fixtures
+
+SAMPLE_COUNT = 30
+POINTS = fixtures.point_grid(2)
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "Shared memory requires Python 3.8 or later")
+class SharedMemoryComputeWorkerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.worker = SharedMemoryComputeWorker()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.worker.close()
+
+    def test_submit(self):
+        samples_by_point = fixtures.make_samples_by_point(POINTS, SAMPLE_COUNT, short_points=POINTS[-1:])
+        stores = {}
+        for screen_point, samples in samples_by_point.items():
+            stores[screen_point] = GazeSampleStore(len(samples))
+            stores[screen_point].extend(samples)
+        expected = compute_validation(samples_by_point, fixtures.DISPLAY_AREA, SAMPLE_COUNT)
+        for samples in (samples_by_point, stores):
+            result = self.worker.submit(samples, fixtures.DISPLAY_AREA, SAMPLE_COUNT).result()
+            self.assertTrue(result.points[POINTS[-1]][0].timed_out)
+            self.assertEqual(result.average_accuracy_left, expected.average_accuracy_left)
+            self.assertEqual(result.average_precision_right, expected.average_precision_right)
+            for screen_point in POINTS:
+                self.assertIs(result.points[screen_point][0].gaze_data, samples[screen_point])
+
+    def test_submit_compute(self):
+        eyetracker = fixtures.make_eyetracker()
+        validation = ScreenBasedCalibrationValidation(eyetracker, SAMPLE_COUNT, compact_storage=True,
+                                                      scheduler=fixtures.NeverScheduler())
+        validation.enter_validation_mode()
+        samples_by_point = fixtures.make_samples_by_point(POINTS, SAMPLE_COUNT)
+        for screen_point in POINTS:
+            validation.start_collecting_data(screen_point)
+            eyetracker.play(samples_by_point[screen_point])
+        result = validation.submit_compute(self.worker).result()
+        expected = compute_validation(samples_by_point, fixtures.DISPLAY_AREA, SAMPLE_COUNT)
+        self.assertEqual(result.average_accuracy_left, expected.average_accuracy_left)
+        self.assertEqual(result.average_precision_rms_right, expected.average_precision_rms_right)
+        validation.leave_validation_mode()
+
+    def test_submit_compute_requires_compact_storage(self):
+        validation = ScreenBasedCalibrationValidation(fixtures.make_eyetracker(), SAMPLE_COUNT)
+        self.assertRaises(RuntimeWarning, validation.submit_compute, self.worker)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import math
+import unittest
+
+from tobii_research_addons import RecordedDisplayArea, ReplayEyeTracker, ScreenBasedCalibrationValidation
+from tobii_research_addons import compute_validation
+
+from . import fixtures
+
+SAMPLE_COUNT = 30
+POINTS = fixtures.point_grid(2)
+
+
+class _MovableEyeTracker(ReplayEyeTracker):
+    '''A replay eye tracker whose display area can be changed, without notifying the change.
+    '''
+
+    def __init__(self, display_area):
+        super(_MovableEyeTracker, self).__init__(display_area)
+        self.display_area = display_area
+
+    def get_display_area(self):
+        return self.display_area
+
+
+def _collect(validation, eyetracker, samples_by_point):
+    validation.enter_validation_mode()
+    for screen_point in POINTS:
+        validation.start_collecting_data(screen_point)
+        eyetracker.play(samples_by_point[screen_point])
+    result = validation.compute()
+    validation.leave_validation_mode()
+    return result
+
+
+class DisplayAreaTest(unittest.TestCase):
+
+    def test_changed_outside_validation_mode(self):
+        samples_by_point = fixtures.make_samples_by_point(POINTS, SAMPLE_COUNT)
+        eyetracker = _MovableEyeTracker(fixtures.DISPLAY_AREA)
+        validation = ScreenBasedCalibrationValidation(eyetracker, SAMPLE_COUNT, scheduler=fixtures.NeverScheduler())
+        _collect(validation, eyetracker, samples_by_point)
+
+        # Move the display area 100 mm to the right while not in validation mode
+        moved = RecordedDisplayArea(*[(x + 100.0, y, z) for x, y, z in (fixtures.DISPLAY_AREA.top_left,
+                                                                          fixtures.DISPLAY_AREA.top_right,
+                                                                          fixtures.DISPLAY_AREA.bottom_left)])
+        eyetracker.display_area = moved
+        result = _collect(validation, eyetracker, samples_by_point)
+        expected = compute_validation(samples_by_point, moved, SAMPLE_COUNT)
+        self.assertGreater(expected.average_accuracy_left, 5.0)
+        self.assertTrue(math.isclose(result.average_accuracy_left, expected.average_accuracy_left, rel_tol=1e-9))
+        self.assertEqual(validation.display_area.top_left, moved.top_left)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,14 +18,27 @@ import math
 import threading
 from collections import defaultdict
 
-import tobii_research
-from . import vectormath
+from . import _sdk, vectormath
+from .filters import _SampleFilter
+from .instrumentation import _TimedLock, perf_counter
+from .pointindex import PointIndex
+from .ringbuffer import SampleRingBuffer
+from .samplestore import GazeSampleStore
+from .scheduler import DeadlineScheduler, monotonic
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class CalibrationValidationPoint(object):
     '''Represents a collected point that goes into the calibration validation. It contains calculated values for
     accuracy and precision as well as the original gaze samples collected for the point.
     '''
+    STOP_SAMPLE_COUNT = "sample_count"  # sample_count samples were collected
+    STOP_CONVERGED = "converged"  # accuracy and precision were known within the tolerance of an adaptive validation
+    STOP_TIMEOUT = "timeout"  # the timeout expired first
 
     def __init__(self,
                  accuracy_left_eye,
@@ -36,7 +49,8 @@ class CalibrationValidationPoint(object):
                  precision_rms_right_eye,
                  timed_out,
                  screen_point,
-                 gaze_data):
+                 gaze_data,
+                 stop_reason=None):
         self.__accuracy_left_eye = accuracy_left_eye
         self.__accuracy_right_eye = accuracy_right_eye
         self.__precision_left_eye = precision_left_eye
@@ -46,6 +60,7 @@ class CalibrationValidationPoint(object):
         self.__timed_out = timed_out
         self.__screen_point = screen_point
         self.__gaze_data = gaze_data
+        self.__stop_reason = stop_reason
 
     @property
     def accuracy_left_eye(self):
@@ -102,6 +117,13 @@ class CalibrationValidationPoint(object):
         '''
         return self.__gaze_data
 
+    @property
+    def stop_reason(self):
+        '''Why data collection for this point stopped: STOP_SAMPLE_COUNT, STOP_CONVERGED, STOP_TIMEOUT, or None if it is
+        not known, for example for results computed from stored samples.
+        '''
+        return self.__stop_reason
+
 
 class CalibrationValidationResult(object):
     '''Contains the result of the calibration validation.
@@ -200,6 +222,391 @@ def _calculate_eye_precision_rms(direction_gaze_point_list):
     return rms
 
 
+def _calculate_point_reference(samples, stimuli_point):
+    '''Calculate accuracy, precision and RMS precision for both eyes one sample at a time. This is the reference
+    implementation used when NumPy is not available.
+    '''
+    # Prepare data from samples
+    gaze_origin_left_all = []
+    gaze_origin_right_all = []
+    gaze_point_left_all = []
+    gaze_point_right_all = []
+    direction_gaze_point_left_all = []
+    direction_gaze_point_left_mean_all = []
+    direction_gaze_point_right_all = []
+    direction_gaze_point_right_mean_all = []
+
+    for sample in samples:
+        gaze_origin_left_all.append(
+            vectormath.Point3.from_list(sample.left_eye.gaze_origin.position_in_user_coordinates))
+        gaze_origin_right_all.append(
+            vectormath.Point3.from_list(sample.right_eye.gaze_origin.position_in_user_coordinates))
+        gaze_point_left_all.append(
+            vectormath.Point3.from_list(sample.left_eye.gaze_point.position_in_user_coordinates))
+        gaze_point_right_all.append(
+            vectormath.Point3.from_list(sample.right_eye.gaze_point.position_in_user_coordinates))
+
+    gaze_origin_left_mean = vectormath.calculate_mean_point(gaze_origin_left_all)
+    gaze_origin_right_mean = vectormath.calculate_mean_point(gaze_origin_right_all)
+    gaze_point_left_mean = vectormath.calculate_mean_point(gaze_point_left_all)
+    gaze_point_right_mean = vectormath.calculate_mean_point(gaze_point_right_all)
+
+    for gaze_origin_left, gaze_origin_right, gaze_point_left, gaze_point_right in zip(
+            gaze_origin_left_all, gaze_origin_right_all, gaze_point_left_all, gaze_point_right_all):
+        direction_gaze_point_left_all.append(
+            vectormath.Vector3.from_points(gaze_origin_left, gaze_point_left).normalize())
+        direction_gaze_point_left_mean_all.append(
+            vectormath.Vector3.from_points(gaze_origin_left, gaze_point_left_mean).normalize())
+        direction_gaze_point_right_all.append(
+            vectormath.Vector3.from_points(gaze_origin_right, gaze_point_right).normalize())
+        direction_gaze_point_right_mean_all.append(
+            vectormath.Vector3.from_points(gaze_origin_right, gaze_point_right_mean).normalize())
+
+    # Accuracy calculations
+    accuracy_left_eye = _calculate_eye_accuracy(gaze_origin_left_mean, gaze_point_left_mean, stimuli_point)
+    accuracy_right_eye = _calculate_eye_accuracy(gaze_origin_right_mean, gaze_point_right_mean, stimuli_point)
+
+    # Precision calculations
+    precision_left_eye = _calculate_eye_precision(
+        direction_gaze_point_left_all, direction_gaze_point_left_mean_all)
+    precision_right_eye = _calculate_eye_precision(
+        direction_gaze_point_right_all, direction_gaze_point_right_mean_all)
+
+    # RMS precision calculations
+    precision_rms_left_eye = _calculate_eye_precision_rms(direction_gaze_point_left_all)
+    precision_rms_right_eye = _calculate_eye_precision_rms(direction_gaze_point_right_all)
+
+    return (accuracy_left_eye, accuracy_right_eye,
+            precision_left_eye, precision_right_eye,
+            precision_rms_left_eye, precision_rms_right_eye)
+
+
+def _calculate_eye_precision_vectorized(gaze_origins, direction_gaze_point, gaze_point_mean):
+    '''Calculate standard deviation of gaze point angles from a @ref Point3Array of gaze origins and a
+    @ref Vector3Array of normalized gaze directions.
+    '''
+    direction_gaze_point_mean = vectormath.Vector3Array.from_points(gaze_origins, gaze_point_mean).normalize()
+    angles = direction_gaze_point.angle(direction_gaze_point_mean)
+    return math.sqrt(numpy.mean(angles ** 2))
+
+
+def _calculate_eye_vectorized(gaze_origins, gaze_points, stimuli_point):
+    '''Calculate accuracy, precision and RMS precision for one eye from @ref Point3Array objects of gaze origins and
+    gaze points.
+    '''
+    gaze_origin_mean = gaze_origins.mean()
+    gaze_point_mean = gaze_points.mean()
+
+    accuracy = _calculate_eye_accuracy(gaze_origin_mean, gaze_point_mean, stimuli_point)
+
+    direction_gaze_point = vectormath.Vector3Array.from_points(gaze_origins, gaze_points).normalize()
+    precision = _calculate_eye_precision_vectorized(gaze_origins, direction_gaze_point, gaze_point_mean)
+
+    consecutive_angle_diffs = direction_gaze_point[1:].angle(direction_gaze_point[:-1])
+    precision_rms = math.sqrt(numpy.mean(consecutive_angle_diffs ** 2))
+
+    return accuracy, precision, precision_rms
+
+
+def _positions(samples, eye, position):
+    '''Get a @ref Point3Array of positions from a list of gaze data or straight from the arrays of a
+    @ref GazeSampleStore.
+    '''
+    if isinstance(samples, GazeSampleStore):
+        return vectormath.Point3Array(numpy.frombuffer(samples.column(eye + "_" + position), dtype=numpy.float64))
+    return vectormath.Point3Array.from_gaze_data(samples, eye, position)
+
+
+def _calculate_point_vectorized(samples, stimuli_point):
+    '''Calculate accuracy, precision and RMS precision for both eyes with batched array operations.
+    '''
+    accuracy_left_eye, precision_left_eye, precision_rms_left_eye = _calculate_eye_vectorized(
+        _positions(samples, "left", "gaze_origin"),
+        _positions(samples, "left", "gaze_point"),
+        stimuli_point)
+    accuracy_right_eye, precision_right_eye, precision_rms_right_eye = _calculate_eye_vectorized(
+        _positions(samples, "right", "gaze_origin"),
+        _positions(samples, "right", "gaze_point"),
+        stimuli_point)
+
+    return (accuracy_left_eye, accuracy_right_eye,
+            precision_left_eye, precision_right_eye,
+            precision_rms_left_eye, precision_rms_right_eye)
+
+
+def _calculate_point(samples, stimuli_point):
+    '''Calculate accuracy, precision and RMS precision for both eyes. Uses the vectorized implementation when NumPy
+    is available and falls back to the reference implementation otherwise.
+    '''
+    if numpy is None:
+        return _calculate_point_reference(samples, stimuli_point)
+    return _calculate_point_vectorized(samples, stimuli_point)
+
+
+def _calculate_precision(samples, gaze_point_left_mean, gaze_point_right_mean):
+    '''Calculate the standard deviation of gaze point angles for both eyes, given the mean gaze points.
+    '''
+    if numpy is not None:
+        precision = []
+        for eye, gaze_point_mean in (("left", gaze_point_left_mean), ("right", gaze_point_right_mean)):
+            gaze_origins = _positions(samples, eye, "gaze_origin")
+            direction_gaze_point = vectormath.Vector3Array.from_points(
+                gaze_origins, _positions(samples, eye, "gaze_point")).normalize()
+            precision.append(_calculate_eye_precision_vectorized(gaze_origins, direction_gaze_point, gaze_point_mean))
+        return tuple(precision)
+
+    direction_gaze_point_left_all = []
+    direction_gaze_point_left_mean_all = []
+    direction_gaze_point_right_all = []
+    direction_gaze_point_right_mean_all = []
+    for sample in samples:
+        gaze_origin_left = vectormath.Point3.from_list(sample.left_eye.gaze_origin.position_in_user_coordinates)
+        gaze_origin_right = vectormath.Point3.from_list(sample.right_eye.gaze_origin.position_in_user_coordinates)
+        direction_gaze_point_left_all.append(vectormath.Vector3.from_points(
+            gaze_origin_left,
+            vectormath.Point3.from_list(sample.left_eye.gaze_point.position_in_user_coordinates)).normalize())
+        direction_gaze_point_left_mean_all.append(
+            vectormath.Vector3.from_points(gaze_origin_left, gaze_point_left_mean).normalize())
+        direction_gaze_point_right_all.append(vectormath.Vector3.from_points(
+            gaze_origin_right,
+            vectormath.Point3.from_list(sample.right_eye.gaze_point.position_in_user_coordinates)).normalize())
+        direction_gaze_point_right_mean_all.append(
+            vectormath.Vector3.from_points(gaze_origin_right, gaze_point_right_mean).normalize())
+    return (_calculate_eye_precision(direction_gaze_point_left_all, direction_gaze_point_left_mean_all),
+            _calculate_eye_precision(direction_gaze_point_right_all, direction_gaze_point_right_mean_all))
+
+
+def _estimate_precision(gaze_origin_mean, gaze_point_mean, covariance):
+    '''Estimate the STD precision in degrees from the covariance of the gaze points (xx, xy, xz, yy, yz, zz), using
+    the spread perpendicular to the mean gaze direction. Uses the small angle approximation, which is accurate well
+    beyond the angles seen in practice.
+    '''
+    direction = vectormath.Vector3.from_points(gaze_origin_mean, gaze_point_mean)
+    distance = direction.magnitude()
+    ux, uy, uz = direction * (1.0 / distance)
+    xx, xy, xz, yy, yz, zz = covariance
+    along = ux * ux * xx + uy * uy * yy + uz * uz * zz + 2.0 * (ux * uy * xy + ux * uz * xz + uy * uz * yz)
+    perpendicular = max(xx + yy + zz - along, 0.0)
+    return math.degrees(math.sqrt(perpendicular) / distance)
+
+
+_CONFIDENCE_95 = 1.96  # standard normal quantile of a two-sided 95% confidence interval
+
+
+class _EyeAccumulator(object):
+    '''Running statistics for one eye of a validation point, updated one sample at a time.
+
+    The sums of the gaze origins and gaze points and the sum of squared consecutive angles are accumulated in sample
+    order, so the means and the RMS precision are identical to a two-pass calculation. The STD precision depends on
+    the final mean gaze point and needs a second pass, the co-moment of the gaze points (Welford) is kept to estimate
+    it while data is still being collected.
+    '''
+    __slots__ = ("count", "gaze_origin_sum", "gaze_point_sum", "gaze_point_mean", "gaze_point_comoment",
+                 "first_direction", "last_direction", "rms_sum_of_squares", "rms_count")
+
+    def __init__(self):
+        self.count = 0
+        self.gaze_origin_sum = vectormath.Point3()
+        self.gaze_point_sum = vectormath.Point3()
+        self.gaze_point_mean = vectormath.Point3()
+        self.gaze_point_comoment = [0.0] * 6  # xx, xy, xz, yy, yz, zz
+        self.first_direction = None
+        self.last_direction = None
+        self.rms_sum_of_squares = 0.0
+        self.rms_count = 0
+
+    def copy(self):
+        other = _EyeAccumulator()
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.gaze_point_comoment = list(self.gaze_point_comoment)
+        return other
+
+    def add(self, gaze_origin, gaze_point):
+        self.count += 1
+        self.gaze_origin_sum = self.gaze_origin_sum + gaze_origin
+        self.gaze_point_sum = self.gaze_point_sum + gaze_point
+
+        dx, dy, dz = gaze_point - self.gaze_point_mean
+        self.gaze_point_mean = self.gaze_point_mean + vectormath.Point3(dx, dy, dz) * (1.0 / self.count)
+        ex, ey, ez = gaze_point - self.gaze_point_mean
+        comoment = self.gaze_point_comoment
+        comoment[0] += dx * ex
+        comoment[1] += dx * ey
+        comoment[2] += dx * ez
+        comoment[3] += dy * ey
+        comoment[4] += dy * ez
+        comoment[5] += dz * ez
+
+        direction = vectormath.Vector3.from_points(gaze_origin, gaze_point).normalize()
+        if self.last_direction is None:
+            self.first_direction = direction
+        else:
+            self.rms_sum_of_squares += direction.angle(self.last_direction) ** 2
+            self.rms_count += 1
+        self.last_direction = direction
+
+    def merge(self, other):
+        '''Append the statistics of samples collected after the samples of this accumulator.'''
+        if other.count == 0:
+            return
+        if self.count == 0:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            self.gaze_point_comoment = list(other.gaze_point_comoment)
+            return
+
+        count = self.count + other.count
+        dx, dy, dz = other.gaze_point_mean - self.gaze_point_mean
+        weight = float(self.count) * other.count / count
+        for i, product in enumerate((dx * dx, dx * dy, dx * dz, dy * dy, dy * dz, dz * dz)):
+            self.gaze_point_comoment[i] += other.gaze_point_comoment[i] + product * weight
+        self.gaze_point_mean = self.gaze_point_mean + vectormath.Point3(dx, dy, dz) * (float(other.count) / count)
+
+        self.gaze_origin_sum = self.gaze_origin_sum + other.gaze_origin_sum
+        self.gaze_point_sum = self.gaze_point_sum + other.gaze_point_sum
+        self.rms_sum_of_squares += other.first_direction.angle(self.last_direction) ** 2 + other.rms_sum_of_squares
+        self.rms_count += other.rms_count + 1
+        self.last_direction = other.last_direction
+        self.count = count
+
+    def means(self):
+        factor = 1.0 / self.count
+        return self.gaze_origin_sum * factor, self.gaze_point_sum * factor
+
+    def precision_rms(self):
+        if self.rms_count == 0:
+            return math.nan
+        return math.sqrt(self.rms_sum_of_squares / self.rms_count)
+
+    def estimate_precision(self, gaze_origin_mean, gaze_point_mean):
+        '''Estimate the STD precision from the spread of the gaze points perpendicular to the mean gaze direction.
+        '''
+        return _estimate_precision(gaze_origin_mean, gaze_point_mean,
+                                   [value / self.count for value in self.gaze_point_comoment])
+
+    def autocorrelation(self, precision):
+        '''Estimate the lag-1 autocorrelation of the gaze directions from the STD precision. The mean squared angle
+        between consecutive directions is 2 * precision^2 * (1 - rho), so closely following samples have a small RMS
+        precision compared to their STD precision. Negative correlations are taken as 0.
+        '''
+        if self.rms_count == 0 or not precision > 0.0:
+            return 0.0
+        rho = 1.0 - self.rms_sum_of_squares / self.rms_count / (2.0 * precision * precision)
+        return min(max(rho, 0.0), 1.0)
+
+
+class _PointAccumulator(object):
+    '''Running statistics for both eyes of a validation point.
+    '''
+
+    def __init__(self):
+        self.left = _EyeAccumulator()
+        self.right = _EyeAccumulator()
+        self.__precision = None  # Cached result of the second pass over the samples
+
+    @property
+    def count(self):
+        return self.left.count
+
+    def copy(self):
+        other = _PointAccumulator()
+        other.left = self.left.copy()
+        other.right = self.right.copy()
+        return other
+
+    def add(self, gaze_data):
+        left_eye = gaze_data.left_eye
+        right_eye = gaze_data.right_eye
+        self.left.add(vectormath.Point3.from_list(left_eye.gaze_origin.position_in_user_coordinates),
+                      vectormath.Point3.from_list(left_eye.gaze_point.position_in_user_coordinates))
+        self.right.add(vectormath.Point3.from_list(right_eye.gaze_origin.position_in_user_coordinates),
+                       vectormath.Point3.from_list(right_eye.gaze_point.position_in_user_coordinates))
+        self.__precision = None
+
+    def merge(self, other):
+        self.left.merge(other.left)
+        self.right.merge(other.right)
+        self.__precision = None
+
+    def finalize(self, samples, stimuli_point):
+        '''Calculate the metrics of the point. Only the STD precision needs the samples, and it is calculated once
+        until more samples are added.
+        '''
+        gaze_origin_left_mean, gaze_point_left_mean = self.left.means()
+        gaze_origin_right_mean, gaze_point_right_mean = self.right.means()
+        if self.__precision is None:
+            self.__precision = _calculate_precision(samples, gaze_point_left_mean, gaze_point_right_mean)
+        precision_left_eye, precision_right_eye = self.__precision
+        return (_calculate_eye_accuracy(gaze_origin_left_mean, gaze_point_left_mean, stimuli_point),
+                _calculate_eye_accuracy(gaze_origin_right_mean, gaze_point_right_mean, stimuli_point),
+                precision_left_eye,
+                precision_right_eye,
+                self.left.precision_rms(),
+                self.right.precision_rms())
+
+    def confidence_margin(self):
+        '''Estimate the half widths of the 95% confidence intervals of the mean gaze direction and of the STD
+        precision in degrees, and return the largest for the two eyes. Consecutive samples are correlated, so the
+        intervals use the effective number of independent samples of a first order autoregressive process instead of
+        the sample count.
+        '''
+        margin = 0.0
+        for eye in (self.left, self.right):
+            gaze_origin_mean, gaze_point_mean = eye.means()
+            precision = eye.estimate_precision(gaze_origin_mean, gaze_point_mean)
+            rho = eye.autocorrelation(precision)
+            mean_count = max(1.0, eye.count * (1.0 - rho) / (1.0 + rho))
+            variance_count = max(1.0, eye.count * (1.0 - rho * rho) / (1.0 + rho * rho))
+            margin = max(margin,
+                         _CONFIDENCE_95 * precision / math.sqrt(mean_count),
+                         _CONFIDENCE_95 * precision / math.sqrt(2.0 * variance_count))
+        return margin
+
+    def estimate(self, stimuli_point):
+        '''Calculate the metrics of the point from the accumulated values only, with estimated STD precision.
+        '''
+        metrics = []
+        for eye in (self.left, self.right):
+            gaze_origin_mean, gaze_point_mean = eye.means()
+            metrics.append((_calculate_eye_accuracy(gaze_origin_mean, gaze_point_mean, stimuli_point),
+                            eye.estimate_precision(gaze_origin_mean, gaze_point_mean),
+                            eye.precision_rms()))
+        (accuracy_left_eye, precision_left_eye, precision_rms_left_eye), \
+            (accuracy_right_eye, precision_right_eye, precision_rms_right_eye) = metrics
+        return (accuracy_left_eye, accuracy_right_eye,
+                precision_left_eye, precision_right_eye,
+                precision_rms_left_eye, precision_rms_right_eye)
+
+
+def _calculate_result(points):
+    '''Create the result from the calibration validation points, averaging the points that did not time out.
+    '''
+    metrics = [(point.accuracy_left_eye, point.accuracy_right_eye,
+                point.precision_left_eye, point.precision_right_eye,
+                point.precision_rms_left_eye, point.precision_rms_right_eye)
+               for validation_points in points.values()
+               for point in validation_points
+               if not point.timed_out]
+    num_points = len(metrics)
+    if num_points > 0:
+        averages = [sum(values) / num_points for values in zip(*metrics)]
+    else:
+        averages = [math.nan] * 6
+    return CalibrationValidationResult(points, *averages)
+
+
+def _rejection_reason(gaze_data):
+    left_valid = gaze_data.left_eye.gaze_point.validity
+    right_valid = gaze_data.right_eye.gaze_point.validity
+    if not left_valid and not right_valid:
+        return "both_invalid"
+    return "right_invalid" if left_valid else "left_invalid"
+
+
+_EYETRACKER_METHODS = ("subscribe_to", "unsubscribe_from", "get_display_area")
+
+
 class ScreenBasedCalibrationValidation(object):
     '''Provides methods and properties for managing calibration validation for screen based eye trackers.
     '''
@@ -207,22 +614,71 @@ class ScreenBasedCalibrationValidation(object):
     SAMPLE_COUNT_MAX = 3000
     TIMEOUT_MIN = 100  # ms
     TIMEOUT_MAX = 3000  # ms
+    INGESTION_POLL_INTERVAL = 0.002  # s
 
     def __init__(self,
                  eyetracker,
                  sample_count=30,
-                 timeout_ms=1000):
+                 timeout_ms=1000,
+                 compact_storage=False,
+                 online_statistics=False,
+                 display_area=None,
+                 scheduler=None,
+                 ingestion_buffer_size=None,
+                 stats=None,
+                 adaptive_tolerance=None,
+                 min_sample_count=None,
+                 decimation=1,
+                 min_sample_interval_us=0,
+                 max_gaze_origin_jump_mm=None,
+                 blink_holdoff_us=0,
+                 point_resolution=PointIndex.DEFAULT_RESOLUTION):
         '''Create a calibration validation object for screen based eye trackers.
 
         Args:
-        eyetracker: See @ref EyeTracker.
+        eyetracker: See @ref EyeTracker. Any object with the subscribe_to, unsubscribe_from and get_display_area
+        methods of @ref EyeTracker can be used, such as a @ref ReplayEyeTracker.
         sample_count: The number of samples to collect. Default 30, minimum 10, maximum 3000.
         timeout_ms: Timeout in milliseconds. Default 1000, minimum 100, maximum 3000.
+        compact_storage: If True, only the parts of the gaze data needed by the calibration validation are kept, in a
+        @ref GazeSampleStore per point, instead of the full @ref GazeData objects. Default False.
+        online_statistics: If True, running statistics are updated for every received sample. This makes compute()
+        proportional to the number of points instead of the number of samples and enables partial_result().
+        Default False.
+        display_area: The @ref DisplayArea to validate against. If not given, the display area is read from the eye
+        tracker when first needed and read again after the eye tracker reports that it has changed.
+        scheduler: The @ref DeadlineScheduler used for the collection timeouts. Default is the scheduler shared by the
+        whole process.
+        ingestion_buffer_size: If given, the gaze data callback only appends the sample to a lock-free buffer of this
+        size, and the samples are processed on a separate thread. Samples arriving while the buffer is full are
+        dropped and counted in dropped_sample_count. Default None, samples are processed in the callback.
+        stats: A @ref ValidationStats to record counters and durations in. Default None, nothing is recorded and the
+        instrumentation costs nothing.
+        adaptive_tolerance: If given, data collection for a point stops early, once at least min_sample_count samples
+        have been collected and the 95% confidence intervals of the accuracy and the precision of both eyes are
+        narrower than plus or minus this many degrees. The intervals allow for the correlation of consecutive
+        samples, estimated from the STD and RMS precision. sample_count is then the maximum number of samples.
+        Enables online_statistics. Default None, data collection stops after sample_count samples.
+        min_sample_count: The minimum number of samples of an adaptive validation. Default 10, the minimum of
+        sample_count.
+        decimation: Only every Nth received sample is used. On 600 and 1200 Hz eye trackers this spreads sample_count
+        over a longer, less correlated time span and saves the work for the skipped samples. Default 1, all samples.
+        min_sample_interval_us: Only samples at least this many microseconds of device time after the last used
+        sample are used, giving the same time span per point whatever the frequency of the eye tracker. Default 0.
+        max_gaze_origin_jump_mm: Samples where the gaze origin of an eye moved more than this many millimeters since
+        the previous used sample are rejected. Rejected samples are not compared against, so if the gaze origin
+        stays away the rest of the samples of the point are rejected. Default None, not checked.
+        blink_holdoff_us: Samples less than this many microseconds of device time after a sample with an invalid eye,
+        as during a blink, are rejected. Default 0, not checked.
+        Decimated and rejected samples do not count toward sample_count, so the timeout must leave time for them.
+        point_resolution: Screen points are matched on a grid of this size in normalized coordinates, so data for
+        points that differ only by rounding errors is stored under the same point. See @ref PointIndex.
+        Default 1e-6.
 
         Raises:
         ValueError
         '''
-        if not isinstance(eyetracker, tobii_research.EyeTracker):
+        if not all(callable(getattr(eyetracker, name, None)) for name in _EYETRACKER_METHODS):
             raise ValueError("Not a valid EyeTracker object")
         self.__eyetracker = eyetracker
 
@@ -234,39 +690,231 @@ class ScreenBasedCalibrationValidation(object):
             raise ValueError("Timeout must be between 100 and 3000")
         self.__timeout_ms = timeout_ms
 
+        if adaptive_tolerance is not None and adaptive_tolerance <= 0:
+            raise ValueError("Adaptive tolerance must be positive")
+        if min_sample_count is None:
+            min_sample_count = self.SAMPLE_COUNT_MIN
+        if not self.SAMPLE_COUNT_MIN <= min_sample_count <= sample_count:
+            raise ValueError("Minimum sample count must be between 10 and sample_count")
+        self.__adaptive_tolerance = adaptive_tolerance
+        self.__min_sample_count = min_sample_count
+
+        self.__sample_filter = _SampleFilter.create(decimation, min_sample_interval_us, max_gaze_origin_jump_mm,
+                                                    blink_holdoff_us)
+
+        self.__compact_storage = compact_storage
+        self.__online_statistics = online_statistics or adaptive_tolerance is not None
+
         self.__current_point = None
-        self.__current_gaze_data = []
-        self.__collected_points = defaultdict(list)
+        self.__current_gaze_data = self.__new_gaze_data()
+        self.__current_statistics = self.__new_statistics()
+        self.__point_resolution = point_resolution
+        self.__collected_points = PointIndex(point_resolution)
+        self.__collected_statistics = PointIndex(point_resolution)
+        self.__collected_stop_reasons = PointIndex(point_resolution)
+        # Results of compute() are kept per point with the version of the data they were computed from
+        self.__data_version = 0
+        self.__collected_versions = PointIndex(point_resolution)
+        self.__computed_points = PointIndex(point_resolution)
+
+        self.__display_area = display_area
+        self.__display_area_injected = display_area is not None
+        self.__display_area_generation = 0  # incremented when the display area changes or is set
+        self.__stimuli_points = PointIndex(point_resolution)  # Point2 -> Point3 for the current display area
 
         self.__is_collecting_data = False
+        self.__collection_generation = 0  # incremented for every data collection
         self.__validation_mode = False
 
         self.__timeout = False
-        self.__timeout_thread = None
+        self.__timeout_deadline = None
+        self.__scheduler = scheduler if scheduler is not None else DeadlineScheduler.default()
         self.__lock = threading.RLock()  # synchronization between timer and gaze data subscription callback
+        self.__stats = stats
+        if stats is not None:
+            self.__lock = _TimedLock(self.__lock, stats)
+
+        self.__collection_listeners = []
+        self.__collection_done = threading.Event()
+        self.__collection_done.set()
+
+        self.__ingestion_buffer = None
+        self.__ingestion_thread = None
+        self.__ingestion_stop = threading.Event()
+        if ingestion_buffer_size is not None:
+            self.__ingestion_buffer = SampleRingBuffer(ingestion_buffer_size)
+
+    def __new_gaze_data(self):
+        if self.__compact_storage:
+            return GazeSampleStore(self.__sample_count)
+        return []
+
+    def __new_statistics(self):
+        if self.__online_statistics:
+            return _PointAccumulator()
+        return None
+
+    def __store_current_data(self, stop_reason):
+        '''Store the data collected for the current point. Data from a completed collection replaces data from a
+        timed out collection and is appended to data from earlier completed collections. Data from a timed out
+        collection is only kept if there is no completed collection for the point.
+        '''
+        screen_point = self.__current_point
+        collected = self.__collected_points.get(screen_point)
+        if collected is None or self.__collected_stop_reasons[screen_point] == CalibrationValidationPoint.STOP_TIMEOUT:
+            if self.__compact_storage:
+                self.__current_gaze_data.trim()
+            self.__collected_points[screen_point] = self.__current_gaze_data
+            self.__collected_statistics[screen_point] = self.__current_statistics
+            self.__collected_stop_reasons[screen_point] = stop_reason
+            self.__data_version += 1
+            self.__collected_versions[screen_point] = self.__data_version
+        elif stop_reason != CalibrationValidationPoint.STOP_TIMEOUT:
+            collected += self.__current_gaze_data
+            if self.__online_statistics:
+                self.__collected_statistics[screen_point].merge(self.__current_statistics)
+            self.__collected_stop_reasons[screen_point] = stop_reason
+            self.__data_version += 1
+            self.__collected_versions[screen_point] = self.__data_version
+        self.__current_gaze_data = self.__new_gaze_data()
+        self.__current_statistics = self.__new_statistics()
+
+    def __read_display_area(self):
+        '''Gets the display area, and the generation of the display area it belongs to. The eye tracker is asked
+        without holding the lock, since it is a round trip to the device and the gaze data callback waits for the lock.
+        '''
+        self.__lock.acquire()
+        display_area = self.__display_area
+        generation = self.__display_area_generation
+        self.__lock.release()
+        if display_area is None:
+            display_area = self.__eyetracker.get_display_area()
+            self.__lock.acquire()
+            # Not kept if the display area changed or was set while it was read
+            if self.__display_area_generation == generation:
+                self.__display_area = display_area
+            self.__lock.release()
+        return display_area, generation
+
+    def __get_stimuli_point(self, screen_point):
+        self.__lock.acquire()
+        stimuli_point = self.__stimuli_points.get(screen_point)
+        self.__lock.release()
+        if stimuli_point is None:
+            display_area, generation = self.__read_display_area()
+            stimuli_point = vectormath.calculate_normalized_point2_to_point3(display_area, screen_point)
+            self.__lock.acquire()
+            if self.__display_area_generation == generation:
+                self.__stimuli_points[screen_point] = stimuli_point
+            self.__lock.release()
+        return stimuli_point
+
+    def _display_area_changed(self, notification):
+        self.__lock.acquire()
+        if not self.__display_area_injected:
+            self.__display_area = None
+            self.__display_area_generation += 1
+            self.__stimuli_points = PointIndex(self.__point_resolution)
+            self.__computed_points = PointIndex(self.__point_resolution)
+        self.__lock.release()
 
-    def _calibration_timeout_handler(self):
+    def __collection_finished(self, screen_point, timed_out):
+        # Called without holding the lock when data collection for a point has stopped
+        self.__collection_done.set()
+        if self.__stats is not None:
+            self.__stats.increment("points_timed_out" if timed_out else "points_completed")
+            self.__stats.observe("completion_time", monotonic() - self.__timeout_deadline.requested_at)
+        for listener in list(self.__collection_listeners):
+            listener(screen_point, timed_out)
+
+    def _calibration_timeout_handler(self, deadline):
         self.__lock.acquire()
-        if self.__is_collecting_data:
+        # A deadline that fired while waiting for the lock may belong to a collection that has already completed, and
+        # must not stop the collection of the next point
+        finished = self.__is_collecting_data and deadline is self.__timeout_deadline
+        if finished:
             self.__timeout = True
+            self.__store_current_data(CalibrationValidationPoint.STOP_TIMEOUT)
             self.__is_collecting_data = False
+        screen_point = self.__current_point
         self.__lock.release()
-
-    def _gaze_data_received(self, gaze_data):
+        if finished:
+            lateness = deadline.lateness
+            if self.__stats is not None and lateness is not None and lateness >= 0:
+                self.__stats.observe("timer_lateness", lateness)
+            self.__collection_finished(screen_point, True)
+
+    def _gaze_data_received(self, gaze_data, generation=None):
+        # generation is the collection the sample was received for when it was buffered, None when it is processed
+        # in the gaze data callback
+        stats = self.__stats
+        if stats is not None:
+            started = perf_counter()
+            rejected = "not_collecting"
+        if self.__is_collecting_data and self.__timeout_deadline.expired:
+            # The timeout is detected here if the sample arrives before the scheduler has fired the deadline
+            self.__timeout_deadline.fire()
+        finished = False
+        added = False
         self.__lock.acquire()
-        if self.__is_collecting_data:
-            if len(self.__current_gaze_data) < self.__sample_count:
-                if gaze_data.left_eye.gaze_point.validity and gaze_data.right_eye.gaze_point.validity:
-                    self.__current_gaze_data.append(gaze_data)
-            else:
-                # Data collecting stopped on sample count condition, timer might still be running
-                self.__timeout_thread.cancel()
+        if self.__is_collecting_data and (generation is None or generation == self.__collection_generation):
+            filtered = None
+            if self.__sample_filter is not None:
+                filtered = self.__sample_filter.reject_reason(gaze_data)
+            if filtered is not None:
+                rejected = filtered
+            elif gaze_data.left_eye.gaze_point.validity and gaze_data.right_eye.gaze_point.validity:
+                added = True
+                self.__current_gaze_data.append(gaze_data)
+                if self.__current_statistics is not None:
+                    self.__current_statistics.add(gaze_data)
+            elif stats is not None:
+                rejected = _rejection_reason(gaze_data)
+            count = len(self.__current_gaze_data)
+            stop_reason = None
+            if count >= self.__sample_count:
+                stop_reason = CalibrationValidationPoint.STOP_SAMPLE_COUNT
+            elif (self.__adaptive_tolerance is not None and added and count >= self.__min_sample_count and
+                  self.__current_statistics.confidence_margin() <= self.__adaptive_tolerance):
+                stop_reason = CalibrationValidationPoint.STOP_CONVERGED
+            if stop_reason is not None:
+                # Data collecting stopped on sample count or convergence condition, timer might still be running
+                self.__timeout_deadline.cancel()
 
                 # Data collecting done for this point
-                self.__collected_points[self.__current_point] += self.__current_gaze_data
-                self.__current_gaze_data = []
+                self.__store_current_data(stop_reason)
                 self.__is_collecting_data = False
+                finished = True
+        screen_point = self.__current_point
         self.__lock.release()
+        if finished:
+            self.__collection_finished(screen_point, False)
+        if stats is not None:
+            stats.increment("samples_received")
+            stats.increment("samples_accepted" if added else "samples_rejected." + rejected)
+            stats.observe("callback_time", perf_counter() - started)
+
+    def _gaze_data_buffered(self, gaze_data):
+        # Runs on the SDK callback thread, must never wait for a lock. The generation is read first, so a sample is
+        # never tagged with a collection that started after it was received.
+        generation = self.__collection_generation
+        if self.__is_collecting_data:
+            self.__ingestion_buffer.push((generation, gaze_data))
+
+    def __drain_ingestion_buffer(self):
+        while not self.__ingestion_stop.is_set():
+            samples = self.__ingestion_buffer.pop_all()
+            if not samples:
+                self.__ingestion_stop.wait(self.INGESTION_POLL_INTERVAL)
+                continue
+            for generation, gaze_data in samples:
+                # Samples received for a collection that has stopped are dropped
+                self._gaze_data_received(gaze_data, generation)
+
+    def __gaze_data_callback(self):
+        if self.__ingestion_buffer is not None:
+            return self._gaze_data_buffered
+        return self._gaze_data_received
 
     def __enter__(self):
         self.enter_validation_mode()
@@ -277,9 +925,10 @@ class ScreenBasedCalibrationValidation(object):
             if self.is_collecting_data:
                 # Stop data collection
                 self.__lock.acquire()
-                self.__timeout_thread.cancel()
+                self.__timeout_deadline.cancel()
                 self.__is_collecting_data = False
                 self.__lock.release()
+                self.__collection_finished(self.__current_point, True)
             self.leave_validation_mode()
 
     def enter_validation_mode(self):
@@ -291,8 +940,23 @@ class ScreenBasedCalibrationValidation(object):
         if self.__validation_mode or self.__is_collecting_data:
             raise RuntimeWarning("Validation mode already entered")
 
-        self.__collected_points = defaultdict(list)
-        self.__eyetracker.subscribe_to(tobii_research.EYETRACKER_GAZE_DATA, self._gaze_data_received)
+        self.__collected_points = PointIndex(self.__point_resolution)
+        self.__collected_statistics = PointIndex(self.__point_resolution)
+        self.__collected_stop_reasons = PointIndex(self.__point_resolution)
+        self.__collected_versions = PointIndex(self.__point_resolution)
+        self.__computed_points = PointIndex(self.__point_resolution)
+        # Display area changes are not notified outside the validation mode, so the display area is read again
+        self._display_area_changed(None)
+        self.__eyetracker.subscribe_to(_sdk.subscription("EYETRACKER_NOTIFICATION_DISPLAY_AREA_CHANGED"),
+                                       self._display_area_changed)
+        if self.__ingestion_buffer is not None:
+            self.__ingestion_buffer.pop_all()
+            self.__ingestion_stop.clear()
+            self.__ingestion_thread = threading.Thread(target=self.__drain_ingestion_buffer,
+                                                       name="CalibrationValidationIngestion")
+            self.__ingestion_thread.daemon = True
+            self.__ingestion_thread.start()
+        self.__eyetracker.subscribe_to(_sdk.subscription("EYETRACKER_GAZE_DATA"), self.__gaze_data_callback())
         self.__validation_mode = True
 
     def leave_validation_mode(self):
@@ -307,8 +971,15 @@ class ScreenBasedCalibrationValidation(object):
             raise RuntimeWarning("Cannot leave validation mode while collecting data")
 
         self.__current_point = None
-        self.__current_gaze_data = []
-        self.__eyetracker.unsubscribe_from(tobii_research.EYETRACKER_GAZE_DATA, self._gaze_data_received)
+        self.__current_gaze_data = self.__new_gaze_data()
+        self.__current_statistics = self.__new_statistics()
+        self.__eyetracker.unsubscribe_from(_sdk.subscription("EYETRACKER_GAZE_DATA"), self.__gaze_data_callback())
+        if self.__ingestion_thread is not None:
+            self.__ingestion_stop.set()
+            self.__ingestion_thread.join()
+            self.__ingestion_thread = None
+        self.__eyetracker.unsubscribe_from(_sdk.subscription("EYETRACKER_NOTIFICATION_DISPLAY_AREA_CHANGED"),
+                                           self._display_area_changed)
         self.__validation_mode = False
 
     def start_collecting_data(self, screen_point):
@@ -332,13 +1003,115 @@ class ScreenBasedCalibrationValidation(object):
         if self.__is_collecting_data:
             raise RuntimeWarning("Already collecting data")
 
-        self.__current_point = screen_point
-        self.__current_gaze_data = []
+        collected_point = self.__collected_points.key(screen_point)
+        self.__current_point = collected_point if collected_point is not None else screen_point
+        self.__current_gaze_data = self.__new_gaze_data()
+        self.__current_statistics = self.__new_statistics()
+        if self.__sample_filter is not None:
+            self.__sample_filter.reset()
         self.__timeout = False
-        self.__timeout_thread = threading.Timer(self.__timeout_ms / 1000.0, self._calibration_timeout_handler)
-        self.__timeout_thread.start()
+        self.__collection_done.clear()
+        self.__collection_generation += 1
+        deadline = None
+
+        def timeout():
+            self._calibration_timeout_handler(deadline)
+
+        deadline = self.__scheduler.schedule(self.__timeout_ms / 1000.0, timeout)
+        self.__timeout_deadline = deadline
         self.__is_collecting_data = True
 
+    def wait_for_data_collection(self, timeout=None):
+        '''Blocks until data collection for the current point is completed or timed out.
+
+        Args:
+        timeout: Maximum time to wait in seconds. Default None, wait without limit.
+
+        Returns:
+        True if data is no longer being collected.
+        '''
+        return self.__collection_done.wait(timeout)
+
+    def run_validation(self, points, on_point_result=None, show_point=None, retry_budget_ms=0):
+        '''Collects data for each point in turn. The result of each point is computed on a worker thread while the
+        next point is being collected, so the result of the session is ready shortly after the last sample arrives.
+
+        Args:
+        points: Iterable of @ref Point2 stimuli points, collected in order.
+        on_point_result: Optional callable called on the worker thread with the @ref CalibrationValidationPoint of
+        each point as soon as it has been computed.
+        show_point: Optional callable called with each point before data collection for it starts, for example to
+        present the stimulus.
+        retry_budget_ms: Total time in milliseconds that may be spent collecting data again for points that timed
+        out. A point is retried right away, while its stimulus is still shown, as long as a full timeout fits in the
+        remaining budget. Default 0, no retries.
+
+        Returns:
+        An instance of @ref CalibrationValidationResult for the points collected in this call.
+
+        Raises:
+        ValueError
+        RuntimeWarning
+        '''
+        retry_budget = retry_budget_ms / 1000.0
+        timeout = self.__timeout_ms / 1000.0
+        # Imported here since concurrent.futures is slow to import and not needed otherwise
+        from concurrent.futures import ThreadPoolExecutor
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for screen_point in points:
+                if show_point is not None:
+                    show_point(screen_point)
+                self.start_collecting_data(screen_point)
+                self.wait_for_data_collection()
+                while self.__timeout and retry_budget >= timeout:
+                    retry_start = monotonic()
+                    self.start_collecting_data(screen_point)
+                    self.wait_for_data_collection()
+                    retry_budget -= monotonic() - retry_start
+
+                # Copy the data, since collecting the same point again later adds to the stored data
+                self.__lock.acquire()
+                screen_point = self.__collected_points.key(screen_point)
+                samples = self.__collected_points[screen_point]
+                samples = samples.copy() if self.__compact_storage else list(samples)
+                statistics = self.__collected_statistics[screen_point]
+                if statistics is not None:
+                    statistics = statistics.copy()
+                stop_reason = self.__collected_stop_reasons[screen_point]
+                version = self.__collected_versions[screen_point]
+                self.__lock.release()
+                futures.append((version, executor.submit(self.__compute_point_result, screen_point, samples,
+                                                         statistics, stop_reason, on_point_result)))
+
+            points = defaultdict(list)
+            for version, future in futures:
+                point = future.result()
+                # A point collected again later includes the earlier data and replaces the earlier result
+                points[point.screen_point] = [point]
+                self.__computed_points[point.screen_point] = (version, point)
+        return _calculate_result(points)
+
+    def __compute_point_result(self, screen_point, samples, statistics, stop_reason, on_point_result):
+        point = self.__compute_point(screen_point, samples, statistics, stop_reason)
+        if on_point_result is not None:
+            on_point_result(point)
+        return point
+
+    def add_data_collection_listener(self, listener):
+        '''Adds a callable that is called with the screen point and a timed out flag each time data collection
+        for a point stops. The flag is True if the timeout expired before the collection was completed.
+        Listeners are called on the thread that stopped the collection, which may be the eye tracker callback thread,
+        and should return quickly.
+        '''
+        self.__collection_listeners.append(listener)
+
+    def remove_data_collection_listener(self, listener):
+        '''Removes a listener added with add_data_collection_listener.
+        '''
+        self.__collection_listeners.remove(listener)
+
     def clear(self):
         '''Clears all collected data.
 
@@ -349,8 +1122,13 @@ class ScreenBasedCalibrationValidation(object):
             raise RuntimeWarning("Attempted to discard data while collecting data")
 
         self.__current_point = None
-        self.__current_gaze_data = []
-        self.__collected_points = defaultdict(list)
+        self.__current_gaze_data = self.__new_gaze_data()
+        self.__current_statistics = self.__new_statistics()
+        self.__collected_points = PointIndex(self.__point_resolution)
+        self.__collected_statistics = PointIndex(self.__point_resolution)
+        self.__collected_stop_reasons = PointIndex(self.__point_resolution)
+        self.__collected_versions = PointIndex(self.__point_resolution)
+        self.__computed_points = PointIndex(self.__point_resolution)
 
     def discard_data(self, screen_point):
         '''Removes the collected data for a specific calibration validation point.
@@ -368,6 +1146,92 @@ class ScreenBasedCalibrationValidation(object):
         if screen_point not in self.__collected_points:
             raise RuntimeWarning("Attempt to discard non-collected point")
         del self.__collected_points[screen_point]
+        del self.__collected_statistics[screen_point]
+        del self.__collected_stop_reasons[screen_point]
+        del self.__collected_versions[screen_point]
+        if screen_point in self.__computed_points:
+            del self.__computed_points[screen_point]
+
+    def points_within(self, screen_point, radius):
+        '''Gets the points with collected data within a distance of a screen point.
+
+        Args:
+        screen_point: A normalized @ref Point2.
+        radius: The maximum distance in normalized coordinates.
+
+        Returns:
+        List of @ref Point2, nearest first.
+        '''
+        self.__lock.acquire()
+        points = [point for point, _ in self.__collected_points.within(screen_point, radius)]
+        self.__lock.release()
+        return points
+
+    def partial_result(self, screen_point):
+        '''Calculates the accuracy and precision values of a point from the running statistics, also while data is
+        still being collected for it. The precision (standard deviation) is estimated from the spread of the gaze
+        points and the gaze_data of the returned point is None. Requires online_statistics.
+
+        Args:
+        screen_point: The calibration point.
+
+        Returns:
+        An instance of @ref CalibrationValidationPoint.
+
+        Raises:
+        RuntimeWarning
+        '''
+        if not self.__online_statistics:
+            raise RuntimeWarning("Online statistics are not enabled")
+
+        self.__lock.acquire()
+        statistics = self.__collected_statistics.get(screen_point)
+        stop_reason = self.__collected_stop_reasons.get(screen_point)
+        timed_out = stop_reason == CalibrationValidationPoint.STOP_TIMEOUT
+        # The result is for the point the data is stored under, which is the current point while it is collected
+        if statistics is not None:
+            screen_point = self.__collected_points.key(screen_point)
+        if self.__is_collecting_data and self.__collected_points.matches(screen_point, self.__current_point):
+            screen_point = self.__current_point
+            if statistics is None or timed_out:
+                statistics = self.__current_statistics.copy()
+            else:
+                statistics = statistics.copy()
+                statistics.merge(self.__current_statistics)
+            timed_out = False
+            stop_reason = None
+        self.__lock.release()
+
+        if statistics is None:
+            raise RuntimeWarning("No data collected for point")
+        if statistics.count < 2:
+            return CalibrationValidationPoint(
+                math.nan, math.nan, math.nan, math.nan, math.nan, math.nan, timed_out, screen_point, None, stop_reason)
+
+        stimuli_point = self.__get_stimuli_point(screen_point)
+        return CalibrationValidationPoint(
+            *(statistics.estimate(stimuli_point) + (timed_out, screen_point, None, stop_reason)))
+
+    def __compute_point(self, screen_point, samples, statistics, stop_reason):
+        if stop_reason == CalibrationValidationPoint.STOP_TIMEOUT:
+            # Timeout before collecting enough valid samples, no calculations to be done
+            return CalibrationValidationPoint(
+                math.nan, math.nan, math.nan, math.nan, math.nan, math.nan, True, screen_point, samples, stop_reason)
+
+        stats = self.__stats
+        if stats is not None:
+            started = perf_counter()
+        stimuli_point = self.__get_stimuli_point(screen_point)
+        if stats is not None:
+            stimuli_done = perf_counter()
+            stats.observe("compute_time.stimuli", stimuli_done - started)
+        if statistics is not None:
+            metrics = statistics.finalize(samples, stimuli_point)
+        else:
+            metrics = _calculate_point(samples, stimuli_point)
+        if stats is not None:
+            stats.observe("compute_time.metrics", perf_counter() - stimuli_done)
+        return CalibrationValidationPoint(*(metrics + (False, screen_point, samples, stop_reason)))
 
     def compute(self):
         '''Uses the collected data and tries to compute accuracy and precision values for all points.
@@ -376,6 +1240,8 @@ class ScreenBasedCalibrationValidation(object):
         for a certain point that CalibrationValidationPoint will contain invalid data (NaN) for the
         results. Gaze data will still be untouched. If there is no valid data for any point, the
         average results of CalibrationValidationResult will be invalid (NaN) as well.
+        The result of each point is kept, and only points whose data or display area changed since the previous
+        call are computed again.
 
         Returns:
         An instance of @ref CalibrationValidationResult.
@@ -383,126 +1249,143 @@ class ScreenBasedCalibrationValidation(object):
         if self.__is_collecting_data:
             raise RuntimeWarning("Still collecting data")
 
+        stats = self.__stats
+        if stats is not None:
+            started = perf_counter()
         points = defaultdict(list)
-        accuracy_left_eye_all = []
-        accuracy_right_eye_all = []
-        precision_left_eye_all = []
-        precision_right_eye_all = []
-        precision_rms_left_eye_all = []
-        precision_rms_right_eye_all = []
+        for screen_point, samples in self.__collected_points.items():
+            version = self.__collected_versions[screen_point]
+            computed = self.__computed_points.get(screen_point)
+            if computed is None or computed[0] != version:
+                point = self.__compute_point(screen_point, samples, self.__collected_statistics.get(screen_point),
+                                             self.__collected_stop_reasons[screen_point])
+                self.__computed_points[screen_point] = computed = (version, point)
+                if stats is not None:
+                    stats.increment("points_computed")
+            elif stats is not None:
+                stats.increment("points_cached")
+            points[screen_point] += [computed[1]]
+        if stats is None:
+            return _calculate_result(points)
+
+        points_done = perf_counter()
+        result = _calculate_result(points)
+        finished = perf_counter()
+        stats.observe("compute_time.result", finished - points_done)
+        stats.observe("compute_time", finished - started)
+        return result
+
+    def submit_compute(self, worker):
+        '''Computes the result like @ref compute, but in the process of a @ref SharedMemoryComputeWorker, so the
+        computation does not hold the GIL of this process, for example while a display loop is running. The samples
+        are copied to shared memory before this method returns, with one memory copy per column of each point.
+        Points whose kept result is still valid and timed out points are not sent to the worker. Requires
+        compact_storage, since converting full @ref GazeData objects takes longer than computing the result.
 
+        Args:
+        worker: A @ref SharedMemoryComputeWorker.
+
+        Returns:
+        A Future of the @ref CalibrationValidationResult.
+
+        Raises:
+        RuntimeWarning
+        '''
+        if not self.__compact_storage:
+            raise RuntimeWarning("Compact storage is not enabled")
+        if self.__is_collecting_data:
+            raise RuntimeWarning("Still collecting data")
+
+        stats = self.__stats
+        entries = []  # (screen point, point, or None while computed by the worker)
+        pending = []  # (samples, stop reason, version) of the points computed by the worker
+        self.__lock.acquire()
         for screen_point, samples in self.__collected_points.items():
-            if len(samples) < self.__sample_count:
-                # Timeout before collecting enough valid samples, no calculations to be done
-                points[screen_point] += [CalibrationValidationPoint(
-                    screen_point, math.nan, math.nan, math.nan, math.nan, math.nan, math.nan, True, samples)]
-                continue
+            version = self.__collected_versions[screen_point]
+            stop_reason = self.__collected_stop_reasons[screen_point]
+            computed = self.__computed_points.get(screen_point)
+            if computed is not None and computed[0] == version:
+                entries.append((screen_point, computed[1]))
+                if stats is not None:
+                    stats.increment("points_cached")
+            elif stop_reason == CalibrationValidationPoint.STOP_TIMEOUT:
+                point = self.__compute_point(screen_point, samples, None, stop_reason)
+                self.__computed_points[screen_point] = (version, point)
+                entries.append((screen_point, point))
+            else:
+                entries.append((screen_point, None))
+                pending.append((samples, stop_reason, version))
+        self.__lock.release()
 
-            stimuli_point = vectormath.calculate_normalized_point2_to_point3(
-                self.__eyetracker.get_display_area(), screen_point)
-
-            # Prepare data from samples
-            gaze_origin_left_all = []
-            gaze_origin_right_all = []
-            gaze_point_left_all = []
-            gaze_point_right_all = []
-            direction_gaze_point_left_all = []
-            direction_gaze_point_left_mean_all = []
-            direction_gaze_point_right_all = []
-            direction_gaze_point_right_mean_all = []
-
-            for sample in samples:
-                gaze_origin_left_all.append(
-                    vectormath.Point3.from_list(sample.left_eye.gaze_origin.position_in_user_coordinates))
-                gaze_origin_right_all.append(
-                    vectormath.Point3.from_list(sample.right_eye.gaze_origin.position_in_user_coordinates))
-                gaze_point_left_all.append(
-                    vectormath.Point3.from_list(sample.left_eye.gaze_point.position_in_user_coordinates))
-                gaze_point_right_all.append(
-                    vectormath.Point3.from_list(sample.right_eye.gaze_point.position_in_user_coordinates))
-
-            gaze_origin_left_mean = vectormath.calculate_mean_point(gaze_origin_left_all)
-            gaze_origin_right_mean = vectormath.calculate_mean_point(gaze_origin_right_all)
-            gaze_point_left_mean = vectormath.calculate_mean_point(gaze_point_left_all)
-            gaze_point_right_mean = vectormath.calculate_mean_point(gaze_point_right_all)
-
-            for sample in samples:
-                gaze_origin_left = vectormath.Point3.from_list(
-                    sample.left_eye.gaze_origin.position_in_user_coordinates)
-                gaze_origin_right = vectormath.Point3.from_list(
-                    sample.right_eye.gaze_origin.position_in_user_coordinates)
-                gaze_point_left = vectormath.Point3.from_list(
-                    sample.left_eye.gaze_point.position_in_user_coordinates)
-                gaze_point_right = vectormath.Point3.from_list(
-                    sample.right_eye.gaze_point.position_in_user_coordinates)
-                direction_gaze_point_left_all.append(
-                    vectormath.Vector3.from_points(gaze_origin_left, gaze_point_left).normalize())
-                direction_gaze_point_left_mean_all.append(
-                    vectormath.Vector3.from_points(gaze_origin_left, gaze_point_left_mean).normalize())
-                direction_gaze_point_right_all.append(
-                    vectormath.Vector3.from_points(gaze_origin_right, gaze_point_right).normalize())
-                direction_gaze_point_right_mean_all.append(
-                    vectormath.Vector3.from_points(gaze_origin_right, gaze_point_right_mean).normalize())
-
-            # Accuracy calculations
-            accuracy_left_eye = _calculate_eye_accuracy(gaze_origin_left_mean, gaze_point_left_mean, stimuli_point)
-            accuracy_right_eye = _calculate_eye_accuracy(gaze_origin_right_mean, gaze_point_right_mean, stimuli_point)
-
-            # Precision calculations
-            precision_left_eye = _calculate_eye_precision(
-                direction_gaze_point_left_all, direction_gaze_point_left_mean_all)
-            precision_right_eye = _calculate_eye_precision(
-                direction_gaze_point_right_all, direction_gaze_point_right_mean_all)
-
-            # RMS precision calculations
-            precision_rms_left_eye = _calculate_eye_precision_rms(direction_gaze_point_left_all)
-            precision_rms_right_eye = _calculate_eye_precision_rms(direction_gaze_point_right_all)
-
-            # Add a calibration validation point
-            points[screen_point] += [CalibrationValidationPoint(
-                accuracy_left_eye,
-                accuracy_right_eye,
-                precision_left_eye,
-                precision_right_eye,
-                precision_rms_left_eye,
-                precision_rms_right_eye,
-                False,  # no timeout
-                screen_point,
-                samples)]
-
-            # Cache all calculations
-            accuracy_left_eye_all.append(accuracy_left_eye)
-            accuracy_right_eye_all.append(accuracy_right_eye)
-            precision_left_eye_all.append(precision_left_eye)
-            precision_right_eye_all.append(precision_right_eye)
-            precision_rms_left_eye_all.append(precision_rms_left_eye)
-            precision_rms_right_eye_all.append(precision_rms_right_eye)
-
-        # Create a result
-        num_points = len(accuracy_left_eye_all)
-        if num_points > 0:
-            accuracy_left_eye_average = sum(accuracy_left_eye_all) / num_points
-            accuracy_right_eye_average = sum(accuracy_right_eye_all) / num_points
-            precision_left_eye_average = sum(precision_left_eye_all) / num_points
-            precision_right_eye_average = sum(precision_right_eye_all) / num_points
-            precision_rms_left_eye_average = sum(precision_rms_left_eye_all) / num_points
-            precision_rms_right_eye_average = sum(precision_rms_right_eye_all) / num_points
-        else:
-            accuracy_left_eye_average = math.nan
-            accuracy_right_eye_average = math.nan
-            precision_left_eye_average = math.nan
-            precision_right_eye_average = math.nan
-            precision_rms_left_eye_average = math.nan
-            precision_rms_right_eye_average = math.nan
-
-        result = CalibrationValidationResult(points,
-                                             accuracy_left_eye_average,
-                                             accuracy_right_eye_average,
-                                             precision_left_eye_average,
-                                             precision_right_eye_average,
-                                             precision_rms_left_eye_average,
-                                             precision_rms_right_eye_average)
-        return result
+        stimuli_points = [self.__get_stimuli_point(screen_point) for screen_point, point in entries if point is None]
+        metrics_future = worker._submit_points([(samples, stimuli_point) for (samples, _, _), stimuli_point
+                                                in zip(pending, stimuli_points)])
+        # Imported here since concurrent.futures is slow to import and not needed otherwise
+        from concurrent.futures import Future
+        future = Future()
+
+        def done(metrics_future):
+            try:
+                metrics = iter(metrics_future.result())
+                computed = iter(pending)
+                points = defaultdict(list)
+                for screen_point, point in entries:
+                    if point is None:
+                        samples, stop_reason, version = next(computed)
+                        point = CalibrationValidationPoint(
+                            *(tuple(next(metrics)) + (False, screen_point, samples, stop_reason)))
+                        self.__lock.acquire()
+                        if self.__collected_versions.get(screen_point) == version:
+                            self.__computed_points[screen_point] = (version, point)
+                        self.__lock.release()
+                        if stats is not None:
+                            stats.increment("points_computed")
+                    points[screen_point] += [point]
+                future.set_result(_calculate_result(points))
+            except BaseException as error:
+                future.set_exception(error)
+
+        metrics_future.add_done_callback(done)
+        return future
+
+    @property
+    def display_area(self):
+        '''Gets or sets the display area the calibration validation is calculated for. A display area that is set
+        explicitly is used until it is set to None, after which it is read from the eye tracker again.
+        '''
+        return self.__read_display_area()[0]
+
+    @display_area.setter
+    def display_area(self, display_area):
+        self.__lock.acquire()
+        self.__display_area = display_area
+        self.__display_area_injected = display_area is not None
+        self.__display_area_generation += 1
+        self.__stimuli_points = PointIndex(self.__point_resolution)
+        self.__computed_points = PointIndex(self.__point_resolution)
+        self.__lock.release()
+
+    @property
+    def stats(self):
+        '''The @ref ValidationStats given to the constructor, or None.
+        '''
+        return self.__stats
+
+    @property
+    def collection_deadline(self):
+        '''Gets the timeout @ref Deadline of the current or latest data collection, or None. Its fired_at and
+        lateness tell when a timeout was detected compared to when it was requested.
+        '''
+        return self.__timeout_deadline
+
+    @property
+    def dropped_sample_count(self):
+        '''Gets the number of samples dropped because the ingestion buffer was full. Always 0 when samples are
+        processed in the gaze data callback.
+        '''
+        if self.__ingestion_buffer is None:
+            return 0
+        return self.__ingestion_buffer.dropped_count
 
     @property
     def is_collecting_data(self):
@@ -1,11 +1,80 @@
-from .ScreenBasedCalibrationValidation import ScreenBasedCalibrationValidation
-from .ScreenBasedCalibrationValidation import CalibrationValidationPoint
-from .ScreenBasedCalibrationValidation import CalibrationValidationResult
-from .vectormath import calculate_mean_point, calculate_normalized_point2_to_point3
-from .vectormath import Point2, Point3, Vector3
+import sys
+
+# Name -> submodule of the exported names. The submodules are imported when a name is first used, so importing one
+# submodule, such as vectormath in a process pool worker, does not import the others and their dependencies.
+_EXPORTS = {}
+for _module, _names in (("ScreenBasedCalibrationValidation", ("ScreenBasedCalibrationValidation",
+                                                               "CalibrationValidationPoint",
+                                                               "CalibrationValidationResult")),
+                        ("batch", ("compute_many", "compute_validation")),
+                        ("bootstrap", ("ConfidenceIntervals", "ResultConfidenceIntervals", "bootstrap_point",
+                                       "bootstrap_result")),
+                        ("continuous", ("ContinuousValidation", "RegionStatistics")),
+                        ("instrumentation", ("Histogram", "ValidationStats")),
+                        ("multitracker", ("MultiTrackerValidation", "MultiTrackerValidationResult")),
+                        ("pointindex", ("PointIndex",)),
+                        ("replay", ("RecordedDisplayArea", "ReplayEyeTracker", "ValidationRecording",
+                                    "replay_validation")),
+                        ("resultfile", ("ValidationResultFile", "load_result", "save_result")),
+                        ("ringbuffer", ("SampleRingBuffer",)),
+                        ("samplestore", ("GazeSample", "GazeSampleStore")),
+                        ("scheduler", ("Deadline", "DeadlineScheduler")),
+                        ("sharedcompute", ("SharedMemoryComputeWorker",)),
+                        ("vectormath", ("calculate_mean_point", "calculate_normalized_point2_to_point3",
+                                        "DisplayAreaTransform", "Point2", "Point3", "Vector3",
+                                        "Point2Array", "Point3Array", "Vector3Array"))):
+    for _name in _names:
+        _EXPORTS[_name] = _module
+if sys.version_info >= (3, 5):
+    # The asyncio API uses syntax that is not available in Python 2
+    _EXPORTS["AsyncScreenBasedCalibrationValidation"] = "asyncvalidation"
 
 __all__ = ("ScreenBasedCalibrationValidation", "CalibrationValidationPoint", "CalibrationValidationResult",
-           "calculate_mean_point", "calculate_normalized_point2_to_point3", "Point2", "Point3", "Vector3")
+           "GazeSample", "GazeSampleStore", "Deadline", "DeadlineScheduler", "SampleRingBuffer", "PointIndex",
+           "Histogram", "ValidationStats",
+           "MultiTrackerValidation", "MultiTrackerValidationResult", "compute_many", "compute_validation",
+           "ContinuousValidation", "RegionStatistics",
+           "ConfidenceIntervals", "ResultConfidenceIntervals", "bootstrap_point", "bootstrap_result",
+           "RecordedDisplayArea", "ReplayEyeTracker", "ValidationRecording", "replay_validation",
+           "ValidationResultFile", "load_result", "save_result",
+           "SharedMemoryComputeWorker",
+           "calculate_mean_point", "calculate_normalized_point2_to_point3", "DisplayAreaTransform",
+           "Point2", "Point3", "Vector3",
+           "Point2Array", "Point3Array", "Vector3Array")
+if sys.version_info >= (3, 5):
+    __all__ += ("AsyncScreenBasedCalibrationValidation",)
+
+
+def _export(name):
+    from importlib import import_module
+    value = getattr(import_module("." + _EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+    import types
+
+    class _Package(types.ModuleType):
+        def __setattr__(self, name, value):
+            # ScreenBasedCalibrationValidation is both a submodule and a class. The import system binds a submodule
+            # to the package when it is first imported, which must not hide the class.
+            if name == "ScreenBasedCalibrationValidation" and isinstance(value, types.ModuleType):
+                value = value.ScreenBasedCalibrationValidation
+            super(_Package, self).__setattr__(name, value)
+
+    sys.modules[__name__].__class__ = _Package
+
+    def __getattr__(name):
+        if name in _EXPORTS:
+            return _export(name)
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_EXPORTS))
+else:
+    for _name in _EXPORTS:
+        _export(_name)
 
 __author__ = 'Tobii Pro AB'
 __licence__ = 'BSD'
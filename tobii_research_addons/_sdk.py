@@ -0,0 +1,49 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+# The Tobii Pro SDK loads its native library when imported. It is only imported when an eye tracker subscription
+# is made, so the vector math and the offline computations can be used without it.
+
+_sdk = None
+_sdk_missing = False
+
+
+def load():
+    '''Imports the Tobii Pro SDK the first time it is needed.
+
+    Returns:
+    The tobii_research module, or None if it is not installed.
+    '''
+    global _sdk, _sdk_missing
+    if _sdk is None and not _sdk_missing:
+        try:
+            import tobii_research
+            _sdk = tobii_research
+        except ImportError:
+            _sdk_missing = True
+    return _sdk
+
+
+def subscription(name):
+    '''Gets a subscription type constant of the SDK, such as "EYETRACKER_GAZE_DATA".
+
+    Without the SDK, the name itself is returned. Only stand-in eye trackers such as @ref ReplayEyeTracker can be
+    used then, and they use the same value.
+    '''
+    sdk = load()
+    if sdk is None:
+        return name
+    return getattr(sdk, name)
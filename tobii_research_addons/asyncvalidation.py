@@ -0,0 +1,155 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import asyncio
+
+from .ScreenBasedCalibrationValidation import ScreenBasedCalibrationValidation
+
+
+class AsyncScreenBasedCalibrationValidation(object):
+    '''Calibration validation for screen based eye trackers for use with asyncio.
+
+    Completion of data collection is passed from the eye tracker callback thread or the timeout scheduler straight to
+    the event loop, so awaiting a point takes no polling and no extra thread.
+    '''
+
+    def __init__(self, eyetracker, sample_count=30, timeout_ms=1000, **kwargs):
+        '''Create a calibration validation object for screen based eye trackers.
+
+        Args:
+        eyetracker: See @ref ScreenBasedCalibrationValidation.
+        sample_count: See @ref ScreenBasedCalibrationValidation.
+        timeout_ms: See @ref ScreenBasedCalibrationValidation.
+        kwargs: Passed on to @ref ScreenBasedCalibrationValidation.
+
+        Raises:
+        ValueError
+        '''
+        self.__validation = ScreenBasedCalibrationValidation(eyetracker, sample_count, timeout_ms, **kwargs)
+        self.__loop = None
+        self.__pending = None
+        self.__validation.add_data_collection_listener(self.__collection_finished)
+
+    @property
+    def validation(self):
+        '''The wrapped @ref ScreenBasedCalibrationValidation.
+        '''
+        return self.__validation
+
+    @property
+    def is_collecting_data(self):
+        return self.__validation.is_collecting_data
+
+    @property
+    def is_validation_mode(self):
+        return self.__validation.is_validation_mode
+
+    async def __aenter__(self):
+        await self.enter_validation_mode()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.__validation.__exit__, exc_type, exc_value, traceback)
+
+    async def enter_validation_mode(self):
+        '''Enter the calibration validation mode. Subscribing to the eye tracker is done off the event loop.
+
+        Raises:
+        RuntimeWarning
+        '''
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.__validation.enter_validation_mode)
+
+    async def leave_validation_mode(self):
+        '''Leaves the calibration validation mode. Unsubscribing from the eye tracker is done off the event loop.
+
+        Raises:
+        RuntimeWarning
+        '''
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.__validation.leave_validation_mode)
+
+    def __collection_finished(self, screen_point, timed_out):
+        # Called on the thread that stopped the collection
+        future = self.__pending
+        loop = self.__loop
+        if future is None or loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self.__resolve, future, timed_out)
+        except RuntimeError:
+            # The event loop has been closed
+            pass
+
+    @staticmethod
+    def __resolve(future, timed_out):
+        if not future.done():
+            future.set_result(not timed_out)
+
+    async def collect(self, screen_point):
+        '''Collects data for a calibration validation point. Resolves as soon as sample_count samples have been
+        collected or the timeout has expired.
+
+        If the awaiting task is cancelled, data collection continues until it completes or times out on its own.
+
+        Args:
+        screen_point: The normalized 2D point on the display area.
+
+        Returns:
+        True if the data collection completed, False if it timed out.
+
+        Raises:
+        ValueError
+        RuntimeWarning
+        '''
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.__loop = loop
+        self.__pending = future
+        try:
+            self.__validation.start_collecting_data(screen_point)
+            return await future
+        finally:
+            if self.__pending is future:
+                self.__pending = None
+
+    async def compute(self):
+        '''Computes the calibration validation off the event loop.
+
+        Returns:
+        An instance of @ref CalibrationValidationResult.
+
+        Raises:
+        RuntimeWarning
+        '''
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.__validation.compute)
+
+    def partial_result(self, screen_point):
+        '''See @ref ScreenBasedCalibrationValidation.partial_result.
+        '''
+        return self.__validation.partial_result(screen_point)
+
+    def clear(self):
+        '''See @ref ScreenBasedCalibrationValidation.clear.
+        '''
+        self.__validation.clear()
+
+    def discard_data(self, screen_point):
+        '''See @ref ScreenBasedCalibrationValidation.discard_data.
+        '''
+        self.__validation.discard_data(screen_point)
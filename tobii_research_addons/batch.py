@@ -0,0 +1,116 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import math
+from collections import defaultdict
+
+from . import vectormath
+from .ScreenBasedCalibrationValidation import CalibrationValidationPoint
+from .ScreenBasedCalibrationValidation import _calculate_point, _calculate_result
+
+
+def _point_items(samples_by_point):
+    if hasattr(samples_by_point, "items"):
+        return list(samples_by_point.items())
+    return list(samples_by_point)
+
+
+def _compute_point_task(task):
+    # Runs in the worker processes, must be a module level function to be picklable
+    samples, stimuli_point = task
+    return _calculate_point(samples, stimuli_point)
+
+
+def _build_result(items, sample_count, metrics):
+    '''Create the result of a session, taking the metrics of each point that did not time out from an iterator.
+    '''
+    points = defaultdict(list)
+    for screen_point, samples in items:
+        if len(samples) < sample_count:
+            # Timeout before collecting enough valid samples, no calculations to be done
+            points[screen_point] += [CalibrationValidationPoint(
+                math.nan, math.nan, math.nan, math.nan, math.nan, math.nan, True, screen_point, samples,
+                CalibrationValidationPoint.STOP_TIMEOUT)]
+        else:
+            points[screen_point] += [CalibrationValidationPoint(
+                *(tuple(next(metrics)) + (False, screen_point, samples)))]
+    return _calculate_result(points)
+
+
+def compute_validation(samples_by_point, display_area, sample_count=30):
+    '''Computes a calibration validation result from stored samples, without an eye tracker or a
+    @ref ScreenBasedCalibrationValidation. Gives the same result as @ref ScreenBasedCalibrationValidation.compute
+    for the same data.
+
+    Args:
+    samples_by_point: Mapping from @ref Point2 to the valid samples collected for the point, or an iterable of
+    (@ref Point2, samples) pairs. The samples are a sequence of @ref GazeData or a @ref GazeSampleStore.
+    display_area: The @ref DisplayArea the samples were collected for, or any object with the same corner attributes.
+    sample_count: Points with fewer samples than this are reported as timed out. Default 30. For an adaptive
+    validation, use its min_sample_count.
+
+    Returns:
+    An instance of @ref CalibrationValidationResult.
+    '''
+    items = _point_items(samples_by_point)
+    metrics = (_calculate_point(samples, vectormath.calculate_normalized_point2_to_point3(display_area, screen_point))
+               for screen_point, samples in items
+               if len(samples) >= sample_count)
+    return _build_result(items, sample_count, metrics)
+
+
+def compute_many(sessions, sample_count=30, max_workers=None, chunksize=None, executor=None):
+    '''Computes the calibration validation results of many stored sessions on a process pool.
+
+    The points of all sessions are spread over the worker processes, so sessions of different sizes still keep all
+    workers busy. Only the samples and the 3D stimuli point are sent to the workers and only the metrics are sent
+    back, in chunks of several points. Samples in a @ref GazeSampleStore are much cheaper to send than lists of
+    @ref GazeData.
+
+    Args:
+    sessions: Iterable of (samples_by_point, display_area) pairs, see @ref compute_validation.
+    sample_count: See @ref compute_validation.
+    max_workers: The number of worker processes. Default is the number of CPUs.
+    chunksize: The number of points sent to a worker at a time. Default is a quarter of each worker's share of the
+    points.
+    executor: Optional ProcessPoolExecutor to use instead of starting a new one.
+
+    Returns:
+    List of @ref CalibrationValidationResult in the same order as the sessions.
+    '''
+    sessions = [(_point_items(samples_by_point), display_area) for samples_by_point, display_area in sessions]
+    tasks = [(samples, vectormath.calculate_normalized_point2_to_point3(display_area, screen_point))
+             for items, display_area in sessions
+             for screen_point, samples in items
+             if len(samples) >= sample_count]
+
+    if chunksize is None:
+        # Imported here since multiprocessing is slow to import, also in the worker processes
+        import multiprocessing
+        workers = max_workers or multiprocessing.cpu_count()
+        chunksize = max(1, len(tasks) // (workers * 4))
+
+    if executor is None:
+        # Imported here since concurrent.futures is slow to import, also in the worker processes
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers) as own_executor:
+            metrics = list(own_executor.map(_compute_point_task, tasks, chunksize=chunksize))
+    else:
+        metrics = list(executor.map(_compute_point_task, tasks, chunksize=chunksize))
+
+    # map() returns the metrics in task order, which is the order of the sessions and their points
+    metrics = iter(metrics)
+    return [_build_result(items, sample_count, metrics) for items, _ in sessions]
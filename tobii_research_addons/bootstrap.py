@@ -0,0 +1,329 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+from . import vectormath
+from .ScreenBasedCalibrationValidation import _positions
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_CHUNK = 256  # resamples drawn at a time, bounds the memory of the intermediate arrays
+_METRICS = ("accuracy_left_eye", "accuracy_right_eye",
+            "precision_left_eye", "precision_right_eye",
+            "precision_rms_left_eye", "precision_rms_right_eye")
+
+
+class ConfidenceIntervals(object):
+    '''Bootstrap confidence intervals of the accuracy and precision values of a @ref CalibrationValidationPoint, or of
+    the averages of a @ref CalibrationValidationResult. Each interval is a (lower, upper) tuple in degrees.
+    '''
+
+    def __init__(self, intervals, confidence, resamples, block_size):
+        self.__intervals = intervals
+        self.__confidence = confidence
+        self.__resamples = resamples
+        self.__block_size = block_size
+
+    @property
+    def accuracy_left_eye(self):
+        return self.__intervals[0]
+
+    @property
+    def accuracy_right_eye(self):
+        return self.__intervals[1]
+
+    @property
+    def precision_left_eye(self):
+        return self.__intervals[2]
+
+    @property
+    def precision_right_eye(self):
+        return self.__intervals[3]
+
+    @property
+    def precision_rms_left_eye(self):
+        return self.__intervals[4]
+
+    @property
+    def precision_rms_right_eye(self):
+        return self.__intervals[5]
+
+    @property
+    def confidence(self):
+        return self.__confidence
+
+    @property
+    def resamples(self):
+        return self.__resamples
+
+    @property
+    def block_size(self):
+        '''The number of consecutive samples drawn together, or None for the average of several points.
+        '''
+        return self.__block_size
+
+    def to_dict(self):
+        return dict(zip(_METRICS, self.__intervals))
+
+
+class ResultConfidenceIntervals(object):
+    '''Bootstrap confidence intervals of all points of a @ref CalibrationValidationResult and of its averages.
+    '''
+
+    def __init__(self, points, average):
+        self.__points = points
+        self.__average = average
+
+    @property
+    def points(self):
+        '''Mapping from @ref Point2 to a list of @ref ConfidenceIntervals, in the order of the points of the result.
+        The intervals of a timed out point are None.
+        '''
+        return self.__points
+
+    @property
+    def average(self):
+        '''The @ref ConfidenceIntervals of the averages over the points that did not time out, or None if all
+        points timed out.
+        '''
+        return self.__average
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("Bootstrap confidence intervals require numpy")
+
+
+def _default_block_size(count):
+    # A common rule for the block bootstrap, blocks grow with the cube root of the series length
+    return max(1, int(round(count ** (1.0 / 3.0))))
+
+
+def _block_sums(values, block_size):
+    '''Split a (length, columns) series into consecutive blocks and sum each block. The number of rows in each
+    block is added as a last column, since the last block may be shorter.
+    '''
+    edges = numpy.arange(0, len(values), block_size)
+    lengths = numpy.diff(numpy.append(edges, len(values)))
+    return numpy.column_stack((numpy.add.reduceat(values, edges, axis=0), lengths))
+
+
+def _resampled_means(random, resamples, block_sums):
+    '''Draw block bootstrap resamples of a series and calculate the mean of each resample, as a (resamples, columns)
+    array. A resample is drawn as the number of times each block is used, so the sums of all resamples are a single
+    matrix product with the block sums.
+    '''
+    blocks = len(block_sums)
+    drawn = random.randint(0, blocks, size=(resamples, blocks))
+    offsets = (numpy.arange(resamples) * blocks)[:, numpy.newaxis]
+    counts = numpy.bincount((drawn + offsets).ravel(), minlength=resamples * blocks).reshape(resamples, blocks)
+    # As floating point, so the product is done by BLAS
+    sums = counts.astype(numpy.float64).dot(block_sums)
+    return sums[:, :-1] / sums[:, -1:]
+
+
+def _eye_columns(samples, eye):
+    gaze_origins = _positions(samples, eye, "gaze_origin")
+    gaze_points = _positions(samples, eye, "gaze_point")
+    # Centering keeps the second moments small, so the covariance does not lose precision to cancellation
+    center = gaze_points.array.mean(axis=0)
+    centered = gaze_points.array - center
+    x, y, z = centered[:, 0], centered[:, 1], centered[:, 2]
+    columns = numpy.column_stack((gaze_origins.array, centered, x * x, x * y, x * z, y * y, y * z, z * z))
+    directions = vectormath.Vector3Array.from_points(gaze_origins, gaze_points).normalize()
+    consecutive_angles = directions[1:].angle(directions[:-1])
+    return columns, center, consecutive_angles ** 2
+
+
+def _eye_metrics(moments, center, stimuli_point):
+    '''Calculate the accuracy and the STD precision of one eye for each row of resampled moments.
+    '''
+    gaze_origin = moments[:, 0:3]
+    gaze_point = moments[:, 3:6]
+    direction = gaze_point + center - gaze_origin
+    distance = numpy.sqrt(numpy.einsum('ij,ij->i', direction, direction))
+    unit = direction / distance[:, numpy.newaxis]
+
+    target = numpy.asarray(stimuli_point) - gaze_origin
+    target /= numpy.sqrt(numpy.einsum('ij,ij->i', target, target))[:, numpy.newaxis]
+    accuracy = numpy.degrees(numpy.arccos(numpy.clip(numpy.einsum('ij,ij->i', unit, target), -1.0, 1.0)))
+
+    # The same estimate as the online statistics, from the spread perpendicular to the mean gaze direction
+    x, y, z = gaze_point[:, 0], gaze_point[:, 1], gaze_point[:, 2]
+    xx = moments[:, 6] - x * x
+    xy = moments[:, 7] - x * y
+    xz = moments[:, 8] - x * z
+    yy = moments[:, 9] - y * y
+    yz = moments[:, 10] - y * z
+    zz = moments[:, 11] - z * z
+    ux, uy, uz = unit[:, 0], unit[:, 1], unit[:, 2]
+    along = ux * ux * xx + uy * uy * yy + uz * uz * zz + 2.0 * (ux * uy * xy + ux * uz * xz + uy * uz * yz)
+    perpendicular = numpy.maximum(xx + yy + zz - along, 0.0)
+    precision = numpy.degrees(numpy.sqrt(perpendicular) / distance)
+    return accuracy, precision
+
+
+def _bootstrap_point_task(task):
+    '''Calculate the bootstrap replicates of the six metrics of a point as a (resamples, 6) array. Runs in the worker
+    processes, must be a module level function to be picklable.
+    '''
+    samples, stimuli_point, resamples, block_size, seed = task
+    left_columns, left_center, left_squares = _eye_columns(samples, "left")
+    right_columns, right_center, right_squares = _eye_columns(samples, "right")
+    columns = numpy.hstack((left_columns, right_columns))
+    squares = numpy.column_stack((left_squares, right_squares))
+    column_sums = _block_sums(columns, block_size)
+    square_sums = _block_sums(squares, block_size)
+
+    random = numpy.random.RandomState(seed)
+    replicates = numpy.empty((resamples, 6))
+    for first in range(0, resamples, _CHUNK):
+        chunk = min(_CHUNK, resamples - first)
+        moments = _resampled_means(random, chunk, column_sums)
+        mean_squares = _resampled_means(random, chunk, square_sums)
+        rows = slice(first, first + chunk)
+        replicates[rows, 0], replicates[rows, 2] = _eye_metrics(moments[:, :12], left_center, stimuli_point)
+        replicates[rows, 1], replicates[rows, 3] = _eye_metrics(moments[:, 12:], right_center, stimuli_point)
+        replicates[rows, 4:6] = numpy.sqrt(mean_squares)
+    return replicates
+
+
+def _intervals(replicates, confidence):
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    lower, upper = numpy.percentile(replicates, (tail, 100.0 - tail), axis=0)
+    return tuple(zip(lower.tolist(), upper.tolist()))
+
+
+def _check_arguments(resamples, confidence, block_size):
+    _require_numpy()
+    if resamples < 10:
+        raise ValueError("At least 10 resamples are needed")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("Confidence must be between 0.0 and 1.0")
+    if block_size is not None and block_size < 1:
+        raise ValueError("Block size must be at least 1")
+
+
+def bootstrap_point(point, display_area, resamples=2000, confidence=0.95, block_size=None, seed=None):
+    '''Calculates bootstrap confidence intervals of the accuracy and precision values of a point from its samples.
+
+    The samples are split into blocks of consecutive samples and the blocks are resampled, which keeps the
+    sample-to-sample correlation that the RMS precision depends on. All resamples are calculated together from the
+    sums of the blocks, as one matrix product per batch of resamples. The STD precision of each resample is
+    estimated from the spread of the gaze points perpendicular to the mean gaze direction, as in
+    @ref ScreenBasedCalibrationValidation.partial_result.
+
+    Args:
+    point: A @ref CalibrationValidationPoint with gaze_data.
+    display_area: The @ref DisplayArea the samples were collected for.
+    resamples: The number of bootstrap resamples. Default 2000.
+    confidence: The confidence level of the intervals. Default 0.95.
+    block_size: The number of consecutive samples drawn together. Use 1 for the ordinary bootstrap. Default None,
+    the cube root of the number of samples.
+    seed: Optional seed of the random generator, for repeatable intervals.
+
+    Returns:
+    A @ref ConfidenceIntervals, or None if the point timed out or has fewer than two samples.
+
+    Raises:
+    ImportError
+    ValueError
+    '''
+    _check_arguments(resamples, confidence, block_size)
+    samples = point.gaze_data
+    if point.timed_out or samples is None or len(samples) < 2:
+        return None
+    if block_size is None:
+        block_size = _default_block_size(len(samples))
+    stimuli_point = vectormath.calculate_normalized_point2_to_point3(display_area, point.screen_point)
+    replicates = _bootstrap_point_task((samples, tuple(stimuli_point), resamples, block_size, seed))
+    return ConfidenceIntervals(_intervals(replicates, confidence), confidence, resamples, block_size)
+
+
+def bootstrap_result(result, display_area, resamples=2000, confidence=0.95, block_size=None, seed=None,
+                     max_workers=None, executor=None):
+    '''Calculates bootstrap confidence intervals for all points of a result and for its averages. See
+    @ref bootstrap_point.
+
+    The replicates of the averages are the averages of the replicates of the points, as the points are resampled
+    independently.
+
+    Args:
+    result: A @ref CalibrationValidationResult whose points have gaze_data.
+    display_area: The @ref DisplayArea the samples were collected for.
+    resamples: See @ref bootstrap_point.
+    confidence: See @ref bootstrap_point.
+    block_size: See @ref bootstrap_point.
+    seed: Optional seed of the random generator. The intervals are the same whatever the number of workers.
+    max_workers: If given, the points are spread over this many worker processes. Default None, all points are
+    calculated in this process.
+    executor: Optional ProcessPoolExecutor to use instead of starting a new one.
+
+    Returns:
+    A @ref ResultConfidenceIntervals.
+
+    Raises:
+    ImportError
+    ValueError
+    '''
+    _check_arguments(resamples, confidence, block_size)
+    point_count = sum(len(validation_points) for validation_points in result.points.values())
+    # Every point gets its own seed, so the intervals do not depend on how the points are spread over the workers
+    seeds = numpy.random.RandomState(seed).randint(0, 2 ** 31 - 1, size=point_count)
+    tasks = []
+    slots = []
+    for screen_point, validation_points in result.points.items():
+        stimuli_point = tuple(vectormath.calculate_normalized_point2_to_point3(display_area, screen_point))
+        for point in validation_points:
+            samples = point.gaze_data
+            seed = int(seeds[len(slots)])
+            if point.timed_out or samples is None or len(samples) < 2:
+                slots.append(None)
+                continue
+            point_block_size = block_size if block_size is not None else _default_block_size(len(samples))
+            slots.append((len(tasks), point_block_size))
+            tasks.append((samples, stimuli_point, resamples, point_block_size, seed))
+
+    if executor is not None:
+        replicates = list(executor.map(_bootstrap_point_task, tasks))
+    elif max_workers is not None and max_workers > 1:
+        # Imported here since concurrent.futures is slow to import, also in the worker processes
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers) as own_executor:
+            replicates = list(own_executor.map(_bootstrap_point_task, tasks))
+    else:
+        replicates = [_bootstrap_point_task(task) for task in tasks]
+
+    points = {}
+    slots = iter(slots)
+    for screen_point, validation_points in result.points.items():
+        points[screen_point] = []
+        for _ in validation_points:
+            slot = next(slots)
+            if slot is None:
+                points[screen_point].append(None)
+                continue
+            index, point_block_size = slot
+            points[screen_point].append(ConfidenceIntervals(_intervals(replicates[index], confidence), confidence,
+                                                            resamples, point_block_size))
+
+    average = None
+    if replicates:
+        average = ConfidenceIntervals(_intervals(numpy.mean(replicates, axis=0), confidence), confidence, resamples,
+                                      None)
+    return ResultConfidenceIntervals(points, average)
@@ -0,0 +1,456 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import bisect
+import math
+import threading
+
+from . import _sdk, vectormath
+from .ScreenBasedCalibrationValidation import _EYETRACKER_METHODS, _calculate_eye_accuracy, _estimate_precision
+
+
+class RegionStatistics(object):
+    '''Rolling accuracy and precision of the samples in the window of a target region of a
+    @ref ContinuousValidation.
+    '''
+
+    def __init__(self, region, sample_count, metrics, baseline):
+        self.__region = region
+        self.__sample_count = sample_count
+        (self.__accuracy_left_eye, self.__accuracy_right_eye,
+         self.__precision_left_eye, self.__precision_right_eye,
+         self.__precision_rms_left_eye, self.__precision_rms_right_eye) = metrics
+        self.__baseline = baseline
+
+    @property
+    def region(self):
+        '''The center of the region as a normalized @ref Point2.
+        '''
+        return self.__region
+
+    @property
+    def sample_count(self):
+        '''The number of samples in the window.
+        '''
+        return self.__sample_count
+
+    @property
+    def accuracy_left_eye(self):
+        return self.__accuracy_left_eye
+
+    @property
+    def accuracy_right_eye(self):
+        return self.__accuracy_right_eye
+
+    @property
+    def precision_left_eye(self):
+        return self.__precision_left_eye
+
+    @property
+    def precision_right_eye(self):
+        return self.__precision_right_eye
+
+    @property
+    def precision_rms_left_eye(self):
+        return self.__precision_rms_left_eye
+
+    @property
+    def precision_rms_right_eye(self):
+        return self.__precision_rms_right_eye
+
+    @property
+    def baseline_accuracy_left_eye(self):
+        '''The accuracy of the left eye when the window of the region was first full, or NaN.
+        '''
+        return self.__baseline[0]
+
+    @property
+    def baseline_accuracy_right_eye(self):
+        '''The accuracy of the right eye when the window of the region was first full, or NaN.
+        '''
+        return self.__baseline[1]
+
+    @property
+    def drift(self):
+        '''The largest increase in accuracy of the two eyes since the baseline, in degrees, or NaN.
+        '''
+        return max(self.__accuracy_left_eye - self.__baseline[0], self.__accuracy_right_eye - self.__baseline[1])
+
+
+class _EyeSums(object):
+    '''Running sums over the samples of one eye in a window.
+    '''
+    __slots__ = ("gaze_origin", "gaze_point", "gaze_point_squares", "rms_sum_of_squares", "rms_count")
+
+    def __init__(self):
+        self.gaze_origin = [0.0, 0.0, 0.0]
+        self.gaze_point = [0.0, 0.0, 0.0]
+        self.gaze_point_squares = [0.0] * 6  # xx, xy, xz, yy, yz, zz
+        self.rms_sum_of_squares = 0.0
+        self.rms_count = 0
+
+    def add(self, sample, sign):
+        gaze_origin, gaze_point, rms_square = sample
+        for i in range(3):
+            self.gaze_origin[i] += sign * gaze_origin[i]
+            self.gaze_point[i] += sign * gaze_point[i]
+        x, y, z = gaze_point
+        squares = self.gaze_point_squares
+        squares[0] += sign * x * x
+        squares[1] += sign * x * y
+        squares[2] += sign * x * z
+        squares[3] += sign * y * y
+        squares[4] += sign * y * z
+        squares[5] += sign * z * z
+        if rms_square is not None:
+            self.rms_sum_of_squares += sign * rms_square
+            self.rms_count += sign
+
+    def metrics(self, count, stimulus):
+        factor = 1.0 / count
+        gaze_origin_mean = vectormath.Point3(*[value * factor for value in self.gaze_origin])
+        gaze_point_mean = vectormath.Point3(*[value * factor for value in self.gaze_point])
+        x, y, z = gaze_point_mean
+        xx, xy, xz, yy, yz, zz = [value * factor for value in self.gaze_point_squares]
+        covariance = (xx - x * x, xy - x * y, xz - x * z, yy - y * y, yz - y * z, zz - z * z)
+        accuracy = _calculate_eye_accuracy(gaze_origin_mean, gaze_point_mean, stimulus)
+        precision = _estimate_precision(gaze_origin_mean, gaze_point_mean, covariance)
+        return accuracy, precision
+
+
+class _TargetSums(object):
+    '''Running sums over the samples of a window that look at one target.
+    '''
+    __slots__ = ("stimulus", "count", "left", "right")
+
+    def __init__(self, stimulus):
+        self.stimulus = vectormath.Point3(*stimulus)
+        self.count = 0
+        self.left = _EyeSums()
+        self.right = _EyeSums()
+
+
+class _RegionWindow(object):
+    '''A ring buffer of the last samples looking at targets in one region, with running sums over them. Adding a
+    sample costs the same however large the window is.
+
+    The sums are kept per target, since a region may hold several targets. The accuracy and precision of each target
+    are computed as for a point of @ref ScreenBasedCalibrationValidation and combined weighted by the number of
+    samples, so the distance between the targets does not count as imprecision and opposite offsets to different
+    targets do not cancel out.
+    '''
+
+    def __init__(self, region, size):
+        self.region = region
+        self.size = size
+        self.samples = [None] * size
+        self.next = 0
+        self.count = 0
+        self.evictions = 0
+        self.baseline = (math.nan, math.nan)
+        self.drifting = False
+        self.__reset_sums()
+
+    def __reset_sums(self):
+        self.targets = {}  # stimuli point -> _TargetSums
+
+    def __add_sums(self, sample, sign):
+        stimulus, left, right = sample
+        sums = self.targets.get(stimulus)
+        if sums is None:
+            sums = self.targets[stimulus] = _TargetSums(stimulus)
+        sums.count += sign
+        if sums.count == 0:
+            del self.targets[stimulus]
+            return
+        sums.left.add(left, sign)
+        sums.right.add(right, sign)
+
+    def add(self, sample):
+        '''Add a sample, replacing the oldest sample if the window is full.
+
+        Returns:
+        True if the window is full.
+        '''
+        if self.count == self.size:
+            self.__add_sums(self.samples[self.next], -1)
+            self.evictions += 1
+        else:
+            self.count += 1
+        self.samples[self.next] = sample
+        self.next = (self.next + 1) % self.size
+        self.__add_sums(sample, 1)
+        if self.evictions >= self.size:
+            # Recalculate the sums now and then, so rounding errors from subtracting do not build up
+            self.evictions = 0
+            self.__reset_sums()
+            for stored in self.samples:
+                self.__add_sums(stored, 1)
+        return self.count == self.size
+
+    def __eye_metrics(self, eye):
+        accuracy = 0.0
+        variance = 0.0
+        rms_sum_of_squares = 0.0
+        rms_count = 0
+        for sums in self.targets.values():
+            eye_sums = getattr(sums, eye)
+            target_accuracy, target_precision = eye_sums.metrics(sums.count, sums.stimulus)
+            accuracy += sums.count * target_accuracy
+            variance += sums.count * target_precision * target_precision
+            rms_sum_of_squares += eye_sums.rms_sum_of_squares
+            rms_count += eye_sums.rms_count
+        precision_rms = math.sqrt(max(rms_sum_of_squares, 0.0) / rms_count) if rms_count > 0 else math.nan
+        return accuracy / self.count, math.sqrt(variance / self.count), precision_rms
+
+    def metrics(self):
+        accuracy_left, precision_left, precision_rms_left = self.__eye_metrics("left")
+        accuracy_right, precision_right, precision_rms_right = self.__eye_metrics("right")
+        return (accuracy_left, accuracy_right,
+                precision_left, precision_right,
+                precision_rms_left, precision_rms_right)
+
+    def statistics(self):
+        return RegionStatistics(self.region, self.count, self.metrics(), self.baseline)
+
+
+class ContinuousValidation(object):
+    '''Validates the calibration in the background while the participant looks at known targets during a task.
+
+    Targets are given as annotations of where on the display area the participant looks and during which time. The
+    valid samples during an annotation are added to a fixed size window for the region of the display area the
+    target is in, and the accuracy and precision of each region are kept up to date with every sample. A callback
+    is called when the accuracy of a region drifts beyond a threshold. Memory use is bounded by the window size and
+    the number of regions, however long the session runs.
+    '''
+    WINDOW_SIZE_MIN = 10
+
+    def __init__(self,
+                 eyetracker,
+                 window_size=120,
+                 region_size=0.1,
+                 drift_threshold=None,
+                 accuracy_threshold=None,
+                 on_drift=None,
+                 display_area=None):
+        '''Create a continuous validation.
+
+        Args:
+        eyetracker: See @ref ScreenBasedCalibrationValidation.
+        window_size: The number of samples in the window of each region. Default 120, minimum 10.
+        region_size: The width and height of the regions in normalized display area coordinates. Targets are
+        grouped in the region their position rounds to. Default 0.1.
+        drift_threshold: Drift is reported when the accuracy of a region has grown this many degrees since its
+        window was first full. Default None, not checked.
+        accuracy_threshold: Drift is reported when the accuracy of a region is more than this many degrees.
+        Default None, not checked.
+        on_drift: Callable called with a @ref RegionStatistics when a region starts drifting. It is called again
+        for the region only after the region has been back within the thresholds. It is called on the eye tracker
+        callback thread, and should return quickly.
+        display_area: See @ref ScreenBasedCalibrationValidation.
+
+        Raises:
+        ValueError
+        '''
+        if not all(callable(getattr(eyetracker, name, None)) for name in _EYETRACKER_METHODS):
+            raise ValueError("Not a valid EyeTracker object")
+        if window_size < self.WINDOW_SIZE_MIN:
+            raise ValueError("Window size must be at least 10")
+        if not 0.0 < region_size <= 1.0:
+            raise ValueError("Region size must be between 0.0 and 1.0")
+        self.__eyetracker = eyetracker
+        self.__window_size = window_size
+        self.__region_size = region_size
+        self.__drift_threshold = drift_threshold
+        self.__accuracy_threshold = accuracy_threshold
+        self.__on_drift = on_drift
+        self.__display_area = display_area
+
+        self.__lock = threading.Lock()
+        self.__targets = []  # (start, end, region, stimuli point) ordered by start
+        self.__target_starts = []
+        self.__regions = {}
+        self.__previous = None  # (target, left direction, right direction) of the last accepted sample
+        self.__running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__running:
+            self.stop()
+
+    def start(self):
+        '''Starts subscribing to gaze data from the eye tracker.
+
+        Raises:
+        RuntimeWarning
+        '''
+        if self.__running:
+            raise RuntimeWarning("Continuous validation already started")
+        self.__eyetracker.subscribe_to(_sdk.subscription("EYETRACKER_GAZE_DATA"), self._gaze_data_received)
+        self.__running = True
+
+    def stop(self):
+        '''Stops subscribing to gaze data. The statistics are kept.
+
+        Raises:
+        RuntimeWarning
+        '''
+        if not self.__running:
+            raise RuntimeWarning("Continuous validation not started")
+        self.__eyetracker.unsubscribe_from(_sdk.subscription("EYETRACKER_GAZE_DATA"), self._gaze_data_received)
+        self.__running = False
+
+    def __region(self, screen_point):
+        size = self.__region_size
+        return vectormath.Point2(round(screen_point.x / size) * size, round(screen_point.y / size) * size)
+
+    def add_target(self, screen_point, start_time_stamp, end_time_stamp):
+        '''Annotates that the participant looks at a target during a period of time. Annotations must be added before
+        the samples of the period arrive. Annotations that have ended are discarded as samples arrive.
+
+        Args:
+        screen_point: The normalized @ref Point2 of the target on the display area.
+        start_time_stamp: Start of the period, in the system time stamps of @ref GazeData in microseconds.
+        end_time_stamp: End of the period, in the same clock.
+
+        Raises:
+        ValueError
+        '''
+        if type(screen_point) is not vectormath.Point2:
+            raise ValueError("A screen point must be of Point2 type")
+        if not (0.0 <= screen_point.x <= 1.0 and 0.0 <= screen_point.y <= 1.0):
+            raise ValueError("Screen point must be within coordinates (0.0, 0.0) and (1.0, 1.0)")
+        if end_time_stamp < start_time_stamp:
+            raise ValueError("The end of a target must not be before its start")
+        if self.__display_area is None:
+            self.__display_area = self.__eyetracker.get_display_area()
+        stimuli_point = vectormath.calculate_normalized_point2_to_point3(self.__display_area, screen_point)
+        target = (start_time_stamp, end_time_stamp, self.__region(screen_point), tuple(stimuli_point))
+
+        self.__lock.acquire()
+        index = bisect.bisect_right(self.__target_starts, start_time_stamp)
+        self.__target_starts.insert(index, start_time_stamp)
+        self.__targets.insert(index, target)
+        self.__lock.release()
+
+    def __find_target(self, time_stamp):
+        # Drop the targets that have ended, samples arrive in time order
+        targets = self.__targets
+        ended = 0
+        while ended < len(targets) and targets[ended][1] < time_stamp:
+            ended += 1
+        if ended > 0:
+            del targets[:ended]
+            del self.__target_starts[:ended]
+        for target in targets:
+            if target[0] > time_stamp:
+                return None
+            if target[1] >= time_stamp:
+                return target
+        return None
+
+    def _gaze_data_received(self, gaze_data):
+        left_eye = gaze_data.left_eye
+        right_eye = gaze_data.right_eye
+        if not (left_eye.gaze_point.validity and right_eye.gaze_point.validity):
+            return
+
+        drifting = None
+        self.__lock.acquire()
+        target = self.__find_target(gaze_data.system_time_stamp)
+        if target is not None:
+            _, _, region, stimuli_point = target
+            eyes = []
+            directions = []
+            for index, eye in enumerate((left_eye, right_eye)):
+                gaze_origin = eye.gaze_origin.position_in_user_coordinates
+                gaze_point = eye.gaze_point.position_in_user_coordinates
+                direction = vectormath.Vector3.from_points(vectormath.Point3.from_list(gaze_origin),
+                                                           vectormath.Point3.from_list(gaze_point)).normalize()
+                rms_square = None
+                if self.__previous is not None and self.__previous[0] is target:
+                    rms_square = direction.angle(self.__previous[1][index]) ** 2
+                eyes.append((tuple(gaze_origin), tuple(gaze_point), rms_square))
+                directions.append(direction)
+            self.__previous = (target, directions)
+
+            window = self.__regions.get(region)
+            if window is None:
+                window = self.__regions[region] = _RegionWindow(region, self.__window_size)
+            if window.add((stimuli_point, eyes[0], eyes[1])):
+                drifting = self.__check_drift(window)
+        self.__lock.release()
+
+        if drifting is not None and self.__on_drift is not None:
+            self.__on_drift(drifting)
+
+    def __check_drift(self, window):
+        '''Updates the drift state of a full window.
+
+        Returns:
+        The @ref RegionStatistics if the region started drifting, otherwise None.
+        '''
+        if self.__drift_threshold is None and self.__accuracy_threshold is None and not math.isnan(window.baseline[0]):
+            return None
+        statistics = window.statistics()
+        if math.isnan(window.baseline[0]):
+            window.baseline = (statistics.accuracy_left_eye, statistics.accuracy_right_eye)
+            statistics = window.statistics()
+        drifting = ((self.__drift_threshold is not None and statistics.drift > self.__drift_threshold) or
+                    (self.__accuracy_threshold is not None and
+                     max(statistics.accuracy_left_eye, statistics.accuracy_right_eye) > self.__accuracy_threshold))
+        started = drifting and not window.drifting
+        window.drifting = drifting
+        return statistics if started else None
+
+    def regions(self):
+        '''Gets the current statistics of all regions that have samples.
+
+        Returns:
+        List of @ref RegionStatistics.
+        '''
+        self.__lock.acquire()
+        statistics = [window.statistics() for window in self.__regions.values()]
+        self.__lock.release()
+        return statistics
+
+    def region_statistics(self, screen_point):
+        '''Gets the current statistics of the region a point is in.
+
+        Args:
+        screen_point: A normalized @ref Point2.
+
+        Returns:
+        A @ref RegionStatistics, or None if there are no samples for the region.
+        '''
+        self.__lock.acquire()
+        window = self.__regions.get(self.__region(screen_point))
+        statistics = window.statistics() if window is not None else None
+        self.__lock.release()
+        return statistics
+
+    @property
+    def pending_target_count(self):
+        '''The number of target annotations that have not ended yet.
+        '''
+        return len(self.__targets)
+
+    @property
+    def is_running(self):
+        return self.__running
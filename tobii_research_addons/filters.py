@@ -0,0 +1,102 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import math
+
+
+class _SampleFilter(object):
+    '''Decides which received samples of a point are used, before they count toward the sample count. Samples can be
+    decimated to every Nth sample or to a minimum spacing in device time, and rejected when the gaze origin of an eye
+    jumps or shortly after an eye was lost, as during a blink.
+
+    Samples where an eye is invalid are passed on, so they are rejected for being invalid, but they are still seen by
+    the decimation and the blink detection. The state is reset for every point with @ref reset.
+    '''
+
+    def __init__(self, decimation=1, min_sample_interval_us=0, max_gaze_origin_jump_mm=None, blink_holdoff_us=0):
+        '''Create a sample filter. See @ref ScreenBasedCalibrationValidation for the arguments.
+
+        Raises:
+        ValueError
+        '''
+        if decimation < 1:
+            raise ValueError("Decimation must be at least 1")
+        if min_sample_interval_us < 0:
+            raise ValueError("Minimum sample interval must not be negative")
+        if max_gaze_origin_jump_mm is not None and max_gaze_origin_jump_mm <= 0:
+            raise ValueError("Maximum gaze origin jump must be positive")
+        if blink_holdoff_us < 0:
+            raise ValueError("Blink holdoff must not be negative")
+        self.__decimation = decimation
+        self.__min_sample_interval = min_sample_interval_us
+        self.__max_gaze_origin_jump = max_gaze_origin_jump_mm
+        self.__blink_holdoff = blink_holdoff_us
+        self.reset()
+
+    @staticmethod
+    def create(decimation, min_sample_interval_us, max_gaze_origin_jump_mm, blink_holdoff_us):
+        '''Create a sample filter, or None if all arguments leave the samples as they are.
+        '''
+        if (decimation == 1 and not min_sample_interval_us and max_gaze_origin_jump_mm is None and
+                not blink_holdoff_us):
+            return None
+        return _SampleFilter(decimation, min_sample_interval_us, max_gaze_origin_jump_mm, blink_holdoff_us)
+
+    def reset(self):
+        self.__received = 0
+        self.__last_kept_time_stamp = None
+        self.__last_invalid_time_stamp = None
+        self.__previous_gaze_origins = None
+
+    def reject_reason(self, gaze_data):
+        '''Gets the reason a sample is not used.
+
+        Returns:
+        "decimated", "after_blink", "gaze_origin_jump", or None if the sample is passed on.
+        '''
+        left_eye = gaze_data.left_eye
+        right_eye = gaze_data.right_eye
+        time_stamp = gaze_data.device_time_stamp
+        valid = left_eye.gaze_point.validity and right_eye.gaze_point.validity
+        if not valid and self.__blink_holdoff:
+            self.__last_invalid_time_stamp = time_stamp
+
+        self.__received += 1
+        if self.__decimation > 1 and (self.__received - 1) % self.__decimation != 0:
+            return "decimated"
+        if self.__min_sample_interval:
+            if (self.__last_kept_time_stamp is not None and
+                    time_stamp - self.__last_kept_time_stamp < self.__min_sample_interval):
+                return "decimated"
+            self.__last_kept_time_stamp = time_stamp
+
+        if not valid:
+            return None
+        if (self.__last_invalid_time_stamp is not None and
+                time_stamp - self.__last_invalid_time_stamp < self.__blink_holdoff):
+            return "after_blink"
+        if self.__max_gaze_origin_jump is not None:
+            gaze_origins = (left_eye.gaze_origin.position_in_user_coordinates,
+                            right_eye.gaze_origin.position_in_user_coordinates)
+            previous_gaze_origins = self.__previous_gaze_origins
+            if previous_gaze_origins is not None:
+                for gaze_origin, previous_gaze_origin in zip(gaze_origins, previous_gaze_origins):
+                    jump = math.sqrt(sum((a - b) ** 2 for a, b in zip(gaze_origin, previous_gaze_origin)))
+                    if jump > self.__max_gaze_origin_jump:
+                        return "gaze_origin_jump"
+            # Only used samples become the reference, so a single spike does not reject the sample after it too
+            self.__previous_gaze_origins = gaze_origins
+        return None
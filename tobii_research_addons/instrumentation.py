@@ -0,0 +1,240 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import math
+import threading
+import time
+
+perf_counter = getattr(time, "perf_counter", time.time)
+
+
+class Histogram(object):
+    '''Distribution of durations in seconds, counted in buckets that double in size from one microsecond.
+    '''
+    BUCKET_COUNT = 32
+    SMALLEST_BUCKET = 1e-6  # s
+
+    def __init__(self):
+        self.__buckets = [0] * self.BUCKET_COUNT
+        self.__count = 0
+        self.__total = 0.0
+        self.__min = math.inf
+        self.__max = -math.inf
+
+    def add(self, value):
+        '''Add a value. Not synchronized, see @ref ValidationStats.
+        '''
+        if value <= self.SMALLEST_BUCKET:
+            index = 0
+        else:
+            index = min(int(math.ceil(math.log(value / self.SMALLEST_BUCKET, 2))), self.BUCKET_COUNT - 1)
+        self.__buckets[index] += 1
+        self.__count += 1
+        self.__total += value
+        if value < self.__min:
+            self.__min = value
+        if value > self.__max:
+            self.__max = value
+
+    def copy(self):
+        other = Histogram()
+        other.__buckets = list(self.__buckets)
+        other.__count = self.__count
+        other.__total = self.__total
+        other.__min = self.__min
+        other.__max = self.__max
+        return other
+
+    @property
+    def count(self):
+        return self.__count
+
+    @property
+    def total(self):
+        return self.__total
+
+    @property
+    def mean(self):
+        return self.__total / self.__count if self.__count > 0 else math.nan
+
+    @property
+    def min(self):
+        return self.__min if self.__count > 0 else math.nan
+
+    @property
+    def max(self):
+        return self.__max if self.__count > 0 else math.nan
+
+    @property
+    def buckets(self):
+        '''List of (upper bound in seconds, count) pairs. The last bucket also counts all larger values.
+        '''
+        return [(self.SMALLEST_BUCKET * 2 ** index, count) for index, count in enumerate(self.__buckets)]
+
+    def percentile(self, percent):
+        '''Gets an upper bound of a percentile, from the bucket it falls in.
+
+        Args:
+        percent: Percentile between 0 and 100.
+        '''
+        if self.__count == 0:
+            return math.nan
+        rank = percent / 100.0 * self.__count
+        seen = 0
+        for index, count in enumerate(self.__buckets):
+            seen += count
+            if count > 0 and seen >= rank:
+                return min(self.SMALLEST_BUCKET * 2 ** index, self.__max)
+        return self.__max
+
+    def to_dict(self):
+        return {"count": self.count, "total": self.total, "mean": self.mean, "min": self.min, "max": self.max,
+                "p50": self.percentile(50), "p90": self.percentile(90), "p99": self.percentile(99)}
+
+
+class ValidationStats(object):
+    '''Counters and duration histograms of a @ref ScreenBasedCalibrationValidation.
+
+    Counters:
+    samples_received: Samples passed to the gaze data callback.
+    samples_accepted: Samples added to the current point.
+    samples_rejected.not_collecting, samples_rejected.left_invalid, samples_rejected.right_invalid,
+    samples_rejected.both_invalid, samples_rejected.decimated, samples_rejected.after_blink and
+    samples_rejected.gaze_origin_jump: Samples that were not added, by reason.
+    points_completed and points_timed_out: Data collections that stopped on the sample count and on the timeout.
+    points_computed and points_cached: Points computed by compute(), and points whose kept result was used.
+
+    Histograms, in seconds:
+    callback_time: Time spent processing each sample.
+    lock_wait_time and lock_hold_time: Time spent waiting for and holding the internal lock.
+    completion_time: Time from start_collecting_data until data collection for the point stopped.
+    timer_lateness: Time from a timeout until it was handled.
+    compute_time: Duration of compute(), and of its phases in compute_time.stimuli, compute_time.metrics and
+    compute_time.result.
+    '''
+    REJECT_REASONS = ("not_collecting", "left_invalid", "right_invalid", "both_invalid",
+                      "decimated", "after_blink", "gaze_origin_jump")
+
+    def __init__(self, sink=None):
+        '''Create an empty set of statistics.
+
+        Args:
+        sink: Optional callable called with the name and value of every counter increment and every duration as
+        it is recorded, for example to forward them to a metrics system. It is called on the thread that records
+        the value, which may be the eye tracker callback thread, and should return quickly.
+        '''
+        self.__sink = sink
+        self.__lock = threading.Lock()
+        self.__counters = {}
+        self.__histograms = {}
+
+    def increment(self, name, amount=1):
+        self.__lock.acquire()
+        self.__counters[name] = self.__counters.get(name, 0) + amount
+        self.__lock.release()
+        if self.__sink is not None:
+            self.__sink(name, amount)
+
+    def observe(self, name, value):
+        '''Add a duration in seconds to a histogram.
+        '''
+        self.__lock.acquire()
+        histogram = self.__histograms.get(name)
+        if histogram is None:
+            histogram = self.__histograms[name] = Histogram()
+        histogram.add(value)
+        self.__lock.release()
+        if self.__sink is not None:
+            self.__sink(name, value)
+
+    def counter(self, name):
+        self.__lock.acquire()
+        value = self.__counters.get(name, 0)
+        self.__lock.release()
+        return value
+
+    def histogram(self, name):
+        '''Gets a copy of a histogram, empty if nothing has been recorded for it.
+        '''
+        self.__lock.acquire()
+        histogram = self.__histograms.get(name)
+        histogram = histogram.copy() if histogram is not None else Histogram()
+        self.__lock.release()
+        return histogram
+
+    def snapshot(self):
+        '''Gets all counters and a summary of all histograms.
+
+        Returns:
+        A dict with "counters", a mapping from name to value, and "histograms", a mapping from name to a dict with
+        count, total, mean, min, max, p50, p90 and p99.
+        '''
+        self.__lock.acquire()
+        counters = dict(self.__counters)
+        histograms = dict((name, histogram.to_dict()) for name, histogram in self.__histograms.items())
+        self.__lock.release()
+        return {"counters": counters, "histograms": histograms}
+
+    def export(self, sink):
+        '''Pass the current values to a sink, as name and value pairs. Histograms are passed as their summary values,
+        for example "callback_time.p99".
+        '''
+        snapshot = self.snapshot()
+        for name, value in sorted(snapshot["counters"].items()):
+            sink(name, value)
+        for name, summary in sorted(snapshot["histograms"].items()):
+            for key, value in sorted(summary.items()):
+                sink(name + "." + key, value)
+
+    def reset(self):
+        self.__lock.acquire()
+        self.__counters = {}
+        self.__histograms = {}
+        self.__lock.release()
+
+
+class _TimedLock(object):
+    '''Wraps a reentrant lock and records the time spent waiting for it and holding it. The durations are recorded
+    after the lock is released, so a sink is never called while holding the lock.
+    '''
+
+    def __init__(self, lock, stats):
+        self.__lock = lock
+        self.__stats = stats
+        self.__depth = 0
+        self.__requested_at = 0.0
+        self.__acquired_at = 0.0
+
+    def acquire(self):
+        requested_at = perf_counter()
+        self.__lock.acquire()
+        self.__depth += 1
+        if self.__depth == 1:
+            self.__requested_at = requested_at
+            self.__acquired_at = perf_counter()
+        return True
+
+    def release(self):
+        self.__depth -= 1
+        if self.__depth > 0:
+            self.__lock.release()
+            return
+        requested_at = self.__requested_at
+        acquired_at = self.__acquired_at
+        released_at = perf_counter()
+        self.__lock.release()
+        self.__stats.observe("lock_wait_time", acquired_at - requested_at)
+        self.__stats.observe("lock_hold_time", released_at - acquired_at)
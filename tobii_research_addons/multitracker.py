@@ -0,0 +1,200 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+from .scheduler import DeadlineScheduler, monotonic
+from .ScreenBasedCalibrationValidation import ScreenBasedCalibrationValidation
+
+
+class MultiTrackerValidationResult(object):
+    '''Contains the results of a calibration validation run on several eye trackers at the same time.
+    '''
+
+    def __init__(self, eyetrackers, results, wall_time, collection_time):
+        self.__eyetrackers = eyetrackers
+        self.__results = results
+        self.__wall_time = wall_time
+        self.__collection_time = collection_time
+
+    @property
+    def eyetrackers(self):
+        '''The eye trackers, in the order they were given.
+        '''
+        return self.__eyetrackers
+
+    @property
+    def results(self):
+        '''The @ref CalibrationValidationResult of each eye tracker, in the same order as eyetrackers.
+        '''
+        return self.__results
+
+    def result_for(self, eyetracker):
+        '''Gets the @ref CalibrationValidationResult of an eye tracker.
+        '''
+        return self.__results[self.__eyetrackers.index(eyetracker)]
+
+    @property
+    def wall_time(self):
+        '''Seconds from the start of the run until the last result was computed.
+        '''
+        return self.__wall_time
+
+    @property
+    def collection_time(self):
+        '''Seconds from the start of the run until data collection had stopped on all eye trackers.
+        '''
+        return self.__collection_time
+
+    @property
+    def point_count(self):
+        '''The number of validation points over all eye trackers.
+        '''
+        return sum(len(result.points) for result in self.__results)
+
+    @property
+    def sample_count(self):
+        '''The number of valid gaze samples collected over all eye trackers.
+        '''
+        return sum(len(point.gaze_data)
+                   for result in self.__results
+                   for points in result.points.values()
+                   for point in points)
+
+    @property
+    def points_per_second(self):
+        return self.point_count / self.__wall_time if self.__wall_time > 0 else float("nan")
+
+    @property
+    def samples_per_second(self):
+        return self.sample_count / self.__wall_time if self.__wall_time > 0 else float("nan")
+
+
+class MultiTrackerValidation(object):
+    '''Runs calibration validation on several screen based eye trackers at the same time, with the same stimuli
+    points shown to all of them. All sessions share one timeout scheduler. Once the last point has been shown, the
+    result of each session is computed as soon as that session has finished collecting, while the other sessions may
+    still be collecting.
+
+    By default the results are computed on worker threads. They hold the GIL, so the sessions are computed one at a
+    time. With a @ref SharedMemoryComputeWorker whose executor has several processes, the sessions are computed in
+    parallel in the worker processes.
+    '''
+
+    def __init__(self, eyetrackers, sample_count=30, timeout_ms=1000, max_workers=None, scheduler=None,
+                 compute_worker=None, **kwargs):
+        '''Create a validation session for each eye tracker.
+
+        Args:
+        eyetrackers: Iterable of @ref EyeTracker objects.
+        sample_count: See @ref ScreenBasedCalibrationValidation.
+        timeout_ms: See @ref ScreenBasedCalibrationValidation.
+        max_workers: The number of threads waiting for the sessions and computing their results. Default is one per
+        eye tracker.
+        scheduler: The @ref DeadlineScheduler shared by the sessions. Default is the scheduler shared by the whole
+        process.
+        compute_worker: Optional @ref SharedMemoryComputeWorker to compute the results in, see
+        @ref ScreenBasedCalibrationValidation.submit_compute. Requires compact_storage. It is not closed by the run.
+        kwargs: Passed on to every @ref ScreenBasedCalibrationValidation.
+
+        Raises:
+        ValueError
+        '''
+        self.__eyetrackers = list(eyetrackers)
+        if not self.__eyetrackers:
+            raise ValueError("At least one eye tracker is needed")
+        self.__scheduler = scheduler if scheduler is not None else DeadlineScheduler.default()
+        self.__validations = [
+            ScreenBasedCalibrationValidation(eyetracker, sample_count, timeout_ms, scheduler=self.__scheduler,
+                                             **kwargs)
+            for eyetracker in self.__eyetrackers]
+        self.__max_workers = max_workers or len(self.__validations)
+        self.__compute_worker = compute_worker
+
+    def __enter__(self):
+        self.enter_validation_mode()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__leave_all(lambda validation: validation.__exit__(exc_type, exc_value, traceback))
+
+    @property
+    def validations(self):
+        '''The @ref ScreenBasedCalibrationValidation of each eye tracker, in the same order as the eye trackers.
+        '''
+        return self.__validations
+
+    def enter_validation_mode(self):
+        for validation in self.__validations:
+            validation.enter_validation_mode()
+
+    def leave_validation_mode(self):
+        self.__leave_all(lambda validation: validation.leave_validation_mode())
+
+    def __leave_all(self, leave):
+        # Every session is left, also when leaving one of them fails, and the first error is raised afterwards
+        error = None
+        for validation in self.__validations:
+            try:
+                leave(validation)
+            except Exception as exception:
+                if error is None:
+                    error = exception
+        if error is not None:
+            raise error
+
+    def run(self, points, show_point=None):
+        '''Collects data for each point on all eye trackers and computes the results.
+
+        Args:
+        points: Iterable of @ref Point2 stimuli points, shown in order.
+        show_point: Optional callable called with each point before data collection for it starts, for example to
+        present the stimulus.
+
+        Returns:
+        An instance of @ref MultiTrackerValidationResult.
+        '''
+        # Imported here since concurrent.futures is slow to import and not needed otherwise
+        from concurrent.futures import ThreadPoolExecutor
+
+        points = list(points)
+        start = monotonic()
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            for index, point in enumerate(points):
+                if show_point is not None:
+                    show_point(point)
+                for validation in self.__validations:
+                    validation.start_collecting_data(point)
+                if index < len(points) - 1:
+                    for validation in self.__validations:
+                        validation.wait_for_data_collection()
+            futures = [executor.submit(self.__collect_and_compute, validation, self.__compute_worker)
+                       for validation in self.__validations]
+            collection_times = []
+            results = []
+            for future in futures:
+                collection_time, result = future.result()
+                collection_times.append(collection_time)
+                results.append(result)
+        wall_time = monotonic() - start
+        return MultiTrackerValidationResult(self.__eyetrackers, results, wall_time,
+                                            max(collection_times) - start if collection_times else 0.0)
+
+    @staticmethod
+    def __collect_and_compute(validation, compute_worker):
+        validation.wait_for_data_collection()
+        collection_time = monotonic()
+        if compute_worker is not None:
+            return collection_time, validation.submit_compute(compute_worker).result()
+        return collection_time, validation.compute()
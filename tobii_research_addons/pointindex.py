@@ -0,0 +1,155 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import math
+
+
+class PointIndex(object):
+    '''A mapping from normalized @ref Point2 screen points to values, where points are matched on a grid.
+
+    @ref Point2 compares with a tolerance but hashes the exact coordinates, so points that differ in the last bits,
+    as they often do when computed by layout code, are different dict keys. Here the coordinates are rounded to a
+    grid of the given resolution, and all points in the same grid cell are the same key. The first point stored in
+    a cell is kept as the key of the cell, so repeated rounds for a stimulus always merge under the same point.
+    Lookups, stores and removals take constant time. Points are iterated in the order they were first stored.
+    '''
+    DEFAULT_RESOLUTION = 1e-6
+    BUCKET_SIZE = 0.05  # normalized size of the coarse buckets searched by within()
+
+    def __init__(self, resolution=DEFAULT_RESOLUTION, items=()):
+        '''Create a point index.
+
+        Args:
+        resolution: Size of the grid cells in normalized coordinates. Default 1e-6.
+        items: Optional iterable of (@ref Point2, value) pairs to store.
+
+        Raises:
+        ValueError
+        '''
+        if not 0.0 < resolution <= 1.0:
+            raise ValueError("Resolution must be between 0.0 and 1.0")
+        self.__resolution = resolution
+        self.__bucket_cells = max(1, int(round(self.BUCKET_SIZE / resolution)))
+        self.__entries = {}  # cell -> [point, value]
+        self.__buckets = {}  # bucket -> set of cells
+        for point, value in items:
+            self[point] = value
+
+    @property
+    def resolution(self):
+        return self.__resolution
+
+    def __cell(self, point):
+        return (int(round(point[0] / self.__resolution)), int(round(point[1] / self.__resolution)))
+
+    def __bucket(self, cell):
+        return (cell[0] // self.__bucket_cells, cell[1] // self.__bucket_cells)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __iter__(self):
+        return (entry[0] for entry in list(self.__entries.values()))
+
+    def __contains__(self, point):
+        return self.__cell(point) in self.__entries
+
+    def __getitem__(self, point):
+        entry = self.__entries.get(self.__cell(point))
+        if entry is None:
+            raise KeyError(point)
+        return entry[1]
+
+    def __setitem__(self, point, value):
+        cell = self.__cell(point)
+        entry = self.__entries.get(cell)
+        if entry is not None:
+            entry[1] = value
+            return
+        self.__entries[cell] = [point, value]
+        bucket = self.__bucket(cell)
+        cells = self.__buckets.get(bucket)
+        if cells is None:
+            cells = self.__buckets[bucket] = set()
+        cells.add(cell)
+
+    def __delitem__(self, point):
+        cell = self.__cell(point)
+        if cell not in self.__entries:
+            raise KeyError(point)
+        del self.__entries[cell]
+        bucket = self.__bucket(cell)
+        cells = self.__buckets[bucket]
+        cells.discard(cell)
+        if not cells:
+            del self.__buckets[bucket]
+
+    def get(self, point, default=None):
+        entry = self.__entries.get(self.__cell(point))
+        return default if entry is None else entry[1]
+
+    def key(self, point):
+        '''Gets the point stored for the grid cell of a point.
+
+        Returns:
+        The @ref Point2 the cell was first stored with, or None if nothing is stored for the cell.
+        '''
+        entry = self.__entries.get(self.__cell(point))
+        return None if entry is None else entry[0]
+
+    def matches(self, point, other):
+        '''Tells if two points are in the same grid cell, and so are the same key.
+        '''
+        return self.__cell(point) == self.__cell(other)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [entry[1] for entry in self.__entries.values()]
+
+    def items(self):
+        return [(entry[0], entry[1]) for entry in self.__entries.values()]
+
+    def clear(self):
+        self.__entries = {}
+        self.__buckets = {}
+
+    def within(self, point, radius):
+        '''Gets the stored points within a distance of a point, in normalized coordinates.
+
+        Args:
+        point: A @ref Point2.
+        radius: The maximum distance.
+
+        Returns:
+        List of (@ref Point2, value) pairs, nearest first.
+        '''
+        if radius < 0:
+            raise ValueError("Radius must not be negative")
+        x, y = point[0], point[1]
+        first = self.__bucket(self.__cell((x - radius, y - radius)))
+        last = self.__bucket(self.__cell((x + radius, y + radius)))
+        found = []
+        for bucket_x in range(first[0], last[0] + 1):
+            for bucket_y in range(first[1], last[1] + 1):
+                for cell in self.__buckets.get((bucket_x, bucket_y), ()):
+                    stored, value = self.__entries[cell]
+                    distance = math.hypot(stored[0] - x, stored[1] - y)
+                    if distance <= radius:
+                        found.append((distance, stored, value))
+        found.sort(key=lambda entry: entry[0])
+        return [(stored, value) for _, stored, value in found]
@@ -0,0 +1,258 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import io
+import json
+import time
+
+from . import _sdk, vectormath
+from .samplestore import GazeSampleStore
+from .scheduler import Deadline
+from .ScreenBasedCalibrationValidation import ScreenBasedCalibrationValidation
+
+_FORMAT = "tobii_research_addons.recording"
+_VERSION = 1
+
+
+class RecordedDisplayArea(object):
+    '''A display area read from a recording. Has the same corner attributes as @ref DisplayArea.
+    '''
+
+    def __init__(self, top_left, top_right, bottom_left):
+        self.__top_left = tuple(map(float, top_left))
+        self.__top_right = tuple(map(float, top_right))
+        self.__bottom_left = tuple(map(float, bottom_left))
+
+    @property
+    def top_left(self):
+        return self.__top_left
+
+    @property
+    def top_right(self):
+        return self.__top_right
+
+    @property
+    def bottom_left(self):
+        return self.__bottom_left
+
+    @property
+    def bottom_right(self):
+        return tuple(right + bottom - left for left, right, bottom in
+                     zip(self.__top_left, self.__top_right, self.__bottom_left))
+
+    @property
+    def width(self):
+        return vectormath.Point3.from_list(self.__top_left).distance(vectormath.Point3.from_list(self.__top_right))
+
+    @property
+    def height(self):
+        return vectormath.Point3.from_list(self.__top_left).distance(vectormath.Point3.from_list(self.__bottom_left))
+
+    @classmethod
+    def from_display_area(cls, display_area):
+        '''Copy the corners of a @ref DisplayArea or any object with the same attributes.
+        '''
+        return cls(display_area.top_left, display_area.top_right, display_area.bottom_left)
+
+    def to_dict(self):
+        return {"top_left": list(self.__top_left),
+                "top_right": list(self.__top_right),
+                "bottom_left": list(self.__bottom_left)}
+
+    @classmethod
+    def from_dict(cls, dct):
+        return cls(dct["top_left"], dct["top_right"], dct["bottom_left"])
+
+
+class ValidationRecording(object):
+    '''The gaze samples recorded for each point of a validation session, together with the display area.
+
+    Recordings are saved as JSON lines: a header line with the display area followed by one line per point with the
+    samples stored column by column.
+    '''
+
+    def __init__(self, display_area, points=()):
+        '''Create a recording.
+
+        Args:
+        display_area: A @ref DisplayArea or any object with the same corner attributes.
+        points: Iterable of (@ref Point2, samples) pairs in the order they were collected. The samples should include
+        the invalid samples as well, the validation discards them during replay.
+        '''
+        self.__display_area = RecordedDisplayArea.from_display_area(display_area)
+        self.__points = []
+        for screen_point, samples in points:
+            self.add_point(screen_point, samples)
+
+    @property
+    def display_area(self):
+        return self.__display_area
+
+    @property
+    def points(self):
+        '''List of (@ref Point2, @ref GazeSampleStore) pairs in the order they were collected.
+        '''
+        return self.__points
+
+    def add_point(self, screen_point, samples):
+        '''Add the samples recorded while a point was shown.
+
+        Args:
+        screen_point: The point as a @ref Point2.
+        samples: A sequence of @ref GazeData or a @ref GazeSampleStore.
+        '''
+        if not isinstance(samples, GazeSampleStore):
+            store = GazeSampleStore(len(samples))
+            store.extend(samples)
+            samples = store
+        self.__points.append((screen_point, samples))
+
+    @classmethod
+    def from_result(cls, result, display_area):
+        '''Create a recording from the gaze data of the points of a @ref CalibrationValidationResult. Only the
+        samples used by the validation are available this way.
+        '''
+        return cls(display_area, [(screen_point, point.gaze_data)
+                                  for screen_point, validation_points in result.points.items()
+                                  for point in validation_points])
+
+    def save(self, path):
+        '''Write the recording to a file.
+        '''
+        with io.open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"format": _FORMAT,
+                                "version": _VERSION,
+                                "display_area": self.__display_area.to_dict()}) + "\n")
+            for screen_point, samples in self.__points:
+                line = dict((name, samples.column(name).tolist()) for name in GazeSampleStore.column_names())
+                line["screen_point"] = [screen_point.x, screen_point.y]
+                f.write(json.dumps(line) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        '''Read a recording from a file written by @ref save.
+
+        Raises:
+        ValueError
+        '''
+        with io.open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != _FORMAT or header.get("version") != _VERSION:
+                raise ValueError("Not a supported validation recording")
+            recording = cls(RecordedDisplayArea.from_dict(header["display_area"]))
+            for line in f:
+                if not line.strip():
+                    continue
+                columns = json.loads(line)
+                recording.add_point(vectormath.Point2.from_list(columns["screen_point"]),
+                                    GazeSampleStore.from_columns(columns))
+        return recording
+
+
+class ReplayEyeTracker(object):
+    '''Stands in for an @ref EyeTracker and plays recorded gaze samples to its gaze data subscribers. Implements the
+    subscribe_to, unsubscribe_from and get_display_area methods used by @ref ScreenBasedCalibrationValidation.
+    '''
+
+    def __init__(self, display_area):
+        self.__display_area = display_area
+        self.__subscriptions = {}
+
+    def get_display_area(self):
+        return self.__display_area
+
+    def subscribe_to(self, subscription_type, callback, as_dictionary=False):
+        self.__subscriptions.setdefault(subscription_type, []).append(callback)
+
+    def unsubscribe_from(self, subscription_type, callback=None):
+        callbacks = self.__subscriptions.get(subscription_type, [])
+        if callback is None:
+            del callbacks[:]
+        elif callback in callbacks:
+            callbacks.remove(callback)
+
+    def play(self, samples, realtime=False):
+        '''Pass samples to the gaze data subscribers on the calling thread.
+
+        Args:
+        samples: Sequence of @ref GazeData, or a @ref GazeSampleStore.
+        realtime: If True, the samples are paced by their device time stamps. Otherwise they are passed as fast as
+        possible.
+        '''
+        callbacks = self.__subscriptions.get(_sdk.subscription("EYETRACKER_GAZE_DATA"), [])
+        start_time = None
+        for sample in samples:
+            if realtime:
+                if start_time is None:
+                    start_time = time.time()
+                    start_time_stamp = sample.device_time_stamp
+                delay = start_time + (sample.device_time_stamp - start_time_stamp) / 1e6 - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            for callback in list(callbacks):
+                callback(sample)
+
+
+class _ReplayScheduler(object):
+    '''Deadlines that never fire by themselves. Used when replaying faster than real time, where timeouts are
+    decided from the recorded time stamps instead.
+    '''
+
+    def schedule(self, delay, callback):
+        return Deadline(float("inf"), callback)
+
+
+def replay_validation(recording, sample_count=30, timeout_ms=1000, realtime=False, **kwargs):
+    '''Run a calibration validation on a recording, without an eye tracker.
+
+    Args:
+    recording: A @ref ValidationRecording.
+    sample_count: See @ref ScreenBasedCalibrationValidation.
+    timeout_ms: See @ref ScreenBasedCalibrationValidation. When not replaying in real time, a point times out when
+    its recorded samples span more than timeout_ms.
+    realtime: If True, the samples are paced by their recorded time stamps. Otherwise the replay runs as fast as
+    possible.
+    kwargs: Passed on to @ref ScreenBasedCalibrationValidation. Buffered ingestion is not supported.
+
+    Returns:
+    An instance of @ref CalibrationValidationResult.
+
+    Raises:
+    ValueError
+    '''
+    if kwargs.get("ingestion_buffer_size") is not None:
+        raise ValueError("Buffered ingestion can not be used for replays")
+    if not realtime:
+        kwargs["scheduler"] = _ReplayScheduler()
+
+    eyetracker = ReplayEyeTracker(recording.display_area)
+    with ScreenBasedCalibrationValidation(eyetracker, sample_count, timeout_ms, **kwargs) as validation:
+        for screen_point, samples in recording.points:
+            validation.start_collecting_data(screen_point)
+            if realtime:
+                eyetracker.play(samples, True)
+                validation.wait_for_data_collection()
+                continue
+
+            time_stamps = samples.column("device_time_stamp")
+            end = len(samples)
+            if end > 0:
+                last_time_stamp = time_stamps[0] + timeout_ms * 1000
+                end = next((i for i, time_stamp in enumerate(time_stamps) if time_stamp > last_time_stamp), end)
+            eyetracker.play(samples[:end])
+            if validation.is_collecting_data:
+                validation.collection_deadline.fire()
+        return validation.compute()
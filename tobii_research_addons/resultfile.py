@@ -0,0 +1,202 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import io
+import mmap
+import struct
+import sys
+from array import array
+from collections import defaultdict
+
+from . import vectormath
+from .batch import compute_validation
+from .replay import RecordedDisplayArea
+from .samplestore import GazeSampleStore, _COLUMNS
+from .ScreenBasedCalibrationValidation import CalibrationValidationPoint, CalibrationValidationResult
+
+# File layout, all values little-endian and every section aligned to 8 bytes:
+#   header: magic, version, point count, sample count, flags, display area corners and the six averages
+#   point table: screen point, timed out flag, stop reason, sample count, offset of the samples and the six metrics
+#   per point
+#   samples: for each point, the columns of a @ref GazeSampleStore one after the other
+_MAGIC = b"TRAVALID"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIII9d6d")
+_POINT = struct.Struct("<2d?B6xQQ6d")
+_ALIGNMENT = 8
+_ITEM_SIZES = {"d": 8, "b": 1, "q": 8}
+# Stop reasons are stored as an index in this tuple, 0 is unknown
+_STOP_REASONS = (None, CalibrationValidationPoint.STOP_SAMPLE_COUNT, CalibrationValidationPoint.STOP_CONVERGED,
+                 CalibrationValidationPoint.STOP_TIMEOUT)
+
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _columns_size(count):
+    return sum(_aligned(count * width * _ITEM_SIZES[typecode]) for _, typecode, width in _COLUMNS)
+
+
+def save_result(path, result, display_area, sample_count=30):
+    '''Write a calibration validation result and the samples of its points to a binary file that can be read with
+    @ref load_result.
+
+    Args:
+    path: The file to write.
+    result: A @ref CalibrationValidationResult.
+    display_area: The @ref DisplayArea the result was computed for, or any object with the same corner attributes.
+    sample_count: The sample count the result was computed with, or the min_sample_count of an adaptive validation.
+    '''
+    points = []
+    for validation_points in result.points.values():
+        for point in validation_points:
+            samples = point.gaze_data
+            if not isinstance(samples, GazeSampleStore):
+                store = GazeSampleStore(len(samples))
+                store.extend(samples)
+                samples = store
+            points.append((point, samples))
+
+    display_area = RecordedDisplayArea.from_display_area(display_area)
+    offset = _HEADER.size + len(points) * _POINT.size
+    with io.open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(points), sample_count, 0,
+                             *(display_area.top_left + display_area.top_right + display_area.bottom_left +
+                               (result.average_accuracy_left, result.average_accuracy_right,
+                                result.average_precision_left, result.average_precision_right,
+                                result.average_precision_rms_left, result.average_precision_rms_right))))
+        for point, samples in points:
+            f.write(_POINT.pack(point.screen_point.x, point.screen_point.y, point.timed_out,
+                                _STOP_REASONS.index(point.stop_reason), len(samples), offset,
+                                point.accuracy_left_eye, point.accuracy_right_eye,
+                                point.precision_left_eye, point.precision_right_eye,
+                                point.precision_rms_left_eye, point.precision_rms_right_eye))
+            offset += _columns_size(len(samples))
+        for _, samples in points:
+            for name, typecode, width in _COLUMNS:
+                values = samples.column(name)
+                if sys.byteorder != "little":
+                    values = array(typecode, values)
+                    values.byteswap()
+                data = values.tobytes()
+                f.write(data)
+                f.write(b"\0" * (_aligned(len(data)) - len(data)))
+
+
+class ValidationResultFile(object):
+    '''A calibration validation result read with @ref load_result. The file is memory mapped: the result and the
+    metrics of each point are read from the header when the file is loaded, and the samples are only read from the
+    file when they are used.
+    '''
+
+    def __init__(self, display_area, sample_count, result):
+        self.__display_area = display_area
+        self.__sample_count = sample_count
+        self.__result = result
+
+    @property
+    def display_area(self):
+        '''The display area as a @ref RecordedDisplayArea.
+        '''
+        return self.__display_area
+
+    @property
+    def sample_count(self):
+        return self.__sample_count
+
+    @property
+    def result(self):
+        '''The stored @ref CalibrationValidationResult. The gaze_data of each point is a read-only
+        @ref GazeSampleStore backed by the file.
+        '''
+        return self.__result
+
+    def samples_by_point(self):
+        '''Gets the samples of each point as (@ref Point2, @ref GazeSampleStore) pairs, see @ref compute_validation.
+        '''
+        return [(screen_point, point.gaze_data)
+                for screen_point, validation_points in self.__result.points.items()
+                for point in validation_points]
+
+    def compute(self):
+        '''Computes the result again from the stored samples.
+
+        Returns:
+        An instance of @ref CalibrationValidationResult.
+        '''
+        return compute_validation(self.samples_by_point(), self.__display_area, self.__sample_count)
+
+
+def _mapped_store(view, offset, count, byteorder="little"):
+    columns = {}
+    for name, typecode, width in _COLUMNS:
+        size = count * width * _ITEM_SIZES[typecode]
+        values = view[offset:offset + size].cast(typecode)
+        if sys.byteorder != byteorder:
+            # The samples can not be used in place on machines with another byte order
+            swapped = array(typecode, values)
+            swapped.byteswap()
+            values = memoryview(swapped)
+        columns[name] = values
+        offset += _aligned(size)
+    return GazeSampleStore.from_columns(columns, copy=False)
+
+
+def load_result(path):
+    '''Read a file written by @ref save_result.
+
+    Args:
+    path: The file to read.
+
+    Returns:
+    A @ref ValidationResultFile.
+
+    Raises:
+    ValueError
+    '''
+    with io.open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("Not a calibration validation result file")
+        # The mapping stays valid after the file is closed, and is released when no samples use it anymore
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+
+    if len(view) < _HEADER.size:
+        raise ValueError("Truncated calibration validation result file")
+    header = _HEADER.unpack_from(view, 0)
+    _, version, point_count, sample_count, _ = header[:5]
+    if version != _VERSION:
+        raise ValueError("Unsupported calibration validation result file version {0}".format(version))
+    corners = header[5:14]
+    averages = header[14:]
+    display_area = RecordedDisplayArea(corners[0:3], corners[3:6], corners[6:9])
+
+    table_end = _HEADER.size + point_count * _POINT.size
+    if len(view) < table_end:
+        raise ValueError("Truncated calibration validation result file")
+    points = defaultdict(list)
+    for index in range(point_count):
+        record = _POINT.unpack_from(view, _HEADER.size + index * _POINT.size)
+        x, y, timed_out, stop_reason, count, offset = record[:6]
+        if offset + _columns_size(count) > len(view):
+            raise ValueError("Truncated calibration validation result file")
+        screen_point = vectormath.Point2(x, y)
+        points[screen_point] += [CalibrationValidationPoint(
+            *(record[6:] + (timed_out, screen_point, _mapped_store(view, offset, count),
+                            _STOP_REASONS[stop_reason] if stop_reason < len(_STOP_REASONS) else None)))]
+
+    return ValidationResultFile(display_area, sample_count, CalibrationValidationResult(points, *averages))
@@ -0,0 +1,84 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+
+class SampleRingBuffer(object):
+    '''A fixed size buffer for handing samples from one producer thread to one consumer thread without locks.
+
+    The producer only writes the head index and the consumer only writes the tail index. Storing a list item and
+    rebinding an attribute are atomic in CPython, so neither side ever waits for the other. Samples pushed while the
+    buffer is full are dropped and counted.
+    '''
+
+    def __init__(self, capacity):
+        '''Create a buffer.
+
+        Args:
+        capacity: The maximum number of samples waiting to be consumed.
+
+        Raises:
+        ValueError
+        '''
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.__slots = [None] * capacity
+        self.__capacity = capacity
+        self.__head = 0  # Written by the producer only
+        self.__tail = 0  # Written by the consumer only
+        self.__dropped_count = 0  # Written by the producer only
+
+    def __len__(self):
+        return self.__head - self.__tail
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def dropped_count(self):
+        '''The number of samples dropped because the buffer was full.
+        '''
+        return self.__dropped_count
+
+    def push(self, sample):
+        '''Add a sample. Must only be called from the producer thread.
+
+        Returns:
+        False if the buffer was full and the sample was dropped.
+        '''
+        head = self.__head
+        if head - self.__tail >= self.__capacity:
+            self.__dropped_count += 1
+            return False
+        self.__slots[head % self.__capacity] = sample
+        self.__head = head + 1
+        return True
+
+    def pop_all(self):
+        '''Remove and return all available samples in the order they were pushed. Must only be called from the
+        consumer thread.
+        '''
+        tail = self.__tail
+        head = self.__head
+        samples = []
+        slots = self.__slots
+        capacity = self.__capacity
+        for index in range(tail, head):
+            slot = index % capacity
+            samples.append(slots[slot])
+            slots[slot] = None
+        self.__tail = head
+        return samples
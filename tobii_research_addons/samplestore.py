@@ -0,0 +1,276 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+from array import array
+
+# Column name, array type code and number of values per sample.
+_COLUMNS = (
+    ("left_gaze_origin", "d", 3),
+    ("left_gaze_point", "d", 3),
+    ("right_gaze_origin", "d", 3),
+    ("right_gaze_point", "d", 3),
+    ("left_validity", "b", 1),
+    ("right_validity", "b", 1),
+    ("device_time_stamp", "q", 1),
+    ("system_time_stamp", "q", 1),
+)
+
+_ZERO = {"d": 0.0, "b": 0, "q": 0}
+
+
+class _GazePosition(object):
+    '''A position of a gaze sample in the user coordinate system.
+    '''
+    __slots__ = ("position_in_user_coordinates", "validity")
+
+    def __init__(self, position_in_user_coordinates, validity):
+        self.position_in_user_coordinates = position_in_user_coordinates
+        self.validity = validity
+
+
+class _EyeSample(object):
+    '''Gaze origin and gaze point of one eye.
+    '''
+    __slots__ = ("gaze_origin", "gaze_point")
+
+    def __init__(self, gaze_origin, gaze_point):
+        self.gaze_origin = gaze_origin
+        self.gaze_point = gaze_point
+
+
+class GazeSample(object):
+    '''A lightweight gaze sample with the subset of the @ref GazeData attributes used by the calibration validation.
+    '''
+    __slots__ = ("left_eye", "right_eye", "device_time_stamp", "system_time_stamp")
+
+    def __init__(self,
+                 left_gaze_origin,
+                 left_gaze_point,
+                 right_gaze_origin,
+                 right_gaze_point,
+                 left_validity=True,
+                 right_validity=True,
+                 device_time_stamp=0,
+                 system_time_stamp=0):
+        self.left_eye = _EyeSample(_GazePosition(left_gaze_origin, left_validity),
+                                   _GazePosition(left_gaze_point, left_validity))
+        self.right_eye = _EyeSample(_GazePosition(right_gaze_origin, right_validity),
+                                    _GazePosition(right_gaze_point, right_validity))
+        self.device_time_stamp = device_time_stamp
+        self.system_time_stamp = system_time_stamp
+
+    def __repr__(self):
+        return "{0}(device_time_stamp={1})".format(self.__class__.__name__, self.device_time_stamp)
+
+
+def _from_bytes(columns):
+    values = {}
+    for name, typecode, _ in _COLUMNS:
+        values[name] = array(typecode)
+        values[name].frombytes(columns[name])
+    return GazeSampleStore.from_columns(values)
+
+
+class GazeSampleStore(object):
+    '''Stores gaze samples column by column in preallocated typed arrays instead of keeping the @ref GazeData
+    objects alive. Only the gaze origins and gaze points in user coordinates, the gaze point validities and the time
+    stamps are kept.
+
+    The store behaves like a read-only sequence of samples. Indexing materializes a @ref GazeSample on demand.
+    '''
+
+    def __init__(self, capacity=0):
+        '''Create an empty store.
+
+        Args:
+        capacity: The number of samples to preallocate room for. The store grows if more samples are added.
+        '''
+        self.__count = 0
+        self.__capacity = 0
+        self.__read_only = False
+        self.__columns = dict((name, array(typecode)) for name, typecode, _ in _COLUMNS)
+        self.reserve(capacity)
+
+    @classmethod
+    def from_columns(cls, columns, copy=True):
+        '''Create a store from column values, as returned by @ref column.
+
+        Args:
+        columns: A mapping from every column name to a sequence of values. Positions are flattened to three values
+        per sample.
+        copy: If False, the columns must be memoryviews with the type of each column, and the store uses them
+        without copying, for example to read memory mapped files. Such a store is read-only. Default True.
+
+        Raises:
+        ValueError
+        '''
+        count = len(columns["device_time_stamp"])
+        store = cls()
+        for name, typecode, width in _COLUMNS:
+            if copy:
+                values = array(typecode, columns[name])
+            else:
+                values = columns[name]
+                if values.format != typecode:
+                    raise ValueError("Column {0} must have type {1}".format(name, typecode))
+            if len(values) != count * width:
+                raise ValueError("Column {0} does not have {1} samples".format(name, count))
+            store.__columns[name] = values
+        store.__count = store.__capacity = count
+        store.__read_only = not copy
+        return store
+
+    def __len__(self):
+        return self.__count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__count))]
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError("Sample index out of range")
+        columns = self.__columns
+        i = index * 3
+        return GazeSample(tuple(columns["left_gaze_origin"][i:i + 3]),
+                          tuple(columns["left_gaze_point"][i:i + 3]),
+                          tuple(columns["right_gaze_origin"][i:i + 3]),
+                          tuple(columns["right_gaze_point"][i:i + 3]),
+                          bool(columns["left_validity"][index]),
+                          bool(columns["right_validity"][index]),
+                          columns["device_time_stamp"][index],
+                          columns["system_time_stamp"][index])
+
+    def __iter__(self):
+        for index in range(self.__count):
+            yield self[index]
+
+    def __iadd__(self, samples):
+        self.extend(samples)
+        return self
+
+    def __repr__(self):
+        return "{0}(<{1} samples>)".format(self.__class__.__name__, self.__count)
+
+    def __reduce__(self):
+        # Columns that are memoryviews can not be pickled, so the columns are always pickled as bytes
+        return (_from_bytes, (dict((name, self.column(name).tobytes()) for name in self.column_names()),))
+
+    @property
+    def read_only(self):
+        '''True if the store uses columns it does not own, see @ref from_columns.
+        '''
+        return self.__read_only
+
+    @property
+    def capacity(self):
+        '''The number of samples there currently is room for without growing the arrays.
+        '''
+        return self.__capacity
+
+    @property
+    def nbytes(self):
+        '''The number of bytes used by the sample arrays.
+        '''
+        return sum(len(column) * column.itemsize for column in self.__columns.values())
+
+    def reserve(self, capacity):
+        '''Make room for at least capacity samples.
+        '''
+        if capacity <= self.__capacity:
+            return
+        if self.__read_only:
+            raise ValueError("The store is read-only")
+        for name, typecode, width in _COLUMNS:
+            self.__columns[name].extend(array(typecode, [_ZERO[typecode]]) * ((capacity - self.__capacity) * width))
+        self.__capacity = capacity
+
+    def trim(self):
+        '''Release the preallocated room that is not used by any sample.
+        '''
+        if self.__capacity == self.__count:
+            return
+        for name, _, width in _COLUMNS:
+            del self.__columns[name][self.__count * width:]
+        self.__capacity = self.__count
+
+    def append(self, gaze_data):
+        '''Add a sample.
+
+        Args:
+        gaze_data: A @ref GazeData object or any object with the same attributes.
+        '''
+        if self.__count == self.__capacity:
+            self.reserve(max(2 * self.__capacity, 16))
+        index = self.__count
+        i = index * 3
+        columns = self.__columns
+        left_eye = gaze_data.left_eye
+        right_eye = gaze_data.right_eye
+        for name, position in (("left_gaze_origin", left_eye.gaze_origin),
+                               ("left_gaze_point", left_eye.gaze_point),
+                               ("right_gaze_origin", right_eye.gaze_origin),
+                               ("right_gaze_point", right_eye.gaze_point)):
+            column = columns[name]
+            column[i], column[i + 1], column[i + 2] = position.position_in_user_coordinates
+        columns["left_validity"][index] = bool(left_eye.gaze_point.validity)
+        columns["right_validity"][index] = bool(right_eye.gaze_point.validity)
+        columns["device_time_stamp"][index] = gaze_data.device_time_stamp
+        columns["system_time_stamp"][index] = gaze_data.system_time_stamp
+        self.__count = index + 1
+
+    def copy(self):
+        '''Create a store with a copy of the samples.
+        '''
+        other = GazeSampleStore(len(self))
+        other.extend(self)
+        return other
+
+    def extend(self, samples):
+        '''Add several samples. Another @ref GazeSampleStore is copied column by column.
+        '''
+        if not isinstance(samples, GazeSampleStore):
+            for sample in samples:
+                self.append(sample)
+            return
+        count = len(samples)
+        self.reserve(self.__count + count)
+        for name, _, width in _COLUMNS:
+            with memoryview(self.__columns[name]) as view:
+                view[self.__count * width:(self.__count + count) * width] = samples.column(name)
+        self.__count += count
+
+    @staticmethod
+    def column_names():
+        '''Gets the names of the columns of a store, in storage order.
+        '''
+        return tuple(name for name, _, _ in _COLUMNS)
+
+    def column(self, name):
+        '''Get the values of a column for the stored samples, without copying. Positions are flattened to three
+        values per sample.
+
+        Args:
+        name: One of "left_gaze_origin", "left_gaze_point", "right_gaze_origin", "right_gaze_point",
+        "left_validity", "right_validity", "device_time_stamp" and "system_time_stamp".
+
+        Returns:
+        A memoryview of the column.
+        '''
+        for column_name, _, width in _COLUMNS:
+            if column_name == name:
+                return memoryview(self.__columns[name])[:self.__count * width]
+        raise ValueError("Unknown column: {0}".format(name))
@@ -0,0 +1,179 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+
+monotonic = getattr(time, "monotonic", time.time)
+
+
+class Deadline(object):
+    '''A callback scheduled to run at a point in time on the monotonic clock. Returned by
+    @ref DeadlineScheduler.schedule and @ref DeadlineScheduler.schedule_at.
+    '''
+
+    def __init__(self, deadline, callback):
+        self.__deadline = deadline
+        self.__callback = callback
+        self.__requested_at = monotonic()
+        self.__fired_at = None
+        self.__cancelled = False
+        self.__lock = threading.Lock()
+
+    def __lt__(self, other):
+        return self.__deadline < other.deadline
+
+    @property
+    def deadline(self):
+        '''The requested time on the monotonic clock.
+        '''
+        return self.__deadline
+
+    @property
+    def requested_at(self):
+        '''The time on the monotonic clock when the deadline was scheduled.
+        '''
+        return self.__requested_at
+
+    @property
+    def fired_at(self):
+        '''The time on the monotonic clock when the deadline was detected and the callback called, or None.
+        '''
+        return self.__fired_at
+
+    @property
+    def lateness(self):
+        '''The number of seconds between the requested deadline and the time it was detected, or None if it has not
+        fired.
+        '''
+        if self.__fired_at is None:
+            return None
+        return self.__fired_at - self.__deadline
+
+    @property
+    def cancelled(self):
+        return self.__cancelled
+
+    @property
+    def expired(self):
+        '''True if the deadline has passed, regardless of whether it has fired.
+        '''
+        return monotonic() >= self.__deadline
+
+    def cancel(self):
+        '''Cancels the deadline.
+
+        Returns:
+        True if the callback has not been and will not be called.
+        '''
+        with self.__lock:
+            if self.__fired_at is not None:
+                return False
+            self.__cancelled = True
+            return True
+
+    def fire(self):
+        '''Calls the callback now, unless it is cancelled or has already been called. Used by the scheduler, and by
+        code that detects an expired deadline before the scheduler does.
+
+        Returns:
+        True if the callback was called.
+        '''
+        with self.__lock:
+            if self.__cancelled or self.__fired_at is not None:
+                return False
+            self.__fired_at = monotonic()
+        self.__callback()
+        return True
+
+
+class DeadlineScheduler(object):
+    '''Runs the callbacks of many deadlines from a single long-lived thread. The thread is started when the first
+    deadline is scheduled.
+    '''
+    __default = None
+    __default_lock = threading.Lock()
+
+    def __init__(self):
+        self.__heap = []
+        self.__sequence = itertools.count()
+        self.__condition = threading.Condition()
+        self.__thread = None
+
+    @classmethod
+    def default(cls):
+        '''Gets the scheduler shared by everything in the process that does not specify its own.
+        '''
+        with cls.__default_lock:
+            if cls.__default is None:
+                cls.__default = cls()
+            return cls.__default
+
+    def schedule(self, delay, callback):
+        '''Schedules a callback to be called after a delay.
+
+        Args:
+        delay: Delay in seconds.
+        callback: Callable without arguments.
+
+        Returns:
+        A @ref Deadline.
+        '''
+        return self.schedule_at(monotonic() + delay, callback)
+
+    def schedule_at(self, deadline, callback):
+        '''Schedules a callback to be called at a time on the monotonic clock.
+
+        Args:
+        deadline: Time in seconds, comparable to @ref monotonic.
+        callback: Callable without arguments.
+
+        Returns:
+        A @ref Deadline.
+        '''
+        handle = Deadline(deadline, callback)
+        with self.__condition:
+            heapq.heappush(self.__heap, (deadline, next(self.__sequence), handle))
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="DeadlineScheduler")
+                self.__thread.daemon = True
+                self.__thread.start()
+            elif self.__heap[0][2] is handle:
+                # New earliest deadline
+                self.__condition.notify()
+        return handle
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                while True:
+                    while self.__heap and self.__heap[0][2].cancelled:
+                        heapq.heappop(self.__heap)
+                    if not self.__heap:
+                        self.__condition.wait()
+                        continue
+                    remaining = self.__heap[0][0] - monotonic()
+                    if remaining <= 0:
+                        handle = heapq.heappop(self.__heap)[2]
+                        break
+                    self.__condition.wait(remaining)
+            try:
+                handle.fire()
+            except Exception:
+                traceback.print_exc()
@@ -0,0 +1,171 @@
+'''
+Copyright 2019 Tobii Pro AB
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+import sys
+
+from . import vectormath
+from .batch import _build_result, _point_items
+from .resultfile import _aligned, _columns_size, _mapped_store
+from .samplestore import GazeSampleStore, _COLUMNS
+from .ScreenBasedCalibrationValidation import _calculate_point
+
+
+def _attach(name):
+    from multiprocessing import shared_memory
+    try:
+        # The creating process owns the block and unlinks it
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 the block is registered again with the resource tracker, which the worker shares with
+        # the creating process, so it is still unregistered only once
+        return shared_memory.SharedMemory(name=name)
+
+
+def _compute_shared_task(task):
+    '''Computes the metrics of the points in a shared memory block. Runs in the worker process, must be a module level
+    function to be picklable.
+    '''
+    name, points = task
+    block = _attach(name)
+    metrics = [tuple(_calculate_point(_mapped_store(block.buf, offset, count, sys.byteorder), stimuli_point))
+               for offset, count, stimuli_point in points]
+    # The stores and arrays that used the block are gone, so the block can be closed. On errors the traceback keeps
+    # them alive, and the block is closed when they are collected.
+    block.close()
+    return metrics
+
+
+def _as_store(samples):
+    if isinstance(samples, GazeSampleStore):
+        return samples
+    store = GazeSampleStore(len(samples))
+    store.extend(samples)
+    return store
+
+
+class SharedMemoryComputeWorker(object):
+    '''Computes calibration validation metrics in a separate, persistent worker process, so the computation does not
+    hold the GIL of the process that presents the stimuli.
+
+    The samples of the points are copied into a shared memory block, which the worker reads in place. Only the name
+    of the block, the layout of the points and the 3D stimuli points are sent to the worker, and only the metrics
+    are sent back. Samples already in a @ref GazeSampleStore are copied with one memory copy per column, other
+    samples are first converted to one. Requires Python 3.8 or later.
+    '''
+
+    def __init__(self, executor=None):
+        '''Start the worker process.
+
+        Args:
+        executor: Optional ProcessPoolExecutor to use instead of starting a new single process pool. It is not shut
+        down by @ref close.
+        '''
+        from multiprocessing import shared_memory
+        self.__shared_memory = shared_memory
+        self.__own_executor = executor is None
+        if executor is None:
+            # Imported here since concurrent.futures is slow to import and not needed otherwise
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=1)
+        self.__executor = executor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''Waits for the submitted computations and stops the worker process.
+        '''
+        if self.__own_executor:
+            self.__executor.shutdown(wait=True)
+
+    def _submit_points(self, points):
+        '''Copy the samples of the points to a shared memory block and compute their metrics in the worker.
+
+        Args:
+        points: List of (samples, @ref Point3 stimuli point) pairs.
+
+        Returns:
+        A Future of the list of metrics tuples, in the order of the points.
+        '''
+        # Imported here since concurrent.futures is slow to import and not needed otherwise
+        from concurrent.futures import Future
+        if not points:
+            future = Future()
+            future.set_result([])
+            return future
+
+        stores = [_as_store(samples) for samples, _ in points]
+        size = max(1, sum(_columns_size(len(store)) for store in stores))
+        block = self.__shared_memory.SharedMemory(create=True, size=size)
+        layout = []
+        offset = 0
+        for store, (_, stimuli_point) in zip(stores, points):
+            layout.append((offset, len(store), stimuli_point))
+            offset = self.__write(block.buf, offset, store)
+
+        try:
+            future = self.__executor.submit(_compute_shared_task, (block.name, layout))
+        except BaseException:
+            self.__release(block)
+            raise
+        future.add_done_callback(lambda _: self.__release(block))
+        return future
+
+    @staticmethod
+    def __write(buffer, offset, store):
+        # The same layout as the samples of a result file, in the byte order of this machine
+        for name, _, _ in _COLUMNS:
+            values = store.column(name).cast("B")
+            buffer[offset:offset + len(values)] = values
+            offset += _aligned(len(values))
+        return offset
+
+    @staticmethod
+    def __release(block):
+        block.close()
+        block.unlink()
+
+    def submit(self, samples_by_point, display_area, sample_count=30):
+        '''Computes a calibration validation result in the worker process. See @ref compute_validation.
+
+        Args:
+        samples_by_point: See @ref compute_validation.
+        display_area: See @ref compute_validation.
+        sample_count: See @ref compute_validation.
+
+        Returns:
+        A Future of the @ref CalibrationValidationResult. The gaze_data of its points are the given samples.
+        '''
+        items = _point_items(samples_by_point)
+        transform = vectormath.DisplayAreaTransform(display_area)
+        points = [(samples, transform.to_user_coordinates(screen_point))
+                  for screen_point, samples in items
+                  if len(samples) >= sample_count]
+        metrics_future = self._submit_points(points)
+        from concurrent.futures import Future
+        future = Future()
+
+        def done(metrics_future):
+            try:
+                future.set_result(_build_result(items, sample_count, iter(metrics_future.result())))
+            except BaseException as error:
+                future.set_exception(error)
+
+        metrics_future.add_done_callback(done)
+        return future
@@ -15,6 +15,10 @@ limitations under the License.
 '''
 
 import math
+from operator import itemgetter
+
+# NumPy is slow to import and only needed by the array types, so it is imported when they are first used
+numpy = None
 
 
 def _isclose(a, b, rel_tol=1e-09, abs_tol=0.0):
@@ -25,124 +29,163 @@ def _clamp(value, lower, upper):
     return max(lower, min(value, upper))
 
 
-class Point2(object):
-    '''Represents a 2D point.
+def _require_numpy():
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("The array types in vectormath require numpy")
+
+
+def _not_implemented(self, other):
+    return NotImplemented
+
+
+# Creates point objects from already converted float coordinates without going through __new__.
+_new = tuple.__new__
+
+_SCALAR_TYPES = (float, int)
+
+
+class Point2(tuple):
+    '''Represents a 2D point. Points are immutable and stored as a tuple of floats.
     '''
-    def __init__(self, x=0.0, y=0.0):
-        self.__x = float(x)
-        self.__y = float(y)
+    __slots__ = ()
 
-    @property
-    def x(self):
-        return self.__x
+    def __new__(cls, x=0.0, y=0.0):
+        return _new(cls, (float(x), float(y)))
 
-    @property
-    def y(self):
-        return self.__y
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
+
+    # Points are not sequences, do not inherit concatenation and repetition from tuple
+    __add__ = __mul__ = __rmul__ = _not_implemented
+
+    def __getnewargs__(self):
+        return tuple(self)
 
     def __eq__(self, other):
-        return _isclose(self.x, other.x) and _isclose(self.y, other.y)
+        return _isclose(self[0], other.x) and _isclose(self[1], other.y)
 
     def __ne__(self, other):
         return not self == other
 
-    def __hash__(self):
-        return hash((self.x, self.y))
+    __hash__ = tuple.__hash__
 
     def __repr__(self):
-        return "{0}({1:.3f}, {2:.3f})".format(self.__class__.__name__, self.x, self.y)
+        return "{0}({1:.3f}, {2:.3f})".format(self.__class__.__name__, self[0], self[1])
 
     @classmethod
     def from_list(cls, lst):
         x, y = map(float, lst)
-        return cls(x, y)
+        return _new(cls, (x, y))
 
 
-class Point3(object):
-    '''Represents a 3D point.
+class Point3(tuple):
+    '''Represents a 3D point. Points are immutable and stored as a tuple of floats.
     '''
-    def __init__(self, x=0.0, y=0.0, z=0.0):
-        self.__x = float(x)
-        self.__y = float(y)
-        self.__z = float(z)
+    __slots__ = ()
 
-    @property
-    def x(self):
-        return self.__x
+    def __new__(cls, x=0.0, y=0.0, z=0.0):
+        return _new(cls, (float(x), float(y), float(z)))
 
-    @property
-    def y(self):
-        return self.__y
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
+    z = property(itemgetter(2))
 
-    @property
-    def z(self):
-        return self.__z
+    __rmul__ = _not_implemented
+
+    def __getnewargs__(self):
+        return tuple(self)
 
     def __add__(self, rhs):
-        return Point3(self.x + rhs.x, self.y + rhs.y, self.z + rhs.z)
+        x, y, z = self
+        return _new(Point3, (x + rhs.x, y + rhs.y, z + rhs.z))
 
     def __sub__(self, rhs):
-        return Point3(self.x - rhs.x, self.y - rhs.y, self.z - rhs.z)
+        x, y, z = self
+        return _new(Point3, (x - rhs.x, y - rhs.y, z - rhs.z))
 
     def __mul__(self, rhs):
-        return Point3(self.x * float(rhs), self.y * float(rhs), self.z * float(rhs))
+        x, y, z = self
+        rhs = float(rhs)
+        return _new(Point3, (x * rhs, y * rhs, z * rhs))
 
     def __eq__(self, other):
-        return _isclose(self.x, other.x) and _isclose(self.y, other.y) and _isclose(self.z, other.z)
+        x, y, z = self
+        return _isclose(x, other.x) and _isclose(y, other.y) and _isclose(z, other.z)
 
     def __ne__(self, other):
         return not self == other
 
+    __hash__ = None
+
     def __repr__(self):
-        return '{0}({1:.3f}, {2:.3f}, {3:.3f})'.format(self.__class__.__name__, self.x, self.y, self.z)
+        return '{0}({1:.3f}, {2:.3f}, {3:.3f})'.format(self.__class__.__name__, self[0], self[1], self[2])
 
     def distance(self, other_point):
-        return math.sqrt((other_point.x - self.x) ** 2 + (other_point.y - self.y) ** 2 + (other_point.z - self.z) ** 2)
+        x, y, z = self
+        dx = other_point.x - x
+        dy = other_point.y - y
+        dz = other_point.z - z
+        return math.sqrt(dx ** 2 + dy ** 2 + dz ** 2)
 
     @classmethod
     def from_list(cls, lst):
         x, y, z = map(float, lst)
-        return cls(x, y, z)
+        return _new(cls, (x, y, z))
 
 
 class Vector3(Point3):
     '''Represents a 3D vector.
     '''
-    def __init__(self, x=0.0, y=0.0, z=0.0):
-        super(Vector3, self).__init__(x, y, z)
+    __slots__ = ()
 
     def __add__(self, rhs):
+        x, y, z = self
         if isinstance(rhs, Point3):
-            return Vector3(self.x + rhs.x, self.y + rhs.y, self.z + rhs.z)
-        elif type(rhs) in [float, int]:
-            return Vector3(self.x + float(rhs), self.y + float(rhs), self.z + float(rhs))
+            rx, ry, rz = rhs
+            return _new(Vector3, (x + rx, y + ry, z + rz))
+        elif isinstance(rhs, _SCALAR_TYPES):
+            rhs = float(rhs)
+            return _new(Vector3, (x + rhs, y + rhs, z + rhs))
         else:
             raise TypeError
 
     def __sub__(self, rhs):
+        x, y, z = self
         if isinstance(rhs, Point3):
-            return Vector3(self.x - rhs.x, self.y - rhs.y, self.z - rhs.z)
-        elif type(rhs) in [float, int]:
-            return Vector3(self.x - float(rhs), self.y - float(rhs), self.z - float(rhs))
+            rx, ry, rz = rhs
+            return _new(Vector3, (x - rx, y - ry, z - rz))
+        elif isinstance(rhs, _SCALAR_TYPES):
+            rhs = float(rhs)
+            return _new(Vector3, (x - rhs, y - rhs, z - rhs))
         else:
             raise TypeError
 
     def __mul__(self, rhs):
-        if type(rhs) in [float, int]:
-            return Vector3(self.x * float(rhs), self.y * float(rhs), self.z * float(rhs))
+        if isinstance(rhs, _SCALAR_TYPES):
+            x, y, z = self
+            rhs = float(rhs)
+            return _new(Vector3, (x * rhs, y * rhs, z * rhs))
         else:
             # Do not allow dot or cross products with multiplication operator due to ambiguity issues
             raise TypeError
 
     def dot(self, vector3):
         '''Dot product.'''
-        return self.x * vector3.x + self.y * vector3.y + self.z * vector3.z
+        x, y, z = self
+        return x * vector3.x + y * vector3.y + z * vector3.z
 
     def magnitude(self):
-        return math.sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
+        x, y, z = self
+        return math.sqrt(x ** 2 + y ** 2 + z ** 2)
 
     def normalize(self):
-        return self * (1.0 / self.magnitude())
+        x, y, z = self
+        factor = 1.0 / math.sqrt(x ** 2 + y ** 2 + z ** 2)
+        return _new(Vector3, (x * factor, y * factor, z * factor))
 
     def angle(self, vector3):
         '''Return the angle between two vectors in degrees.'''
@@ -152,13 +195,311 @@ class Vector3(Point3):
     @classmethod
     def from_points(cls, from_point, to_point):
         if isinstance(from_point, Point3) and isinstance(to_point, Point3):
-            displacement = to_point - from_point
-            return cls(displacement.x, displacement.y, displacement.z)
+            fx, fy, fz = from_point
+            tx, ty, tz = to_point
+            return _new(cls, (tx - fx, ty - fy, tz - fz))
+        raise TypeError
+
+
+class _PointArray(object):
+    '''Base class for arrays of points backed by an (N, dimensions) NumPy array.
+    '''
+    _dimensions = 0
+    _point_type = None
+
+    def __init__(self, array=()):
+        _require_numpy()
+        self.__array = numpy.asarray(array, dtype=numpy.float64).reshape(-1, self._dimensions)
+
+    @property
+    def array(self):
+        '''The underlying (N, dimensions) NumPy array.
+        '''
+        return self.__array
+
+    @property
+    def x(self):
+        return self.__array[:, 0]
+
+    @property
+    def y(self):
+        return self.__array[:, 1]
+
+    def __len__(self):
+        return len(self.__array)
+
+    def __iter__(self):
+        point_type = self._point_type
+        for row in self.__array.tolist():
+            yield point_type(*row)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, numpy.integer)):
+            return self._point_type(*self.__array[index].tolist())
+        return self.__class__(self.__array[index])
+
+    def __repr__(self):
+        return "{0}(<{1} points>)".format(self.__class__.__name__, len(self))
+
+    def mean(self):
+        '''Calculate the average point.
+
+        Returns:
+        The mean point as a scalar point object.
+        '''
+        return self._point_type(*self.__array.mean(axis=0).tolist())
+
+    def distance(self, other_points):
+        '''Element-wise euclidean distance to another point array or to a single point.
+
+        Returns:
+        An (N,) NumPy array of distances.
+        '''
+        difference = _as_array(other_points) - self.__array
+        return numpy.sqrt(numpy.einsum('ij,ij->i', difference, difference))
+
+    @classmethod
+    def from_list(cls, lst):
+        '''Create an array from an iterable of scalar points or coordinate sequences.
+        '''
+        _require_numpy()
+        if isinstance(lst, _PointArray):
+            return cls(lst.array)
+        return cls(list(lst))
+
+
+def _as_array(operand):
+    if isinstance(operand, _PointArray):
+        return operand.array
+    if isinstance(operand, (Point2, Point3)):
+        return numpy.array(operand)
+    return operand
+
+
+def _as_factor(operand):
+    '''Scalars are used as is, per-point factors are broadcast over the coordinates.'''
+    if isinstance(operand, (float, int)):
+        return float(operand)
+    factor = numpy.asarray(operand, dtype=numpy.float64)
+    if factor.ndim == 1:
+        return factor[:, numpy.newaxis]
+    return factor
+
+
+class Point2Array(_PointArray):
+    '''Represents an array of 2D points.
+    '''
+    _dimensions = 2
+    _point_type = Point2
+
+    @classmethod
+    def from_gaze_data(cls, gaze_data, eye="left"):
+        '''Create an array of the gaze points on the display area from a sequence of @ref GazeData.
+
+        Args:
+        gaze_data: A sequence of @ref GazeData objects.
+        eye: "left" or "right".
+        '''
+        _require_numpy()
+        eye_attribute = _eye_attribute(eye)
+        return cls([getattr(sample, eye_attribute).gaze_point.position_on_display_area for sample in gaze_data])
+
+
+class Point3Array(_PointArray):
+    '''Represents an array of 3D points.
+    '''
+    _dimensions = 3
+    _point_type = Point3
+
+    @property
+    def z(self):
+        return self.array[:, 2]
+
+    def __add__(self, rhs):
+        return Point3Array(self.array + _as_array(rhs))
+
+    def __sub__(self, rhs):
+        return Point3Array(self.array - _as_array(rhs))
+
+    def __mul__(self, rhs):
+        return Point3Array(self.array * _as_factor(rhs))
+
+    @classmethod
+    def from_gaze_data(cls, gaze_data, eye="left", position="gaze_point"):
+        '''Create an array of user coordinate positions from a sequence of @ref GazeData.
+
+        Args:
+        gaze_data: A sequence of @ref GazeData objects.
+        eye: "left" or "right".
+        position: "gaze_point" or "gaze_origin".
+        '''
+        _require_numpy()
+        eye_attribute = _eye_attribute(eye)
+        if position not in ("gaze_point", "gaze_origin"):
+            raise ValueError("Position must be 'gaze_point' or 'gaze_origin'")
+        return cls([getattr(getattr(sample, eye_attribute), position).position_in_user_coordinates
+                    for sample in gaze_data])
+
+
+class Vector3Array(Point3Array):
+    '''Represents an array of 3D vectors.
+    '''
+    _point_type = Vector3
+
+    def __add__(self, rhs):
+        return Vector3Array(self.array + _as_array(rhs))
+
+    def __sub__(self, rhs):
+        return Vector3Array(self.array - _as_array(rhs))
+
+    def __mul__(self, rhs):
+        if isinstance(rhs, (Point3, _PointArray)):
+            # Do not allow dot or cross products with multiplication operator due to ambiguity issues
+            raise TypeError
+        return Vector3Array(self.array * _as_factor(rhs))
+
+    def dot(self, vectors):
+        '''Element-wise dot product with another vector array or a single vector.'''
+        return numpy.einsum('ij,ij->i', self.array, numpy.broadcast_to(_as_array(vectors), self.array.shape))
+
+    def magnitude(self):
+        return numpy.sqrt(numpy.einsum('ij,ij->i', self.array, self.array))
+
+    def normalize(self):
+        return Vector3Array(self.array * (1.0 / self.magnitude())[:, numpy.newaxis])
+
+    def angle(self, vectors):
+        '''Return the element-wise angles in degrees to another vector array or a single vector.'''
+        other = numpy.broadcast_to(_as_array(vectors), self.array.shape)
+        magnitudes = numpy.sqrt(numpy.einsum('ij,ij->i', self.array, self.array) *
+                                numpy.einsum('ij,ij->i', other, other))
+        tmp = numpy.einsum('ij,ij->i', self.array, other) / magnitudes
+        return numpy.degrees(numpy.arccos(numpy.clip(tmp, -1.0, 1.0)))
+
+    @classmethod
+    def from_points(cls, from_points, to_points):
+        '''Create the displacement vectors between two point arrays. Either argument may also be a single
+        @ref Point3, which is then used for every element.
+        '''
+        _require_numpy()
+        if isinstance(from_points, (Point3, Point3Array)) and isinstance(to_points, (Point3, Point3Array)):
+            return cls(numpy.subtract(_as_array(to_points), _as_array(from_points)))
         raise TypeError
 
 
+def _eye_attribute(eye):
+    if eye not in ("left", "right"):
+        raise ValueError("Eye must be 'left' or 'right'")
+    return eye + "_eye"
+
+
+class DisplayAreaTransform(object):
+    '''Maps between normalized display area coordinates and 3D user coordinates, with the display area corners
+    converted once. Scalar points are mapped without NumPy, point arrays are mapped with batched array operations.
+    '''
+
+    def __init__(self, display_area):
+        '''Create a transform for a display area.
+
+        Args:
+        display_area: @ref DisplayArea object, or any object with top_left, top_right and bottom_left.
+        '''
+        top_left = Point3.from_list(display_area.top_left)
+        self.__top_left = top_left
+        self.__width = Point3.from_list(display_area.top_right) - top_left
+        self.__height = Point3.from_list(display_area.bottom_left) - top_left
+
+        wx, wy, wz = self.__width
+        hx, hy, hz = self.__height
+        self.__normal = Vector3(wy * hz - wz * hy, wz * hx - wx * hz, wx * hy - wy * hx)
+        # The dual basis of the display plane gives the normalized coordinates of a point as two dot products
+        ww = wx * wx + wy * wy + wz * wz
+        wh = wx * hx + wy * hy + wz * hz
+        hh = hx * hx + hy * hy + hz * hz
+        # Corners that do not span a plane map every point to NaN
+        determinant = ww * hh - wh * wh
+        if determinant <= 0.0:
+            determinant = math.nan
+        self.__dual_width = Vector3(*[(hh * w - wh * h) / determinant for w, h in zip(self.__width, self.__height)])
+        self.__dual_height = Vector3(*[(ww * h - wh * w) / determinant for w, h in zip(self.__width, self.__height)])
+
+    @property
+    def normal(self):
+        '''The normal of the display plane as a @ref Vector3, the cross product of the top edge from left to right
+        and the left edge from top to bottom. It is not normalized.
+        '''
+        return self.__normal
+
+    def to_user_coordinates(self, points):
+        '''Get the 3D positions of normalized points on the display area.
+
+        Args:
+        points: A normalized @ref Point2, or a @ref Point2Array.
+
+        Returns:
+        A @ref Point3, or a @ref Point3Array.
+        '''
+        if isinstance(points, Point2):
+            return self.__top_left + self.__width * points.x + self.__height * points.y
+        _require_numpy()
+        array = numpy.asarray(_as_array(points), dtype=numpy.float64).reshape(-1, 2)
+        return Point3Array(numpy.asarray(self.__top_left) + array[:, 0:1] * numpy.asarray(self.__width) +
+                           array[:, 1:2] * numpy.asarray(self.__height))
+
+    def to_normalized(self, points):
+        '''Get the normalized display area coordinates of 3D points, projected onto the display plane.
+
+        Args:
+        points: A @ref Point3, or a @ref Point3Array.
+
+        Returns:
+        A @ref Point2, or a @ref Point2Array.
+        '''
+        if isinstance(points, Point3):
+            relative = Vector3.from_points(self.__top_left, Point3(*points))
+            return Point2(relative.dot(self.__dual_width), relative.dot(self.__dual_height))
+        _require_numpy()
+        relative = numpy.asarray(_as_array(points), dtype=numpy.float64).reshape(-1, 3)
+        relative = relative - numpy.asarray(self.__top_left)
+        return Point2Array(numpy.column_stack((relative.dot(numpy.asarray(self.__dual_width)),
+                                               relative.dot(numpy.asarray(self.__dual_height)))))
+
+    def intersect(self, origins, directions):
+        '''Intersect gaze rays with the display plane.
+
+        Args:
+        origins: The start of the rays, such as the gaze origins, as a @ref Point3 or a @ref Point3Array.
+        directions: The directions of the rays as a @ref Vector3 or a @ref Vector3Array. They need not be
+        normalized.
+
+        Returns:
+        The normalized display area coordinates of the intersections as a @ref Point2, or a @ref Point2Array. The
+        coordinates are NaN for rays that are parallel to the display plane or point away from it.
+        '''
+        if isinstance(origins, Point3) and isinstance(directions, Point3):
+            direction = Vector3(*directions)
+            denominator = direction.dot(self.__normal)
+            distance = Vector3.from_points(Point3(*origins), self.__top_left).dot(self.__normal)
+            if denominator == 0.0 or distance / denominator < 0.0:
+                return Point2(math.nan, math.nan)
+            return self.to_normalized(Point3(*origins) + direction * (distance / denominator))
+
+        _require_numpy()
+        origins, directions = numpy.broadcast_arrays(
+            numpy.asarray(_as_array(origins), dtype=numpy.float64).reshape(-1, 3),
+            numpy.asarray(_as_array(directions), dtype=numpy.float64).reshape(-1, 3))
+        normal = numpy.asarray(self.__normal)
+        denominator = directions.dot(normal)
+        distance = (numpy.asarray(self.__top_left) - origins).dot(normal)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            scale = distance / denominator
+        scale[~(scale >= 0.0) | ~numpy.isfinite(scale)] = math.nan
+        return self.to_normalized(Point3Array(origins + directions * scale[:, numpy.newaxis]))
+
+
 def calculate_normalized_point2_to_point3(display_area, target_point):
     '''Get the 3D gaze point representation based on the normalized 2D point and the @ref GazeData information.
+    See @ref DisplayAreaTransform to map many points.
 
     Args:
     display_area: @ref DisplayArea object.
@@ -179,11 +520,13 @@ def calculate_mean_point(points):
     '''Calculate an average point from a set of points.
 
     Args:
-    points: An iterable container of @ref Point3 objects.
+    points: An iterable container of @ref Point3 objects, or a @ref Point3Array.
 
     Returns:
     The mean point as a @ref Point3 object.
     '''
+    if isinstance(points, Point3Array):
+        return points.mean()
     average_point = Point3()
     for point in points:
         average_point = average_point + point